@@ -26,6 +26,8 @@ except ImportError:
     openpyxl = None
     logger.warning("openpyxl not installed - XLSX support disabled")
 
+_HAS_DIGIT = re.compile(r'\d').search
+
 
 class DocumentProcessor:
     """
@@ -270,7 +272,7 @@ class DocumentProcessor:
         # Look for patterns in path dynamically
         for i, part in enumerate(parts):
             # Projects often have numbers (addresses)
-            if any(char.isdigit() for char in part) and i < 4:
+            if i < 4 and _HAS_DIGIT(part) is not None:
                 if 'project' not in metadata:
                     metadata['project'] = part
             
@@ -482,22 +484,26 @@ class DocumentProcessor:
         chunks = []
         start = 0
         text_length = len(text)
+        min_sentence_end = chunk_size // 2
         
+        # Each step is one bounded rfind and one slice (both C-level), so the loop
+        # runs once per chunk rather than once per character
         while start < text_length:
             end = min(start + chunk_size, text_length)
             
             # Try to end at a sentence boundary
             if end < text_length:
                 # Look for sentence end
-                sentence_end = text.rfind('.', start, end)
-                if sentence_end > start + chunk_size // 2:
+                sentence_end = text.rfind('.', start + min_sentence_end + 1, end)
+                if sentence_end != -1:
                     end = sentence_end + 1
             
             chunk = text[start:end].strip()
             if chunk:
                 chunks.append(chunk)
             
-            start = end - overlap if end < text_length else text_length
+            # Always move forward, even if overlap >= the chunk just taken
+            start = max(end - overlap, start + 1) if end < text_length else text_length
         
         return chunks
     
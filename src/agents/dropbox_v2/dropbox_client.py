@@ -11,8 +11,8 @@ from typing import Dict, List, Optional, Any, Generator
 from datetime import datetime
 from pathlib import Path
 import dropbox
+import requests
 from dropbox.files import FileMetadata, FolderMetadata, DeletedMetadata
-from dropbox.common import PathRoot
 from dotenv import load_dotenv
 from tenacity import (
     retry,
@@ -23,9 +23,26 @@ from tenacity import (
     after_log
 )
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 load_dotenv()
 logger = logging.getLogger(__name__)
 
+# Only retry errors that can succeed on a second attempt; AuthError and
+# programming errors (KeyError, AttributeError, ...) surface immediately
+TRANSIENT_ERRORS = (
+    dropbox.exceptions.InternalServerError,
+    dropbox.exceptions.RateLimitError,
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+)
+
+# Header the Dropbox SDK sets for PathRoot; value is the JSON-serialized union
+PATH_ROOT_HEADER = "Dropbox-API-Path-Root"
+
 
 class DropboxClient:
     """
@@ -44,15 +61,21 @@ class DropboxClient:
             namespace_id = os.getenv("DROPBOX_NAMESPACE_ID")
             
             if team_member_id and namespace_id:
-                # Use DropboxTeam for Business accounts with namespace
-                team = dropbox.DropboxTeam(self.access_token)
-                # Set user context for team member
-                client = team.as_user(team_member_id)
-                
                 # Set namespace path root to access team folders
-                # This is critical for accessing team space instead of personal space
-                path_root = PathRoot.namespace_id(namespace_id)
-                self.client = client.with_path_root(path_root)
+                # This is critical for accessing team space instead of personal space.
+                # The header is serialized once and attached at construction so
+                # every RPC reuses it instead of cloning via with_path_root().
+                self._path_root_header = json.dumps(
+                    {".tag": "namespace_id", "namespace_id": namespace_id},
+                    separators=(",", ":")
+                )
+                # Use DropboxTeam for Business accounts with namespace
+                team = dropbox.DropboxTeam(
+                    self.access_token,
+                    headers={PATH_ROOT_HEADER: self._path_root_header}
+                )
+                # Set user context for team member (inherits the path root header)
+                self.client = team.as_user(team_member_id)
                 
                 logger.info(f"Dropbox client initialized for team space (member: {team_member_id}, namespace: {namespace_id})")
             else:
@@ -98,8 +121,8 @@ class DropboxClient:
         """Load saved cursors for incremental sync"""
         if self.cursor_file.exists():
             try:
-                with open(self.cursor_file, 'r') as f:
-                    return json.load(f)
+                data = self.cursor_file.read_bytes()
+                return orjson.loads(data) if orjson is not None else json.loads(data)
             except Exception as e:
                 logger.error(f"Failed to load cursors: {e}")
         return {}
@@ -107,8 +130,14 @@ class DropboxClient:
     def _save_cursors(self) -> None:
         """Save cursors for next incremental sync"""
         try:
-            with open(self.cursor_file, 'w') as f:
-                json.dump(self.cursors, f, indent=2)
+            if orjson is not None:
+                payload = orjson.dumps(self.cursors)
+            else:
+                payload = json.dumps(self.cursors, separators=(",", ":")).encode("utf-8")
+            # Write to a temp file and rename so a crash never leaves a truncated file
+            tmp_file = self.cursor_file.with_suffix('.tmp')
+            tmp_file.write_bytes(payload)
+            os.replace(tmp_file, self.cursor_file)
             logger.debug("Saved cursors for incremental sync")
         except Exception as e:
             logger.error(f"Failed to save cursors: {e}")
@@ -116,7 +145,7 @@ class DropboxClient:
     @retry(
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=2, max=10),
-        retry=retry_if_exception_type((Exception,)),
+        retry=retry_if_exception_type(TRANSIENT_ERRORS),
         before=before_log(logger, logging.DEBUG),
         after=after_log(logger, logging.DEBUG)
     )
@@ -131,7 +160,7 @@ class DropboxClient:
     @retry(
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=2, max=10),
-        retry=retry_if_exception_type((Exception,)),
+        retry=retry_if_exception_type(TRANSIENT_ERRORS),
         before=before_log(logger, logging.DEBUG),
         after=after_log(logger, logging.DEBUG)
     )
@@ -142,7 +171,7 @@ class DropboxClient:
     @retry(
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=2, max=10),
-        retry=retry_if_exception_type((Exception,)),
+        retry=retry_if_exception_type(TRANSIENT_ERRORS),
         before=before_log(logger, logging.DEBUG),
         after=after_log(logger, logging.DEBUG)
     )
@@ -164,6 +193,39 @@ class DropboxClient:
         Yields:
             File metadata dictionaries
         """
+        for entry in self._iter_folder_entries(path, recursive, include_deleted):
+            yield self._entry_to_dict(entry)
+    
+    def list_folder_files(self, path: str = "", extensions: tuple = (), recursive: bool = True,
+                          skipped: Optional[Dict[str, int]] = None) -> Generator[Dict, None, None]:
+        """
+        List only files, optionally restricted to the given extensions
+        Other entries are dropped before being converted to dictionaries
+        
+        Args:
+            path: Folder path to list (empty string for root)
+            extensions: Lowercase suffixes including the dot, e.g. ('.pdf', '.txt');
+                empty for every file
+            recursive: Whether to list recursively
+            skipped: Optional counter dict, incremented under 'folders' and 'unsupported'
+            
+        Yields:
+            File metadata dictionaries
+        """
+        if skipped is not None:
+            skipped.setdefault('folders', 0)
+            skipped.setdefault('unsupported', 0)
+        
+        # str.endswith(()) is always False, so no extensions means no filtering
+        match_all = not extensions
+        for entry in self._iter_folder_entries(path, recursive, False):
+            if isinstance(entry, FileMetadata) and (match_all or entry.path_lower.endswith(extensions)):
+                yield self._entry_to_dict(entry)
+            elif skipped is not None:
+                skipped['folders' if isinstance(entry, FolderMetadata) else 'unsupported'] += 1
+    
+    def _iter_folder_entries(self, path: str, recursive: bool, include_deleted: bool):
+        """Page through a folder listing, yielding raw SDK entries and saving the cursor"""
         if not self.client:
             logger.error("No Dropbox client available")
             return
@@ -177,14 +239,12 @@ class DropboxClient:
             )
             
             # Process initial batch
-            for entry in result.entries:
-                yield self._entry_to_dict(entry)
+            yield from result.entries
             
             # Continue if there are more results
             while result.has_more:
                 result = self._list_folder_continue_with_retry(result.cursor)
-                for entry in result.entries:
-                    yield self._entry_to_dict(entry)
+                yield from result.entries
             
             # Save cursor for this path for incremental sync
             self.cursors[path or "root"] = result.cursor
@@ -193,13 +253,39 @@ class DropboxClient:
         except Exception as e:
             logger.error(f"Failed to list folder {path}: {e}")
     
-    def list_folder_changes(self, path: str = "") -> Generator[Dict, None, None]:
+    def list_folder_batched(self, path: str = "", batch_size: int = 200,
+                            **kwargs) -> Generator[List[Dict], None, None]:
+        """
+        List a folder in fixed-size batches
+        Lets the indexer write to Weaviate in bulk instead of per item
+        
+        Args:
+            path: Folder path to list (empty string for root)
+            batch_size: Maximum entries per yielded batch
+            **kwargs: Passed through to list_folder
+            
+        Yields:
+            Lists of file metadata dictionaries
+        """
+        batch: List[Dict] = []
+        for entry in self.list_folder(path, **kwargs):
+            batch.append(entry)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        
+        if batch:
+            yield batch
+    
+    def list_folder_changes(self, path: str = "", cursor: Optional[str] = None) -> Generator[Dict, None, None]:
         """
         List only changes since last sync using cursor
         This is the key to incremental indexing
         
         Args:
             path: Folder path to check for changes
+            cursor: Cursor to resume from (defaults to the saved cursor for path);
+                read the new one with get_cursor(path) once iteration finishes
             
         Yields:
             Changed file metadata
@@ -208,33 +294,26 @@ class DropboxClient:
             logger.error("No Dropbox client available")
             return
         
-        cursor = self.cursors.get(path or "root")
+        cursor = cursor or self.cursors.get(path or "root")
         
         if not cursor:
             logger.info(f"No cursor for {path}, doing full listing")
             # No cursor means we need to do initial sync
-            yield from self.list_folder(path)
+            yield from self._entries_to_changes(self._iter_folder_entries(path, True, False))
             return
         
         try:
             # Get changes since cursor with retry logic
             result = self._list_folder_continue_with_retry(cursor)
             
-            has_changes = False
-            for entry in result.entries:
-                has_changes = True
-                change_data = self._entry_to_dict(entry)
-                change_data['change_type'] = self._determine_change_type(entry)
-                yield change_data
+            has_changes = bool(result.entries)
+            yield from self._entries_to_changes(result.entries)
             
             # Continue if there are more changes
             while result.has_more:
                 result = self._list_folder_continue_with_retry(result.cursor)
-                for entry in result.entries:
-                    has_changes = True
-                    change_data = self._entry_to_dict(entry)
-                    change_data['change_type'] = self._determine_change_type(entry)
-                    yield change_data
+                has_changes = has_changes or bool(result.entries)
+                yield from self._entries_to_changes(result.entries)
             
             # Update cursor
             self.cursors[path or "root"] = result.cursor
@@ -247,11 +326,22 @@ class DropboxClient:
             if e.error.is_reset():
                 logger.warning(f"Cursor expired for {path}, doing full resync")
                 # Cursor expired, need full resync
-                del self.cursors[path or "root"]
-                yield from self.list_folder(path)
+                self.cursors.pop(path or "root", None)
+                yield from self._entries_to_changes(self._iter_folder_entries(path, True, False))
             else:
                 logger.error(f"API error checking changes: {e}")
     
+    def get_cursor(self, path: str = "") -> Optional[str]:
+        """Latest saved cursor for path (updated after each full listing or change scan)"""
+        return self.cursors.get(path or "root")
+    
+    def _entries_to_changes(self, entries) -> Generator[Dict, None, None]:
+        """Convert raw SDK entries to change dictionaries tagged with change_type"""
+        for entry in entries:
+            change_data = self._entry_to_dict(entry)
+            change_data['change_type'] = self._determine_change_type(entry)
+            yield change_data
+    
     def _entry_to_dict(self, entry) -> Dict[str, Any]:
         """Convert Dropbox entry to dictionary"""
         data = {
@@ -3,17 +3,72 @@ Dropbox Token Manager - Handles automatic token refresh for Dropbox API with enc
 """
 
 import os
+import re
 import json
+import struct
 import logging
+import threading
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime, timedelta
 from pathlib import Path
-from dotenv import load_dotenv, set_key
+from dotenv import load_dotenv
 from src.utils.crypto_utils import get_secure_token_manager, secure_getenv, validate_dropbox_config
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 load_dotenv()
 logger = logging.getLogger(__name__)
 
+# Binary token cache record: magic, expiry epoch (0 = unknown), token length,
+# followed by the encrypted token and the 32-byte SHA-256 of the plain token
+_CACHE_MAGIC = b"NDTC"
+_CACHE_HEADER = struct.Struct("<4sQI")
+_CACHE_HASH_SIZE = 32
+
+# Refresh proactively once this fraction of the token lifetime has elapsed
+REFRESH_AT_FRACTION = 0.8
+
+# Serializes .env rewrites across token refreshes in this process
+_ENV_FILE_LOCK = threading.Lock()
+_ENV_KEY_RE = re.compile(r"^\s*(?:export\s+)?([A-Za-z_][A-Za-z0-9_]*)\s*=")
+
+
+def _json_dumps(obj) -> str:
+    """Serialize to a JSON string, using orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj, separators=(",", ":"))
+
+
+def _json_loads(data):
+    """Parse JSON from str or bytes, using orjson when available"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# Shared HTTP session so token refreshes and connection tests reuse the
+# TCP/TLS connection to api.dropboxapi.com instead of handshaking each time
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=10,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=frozenset(["POST"])  # Both endpoints we call are idempotent POSTs
+        )
+    )
+)
+
 class DropboxTokenManager:
     """Manages Dropbox OAuth2 tokens with automatic refresh"""
     
@@ -29,41 +84,63 @@ class DropboxTokenManager:
             logger.error(f"Invalid Dropbox configuration: {e}")
             raise
         
+        # Pooled HTTP session shared across managers
+        self.session = _SESSION
+        
         # Initialize encryption manager
         self.crypto_manager = get_secure_token_manager()
         
-        # Token cache file
-        self.token_cache_file = Path("dropbox_token_cache.json")
+        # Team member to act as for Business accounts (resolved once)
+        self.team_member_id = os.getenv("DROPBOX_TEAM_MEMBER_ID")
+        
+        # Token cache file (legacy JSON cache is read once and migrated on next save)
+        self.token_cache_file = Path("dropbox_token_cache.bin")
+        self.legacy_token_cache_file = Path("dropbox_token_cache.json")
         self.env_file = Path(".env")
         
         # Current access token and expiry
         self.access_token = None
         self.token_expiry = None
         
+        # Built headers keyed by (team_member_id, namespace_id, token_version);
+        # the version is bumped on every refresh so stale entries are never hit
+        self._token_version = 0
+        self._headers_cache = {}
+        self._ns_json_cache = {}
+        
+        # Refreshes happen in a background timer ahead of expiry; the lock keeps
+        # concurrent callers from all refreshing at once if the timer falls behind
+        self._refresh_lock = threading.RLock()
+        self._refresh_timer = None
+        
         # Load cached token if available
         self._load_cached_token()
         
         # If no valid token, try to refresh
         if not self._is_token_valid():
             self.refresh_access_token()
+        else:
+            remaining = (self.token_expiry - datetime.now()).total_seconds()
+            self._schedule_refresh(remaining * REFRESH_AT_FRACTION)
     
     def _load_cached_token(self):
         """Load and decrypt token from cache file if it exists"""
-        if self.token_cache_file.exists():
+        if self.token_cache_file.exists() or self.legacy_token_cache_file.exists():
             try:
-                with open(self.token_cache_file, 'r') as f:
-                    cache = json.load(f)
-                    
-                    # Decrypt token if present
-                    encrypted_token = cache.get('encrypted_access_token')
-                    if encrypted_token:
-                        self.access_token = self.crypto_manager.decrypt(encrypted_token)
-                    
-                    expiry_str = cache.get('expiry')
-                    if expiry_str:
-                        self.token_expiry = datetime.fromisoformat(expiry_str)
-                    
-                    logger.info("Loaded and decrypted cached Dropbox token")
+                if self.token_cache_file.exists():
+                    encrypted_token, self.token_expiry = self._read_cache_record(
+                        self.token_cache_file.read_bytes()
+                    )
+                else:
+                    encrypted_token, self.token_expiry = self._read_legacy_cache(
+                        self.legacy_token_cache_file.read_bytes()
+                    )
+                
+                # Decrypt token if present
+                if encrypted_token:
+                    self.access_token = self.crypto_manager.decrypt(encrypted_token)
+                
+                logger.info("Loaded and decrypted cached Dropbox token")
             except Exception as e:
                 logger.error(f"Failed to load token cache: {e}")
                 # Clear corrupted cache
@@ -75,38 +152,93 @@ class DropboxTokenManager:
                 self.access_token = env_token
                 logger.warning("Using unencrypted token from .env - will encrypt on next save")
     
+    @staticmethod
+    def _read_cache_record(buf: bytes):
+        """Decode a binary cache record into (encrypted_token, expiry)"""
+        magic, expiry_epoch, token_len = _CACHE_HEADER.unpack_from(buf, 0)
+        if magic != _CACHE_MAGIC:
+            raise ValueError("Unrecognized token cache format")
+        
+        start = _CACHE_HEADER.size
+        if len(buf) < start + token_len + _CACHE_HASH_SIZE:
+            raise ValueError("Truncated token cache record")
+        
+        encrypted_token = buf[start:start + token_len].decode("ascii")
+        expiry = datetime.fromtimestamp(expiry_epoch) if expiry_epoch else None
+        return encrypted_token, expiry
+    
+    @staticmethod
+    def _read_legacy_cache(buf: bytes):
+        """Decode the old JSON cache into (encrypted_token, expiry)"""
+        cache = _json_loads(buf)
+        expiry_str = cache.get('expiry')
+        expiry = datetime.fromisoformat(expiry_str) if expiry_str else None
+        return cache.get('encrypted_access_token'), expiry
+    
     def _save_token_cache(self):
         """Save current token to cache file with encryption"""
         try:
             # Encrypt the access token
             encrypted_token = self.crypto_manager.encrypt(self.access_token)
+            token_bytes = encrypted_token.encode("ascii")
             
-            cache = {
-                'encrypted_access_token': encrypted_token,
-                'expiry': self.token_expiry.isoformat() if self.token_expiry else None,
-                'updated_at': datetime.now().isoformat(),
-                'token_hash': self.crypto_manager.hash_data(self.access_token)  # For integrity verification
-            }
+            expiry_epoch = int(self.token_expiry.timestamp()) if self.token_expiry else 0
+            record = b"".join((
+                _CACHE_HEADER.pack(_CACHE_MAGIC, expiry_epoch, len(token_bytes)),
+                token_bytes,
+                # For integrity verification
+                bytes.fromhex(self.crypto_manager.hash_data(self.access_token))
+            ))
             
-            with open(self.token_cache_file, 'w') as f:
-                json.dump(cache, f, indent=2)
+            # Write to a temp file and rename so readers never see a torn record
+            tmp_file = self.token_cache_file.with_suffix(".tmp")
+            tmp_file.write_bytes(record)
+            os.replace(tmp_file, self.token_cache_file)
+            
+            if self.legacy_token_cache_file.exists():
+                self.legacy_token_cache_file.unlink()
             
             # Update .env file with encrypted token for other processes
             if self.env_file.exists():
-                set_key(str(self.env_file), "DROPBOX_ACCESS_TOKEN_ENCRYPTED", encrypted_token)
-                # Remove old unencrypted token if it exists
-                set_key(str(self.env_file), "DROPBOX_ACCESS_TOKEN", "")
+                self._update_env_file({
+                    "DROPBOX_ACCESS_TOKEN_ENCRYPTED": encrypted_token,
+                    # Remove old unencrypted token if it exists
+                    "DROPBOX_ACCESS_TOKEN": ""
+                })
             
             logger.info("Saved encrypted token to cache and .env")
         except Exception as e:
             logger.error(f"Failed to save token cache: {e}")
     
+    def _update_env_file(self, updates):
+        """
+        Set several keys in the .env file with a single read and write
+        Other lines (comments, unrelated keys) are preserved as-is
+        """
+        with _ENV_FILE_LOCK:
+            lines = self.env_file.read_text(encoding="utf-8").splitlines()
+            remaining = dict(updates)
+            
+            for i, line in enumerate(lines):
+                match = _ENV_KEY_RE.match(line)
+                if match and match.group(1) in remaining:
+                    key = match.group(1)
+                    lines[i] = f"{key}='{remaining.pop(key)}'"
+            
+            for key, value in remaining.items():
+                lines.append(f"{key}='{value}'")
+            
+            tmp_file = self.env_file.with_name(self.env_file.name + ".tmp")
+            tmp_file.write_text("\n".join(lines) + "\n", encoding="utf-8")
+            os.replace(tmp_file, self.env_file)
+    
     def _clear_cache(self):
         """Clear corrupted cache file"""
         try:
-            if self.token_cache_file.exists():
-                self.token_cache_file.unlink()
-                logger.info("Cleared corrupted token cache")
+            for cache_file in (self.token_cache_file, self.legacy_token_cache_file):
+                if cache_file.exists():
+                    cache_file.unlink()
+                    logger.info("Cleared corrupted token cache")
         except Exception as e:
             logger.error(f"Failed to clear cache: {e}")
     
@@ -125,60 +257,94 @@ class DropboxTokenManager:
     
     def refresh_access_token(self):
         """Refresh the access token using refresh token"""
-        if not self.refresh_token:
-            logger.error("No refresh token available. Need to re-authenticate.")
-            raise ValueError("No refresh token available")
-        
-        if not self.app_key or not self.app_secret:
-            logger.error("App key and secret required for token refresh")
-            raise ValueError("Missing app credentials")
-        
-        try:
-            logger.info("Refreshing Dropbox access token...")
+        with self._refresh_lock:
+            if not self.refresh_token:
+                logger.error("No refresh token available. Need to re-authenticate.")
+                raise ValueError("No refresh token available")
             
-            # Make refresh request with timeout to prevent hanging
-            response = requests.post(
-                "https://api.dropboxapi.com/oauth2/token",
-                data={
-                    'grant_type': 'refresh_token',
-                    'refresh_token': self.refresh_token,
-                    'client_id': self.app_key,
-                    'client_secret': self.app_secret
-                },
-                timeout=30  # Prevent hanging on network issues
-            )
+            if not self.app_key or not self.app_secret:
+                logger.error("App key and secret required for token refresh")
+                raise ValueError("Missing app credentials")
             
-            if response.status_code == 200:
-                data = response.json()
-                self.access_token = data['access_token']
-                
-                # Calculate expiry (Dropbox tokens typically last 4 hours)
-                expires_in = data.get('expires_in', 14400)  # Default 4 hours
-                self.token_expiry = datetime.now() + timedelta(seconds=expires_in)
-                
-                # Save to cache
-                self._save_token_cache()
+            try:
+                logger.info("Refreshing Dropbox access token...")
                 
-                logger.info(f"Token refreshed successfully, expires at {self.token_expiry}")
-                return self.access_token
-            else:
-                logger.error(f"Token refresh failed: {response.status_code} - {response.text}")
-                raise Exception(f"Token refresh failed: {response.text}")
+                # Make refresh request with timeout to prevent hanging
+                response = self.session.post(
+                    "https://api.dropboxapi.com/oauth2/token",
+                    data={
+                        'grant_type': 'refresh_token',
+                        'refresh_token': self.refresh_token,
+                        'client_id': self.app_key,
+                        'client_secret': self.app_secret
+                    },
+                    timeout=30  # Prevent hanging on network issues
+                )
                 
+                if response.status_code == 200:
+                    data = response.json()
+                    self.access_token = data['access_token']
+                    self._token_version += 1
+                    self._headers_cache.clear()
+                    
+                    # Calculate expiry (Dropbox tokens typically last 4 hours)
+                    expires_in = data.get('expires_in', 14400)  # Default 4 hours
+                    self.token_expiry = datetime.now() + timedelta(seconds=expires_in)
+                    
+                    # Save to cache
+                    self._save_token_cache()
+                    
+                    # Refresh again in the background well before this token expires
+                    self._schedule_refresh(expires_in * REFRESH_AT_FRACTION)
+                    
+                    logger.info(f"Token refreshed successfully, expires at {self.token_expiry}")
+                    return self.access_token
+                else:
+                    logger.error(f"Token refresh failed: {response.status_code} - {response.text}")
+                    raise Exception(f"Token refresh failed: {response.text}")
+            
+            except Exception as e:
+                logger.error(f"Error refreshing token: {e}")
+                raise
+    
+    def _schedule_refresh(self, delay_seconds):
+        """Start (or restart) the background timer that refreshes the token"""
+        if self._refresh_timer is not None:
+            self._refresh_timer.cancel()
+        
+        self._refresh_timer = threading.Timer(max(delay_seconds, 0), self._background_refresh)
+        self._refresh_timer.daemon = True
+        self._refresh_timer.start()
+    
+    def _background_refresh(self):
+        """Timer callback - refresh off the request path"""
+        try:
+            self.refresh_access_token()
         except Exception as e:
-            logger.error(f"Error refreshing token: {e}")
-            raise
+            logger.warning(f"Background token refresh failed: {e}")
+            # Retry shortly while the current token is still usable; once it
+            # expires get_valid_token() falls back to a synchronous refresh
+            if self._is_token_valid():
+                self._schedule_refresh(60)
     
     def get_valid_token(self):
         """Get a valid access token, refreshing if necessary"""
         if not self._is_token_valid():
-            self.refresh_access_token()
+            with self._refresh_lock:
+                # Another caller may have refreshed while we waited for the lock
+                if not self._is_token_valid():
+                    self.refresh_access_token()
         return self.access_token
     
     def get_headers(self, team_member_id=None, namespace_id=None):
         """Get headers with valid token for Dropbox API requests"""
         token = self.get_valid_token()
         
+        key = (team_member_id, namespace_id, self._token_version)
+        cached = self._headers_cache.get(key)
+        if cached is not None:
+            return cached.copy()
+        
         headers = {
             "Authorization": f"Bearer {token}",
             "Content-Type": "application/json"
@@ -188,27 +354,28 @@ class DropboxTokenManager:
             headers["Dropbox-API-Select-User"] = team_member_id
         
         if namespace_id:
-            headers["Dropbox-API-Path-Root"] = json.dumps({
-                ".tag": "namespace_id",
-                "namespace_id": namespace_id
-            })
+            ns_json = self._ns_json_cache.get(namespace_id)
+            if ns_json is None:
+                ns_json = _json_dumps({
+                    ".tag": "namespace_id",
+                    "namespace_id": namespace_id
+                })
+                self._ns_json_cache[namespace_id] = ns_json
+            headers["Dropbox-API-Path-Root"] = ns_json
         
-        return headers
+        self._headers_cache[key] = headers
+        return headers.copy()
     
     def test_connection(self):
         """Test if current token works"""
         try:
-            token = self.get_valid_token()
-            
             # For business accounts, we need the team member ID
-            headers = {"Authorization": f"Bearer {token}"}
-            team_member_id = os.getenv("DROPBOX_TEAM_MEMBER_ID")
-            if team_member_id:
-                headers["Dropbox-API-Select-User"] = team_member_id
+            headers = self.get_headers(team_member_id=self.team_member_id)
             
-            response = requests.post(
+            response = self.session.post(
                 "https://api.dropboxapi.com/2/users/get_current_account",
                 headers=headers,
+                data="null",  # No-argument RPC; required with a JSON Content-Type
                 timeout=30  # Add timeout for consistency
             )
             
@@ -227,10 +394,13 @@ class DropboxTokenManager:
 
 # Singleton instance
 _token_manager = None
+_token_manager_lock = threading.Lock()
 
 def get_token_manager():
     """Get or create the singleton token manager"""
     global _token_manager
     if _token_manager is None:
-        _token_manager = DropboxTokenManager()
+        with _token_manager_lock:
+            if _token_manager is None:
+                _token_manager = DropboxTokenManager()
     return _token_manager
@@ -6,13 +6,53 @@ No hardcoding - discovers entities from the data itself
 
 import logging
 import re
-from typing import Dict, List, Set, Optional
+from functools import lru_cache
+from typing import Dict, List, Set, Optional, Tuple
 from pathlib import Path
 import weaviate
-from collections import defaultdict
+from weaviate.classes.aggregate import GroupByAggregate
+from collections import Counter
+
+from src.utils.bloom_filter import BloomFilter
 
 logger = logging.getLogger(__name__)
 
+try:
+    from rapidfuzz import process as fuzz_process, fuzz, utils as fuzz_utils
+except ImportError:
+    fuzz_process = None
+    logger.warning("rapidfuzz not installed - using substring matching for suggestions")
+
+_WORD_RE = re.compile(r'\b\w+\b')
+_HAS_DIGIT = re.compile(r'\d').search
+
+# Document type keywords recognised in folder names and filenames
+FOLDER_DOC_PATTERNS = ('invoice', 'contract', 'report', 'w9', 'w-9',
+                       'insurance', 'coi', 'agreement', 'receipt')
+FILENAME_DOC_TYPES = ('invoice', 'contract', 'agreement', 'w9', 'receipt',
+                      'report', 'insurance', 'change order')
+
+
+@lru_cache(maxsize=8192)
+def _classify_folder(folder: str) -> Tuple[bool, bool, Tuple[str, ...]]:
+    """
+    Classify a folder name once; names recur heavily across sibling files
+    
+    Returns:
+        (looks_like_project, is_hired_folder, matched document type patterns)
+    """
+    # Projects often have addresses or names with numbers
+    is_project = _HAS_DIGIT(folder) is not None
+    
+    # Contractors often live under "OFFICIALLY HIRED" or similar folders
+    is_hired = 'HIRED' in folder.upper()
+    
+    # Document types often in folder names
+    folder_lower = folder.lower()
+    doc_types = tuple(filter(folder_lower.__contains__, FOLDER_DOC_PATTERNS))
+    
+    return is_project, is_hired, doc_types
+
 
 class EntityDiscovery:
     """
@@ -29,8 +69,12 @@ class EntityDiscovery:
             'projects': set(),
             'contractors': set(),
             'document_types': set(),
-            'common_terms': defaultdict(int)
+            # Only terms seen at least twice are counted; first sightings are
+            # recorded in a Bloom filter (about 120 KB, sized for 100k distinct
+            # terms) so long-tail singletons cost no dict entries
+            'common_terms': Counter()
         }
+        self._seen_terms = BloomFilter()
         
     def discover_from_paths(self, file_paths: List[str]) -> Dict[str, Set[str]]:
         """
@@ -43,45 +87,48 @@ class EntityDiscovery:
         Returns:
             Dictionary of discovered entities
         """
+        # Hoist the target containers out of the per-path loop
+        projects = self.discovered_entities['projects']
+        contractors = self.discovered_entities['contractors']
+        document_types = self.discovered_entities['document_types']
+        common_terms = self.discovered_entities['common_terms']
+        seen_terms_check_and_add = self._seen_terms.check_and_add
+        
         for path in file_paths:
-            parts = Path(path).parts
+            # Same indexing as Path(path).parts for absolute Dropbox paths
+            # ('' stands in for the leading '/'), without building a Path
+            parts = path.split('/')
             
             # Analyze path structure dynamically
             # Look for patterns like /COMPANY_FILES/[PROJECT]/[STATUS]/[CONTRACTOR]/
             if len(parts) > 2:
                 # Potential project folder (usually 2nd or 3rd level)
+                parent_is_hired = False
                 for i in range(1, min(4, len(parts))):
                     folder = parts[i]
+                    is_project, is_hired, doc_types = _classify_folder(folder)
                     
-                    # Projects often have addresses or names with numbers
-                    if any(char.isdigit() for char in folder):
-                        self.discovered_entities['projects'].add(folder)
+                    if is_project:
+                        projects.add(folder)
                     
                     # Look for contractor patterns
-                    # Often in "OFFICIALLY HIRED" or similar folders
-                    if i > 1 and 'HIRED' in parts[i-1].upper():
-                        self.discovered_entities['contractors'].add(folder)
+                    if parent_is_hired:
+                        contractors.add(folder)
+                    parent_is_hired = is_hired
                     
-                    # Document types often in folder names
-                    doc_patterns = ['invoice', 'contract', 'report', 'w9', 'w-9', 
-                                  'insurance', 'coi', 'agreement', 'receipt']
-                    folder_lower = folder.lower()
-                    for pattern in doc_patterns:
-                        if pattern in folder_lower:
-                            self.discovered_entities['document_types'].add(pattern)
+                    if doc_types:
+                        document_types.update(doc_types)
             
             # Analyze filename for document types
-            filename = Path(path).name.lower()
-            for doc_type in ['invoice', 'contract', 'agreement', 'w9', 'receipt', 
-                           'report', 'insurance', 'change order']:
-                if doc_type in filename:
-                    self.discovered_entities['document_types'].add(doc_type)
+            name_lower = parts[-1].lower()
+            document_types.update(filter(name_lower.__contains__, FILENAME_DOC_TYPES))
             
             # Track common terms for pattern recognition
-            words = re.findall(r'\b\w+\b', path)
-            for word in words:
+            for word in _WORD_RE.findall(path):
                 if len(word) > 3:  # Skip short words
-                    self.discovered_entities['common_terms'][word.lower()] += 1
+                    word = word.lower()
+                    if word in common_terms or seen_terms_check_and_add(word):
+                        common_terms[word] += 1
         
         # Convert sets to lists for JSON serialization
         return {
@@ -89,9 +136,9 @@ class EntityDiscovery:
             'contractors': list(self.discovered_entities['contractors']),
             'document_types': list(self.discovered_entities['document_types']),
             'frequent_terms': [
-                term for term, count in self.discovered_entities['common_terms'].items() 
-                if count > 3  # Terms appearing more than 3 times
-            ][:50]  # Top 50 frequent terms
+                term for term, count in self.discovered_entities['common_terms'].most_common(50)
+                if count > 2  # Terms appearing more than 3 times (first sighting isn't counted)
+            ]  # Top 50 frequent terms
         }
     
     def discover_from_weaviate(self) -> Dict[str, List[str]]:
@@ -104,51 +151,80 @@ class EntityDiscovery:
         if not self.weaviate_client:
             return {}
         
-        discovered = {
-            'projects': set(),
-            'contractors': set(),
-            'document_types': set()
-        }
-        
         try:
             # Query Weaviate for unique property values
             # This is dynamic - we're learning from what's actually indexed
-            
-            # Get sample of documents to analyze
-            result = self.weaviate_client.query.get(
-                "Document",
-                ["project_name", "contractor", "document_type", "file_path"]
-            ).with_limit(100).do()
-            
-            if result and 'data' in result and 'Get' in result['data']:
-                documents = result['data']['Get'].get('Document', [])
-                
-                for doc in documents:
-                    if doc.get('project_name'):
-                        discovered['projects'].add(doc['project_name'])
-                    if doc.get('contractor'):
-                        discovered['contractors'].add(doc['contractor'])
-                    if doc.get('document_type'):
-                        discovered['document_types'].add(doc['document_type'])
-                    
-                    # Also learn from paths in the index
-                    if doc.get('file_path'):
-                        path_parts = Path(doc['file_path']).parts
-                        for part in path_parts:
-                            # Simple heuristic: folders with numbers might be projects
-                            if any(char.isdigit() for char in part):
-                                discovered['projects'].add(part)
-            
+            collection = self.weaviate_client.collections.get("Document")
+        except Exception as e:
+            logger.error(f"Failed to discover from Weaviate: {e}")
+            return {}
+        
+        try:
+            # Let the server compute distinct values; only the group keys come back
             return {
-                'projects': list(discovered['projects']),
-                'contractors': list(discovered['contractors']),
-                'document_types': list(discovered['document_types'])
+                'projects': self._distinct_values(collection, "project_name"),
+                'contractors': self._distinct_values(collection, "contractor"),
+                'document_types': self._distinct_values(collection, "document_type")
             }
-            
+        except Exception as e:
+            logger.warning(f"Aggregate discovery unavailable, scanning documents: {e}")
+        
+        try:
+            return self._discover_by_iteration(collection)
         except Exception as e:
             logger.error(f"Failed to discover from Weaviate: {e}")
             return {}
     
+    @staticmethod
+    def _distinct_values(collection, prop: str, limit: int = 1000) -> List[str]:
+        """Distinct non-empty values of a property via Aggregate groupBy"""
+        response = collection.aggregate.over_all(
+            group_by=GroupByAggregate(prop=prop, limit=limit)
+        )
+        return [
+            group.grouped_by.value
+            for group in response.groups
+            if group.grouped_by and group.grouped_by.value
+        ]
+    
+    @staticmethod
+    def _discover_by_iteration(collection) -> Dict[str, List[str]]:
+        """Fallback discovery that streams documents when groupBy is unsupported"""
+        discovered = {
+            'projects': set(),
+            'contractors': set(),
+            'document_types': set()
+        }
+        
+        # Stream every document with the v4 cursor iterator (paginates on
+        # the object UUID server-side), projecting only the string fields
+        documents = collection.iterator(
+            return_properties=["project_name", "contractor", "document_type", "file_path"],
+            cache_size=1000
+        )
+        
+        for obj in documents:
+            doc = obj.properties
+            if doc.get('project_name'):
+                discovered['projects'].add(doc['project_name'])
+            if doc.get('contractor'):
+                discovered['contractors'].add(doc['contractor'])
+            if doc.get('document_type'):
+                discovered['document_types'].add(doc['document_type'])
+            
+            # Also learn from paths in the index
+            if doc.get('file_path'):
+                for part in doc['file_path'].split('/'):
+                    # Simple heuristic: folders with numbers might be projects
+                    if _HAS_DIGIT(part):
+                        discovered['projects'].add(part)
+        
+        return {
+            'projects': list(discovered['projects']),
+            'contractors': list(discovered['contractors']),
+            'document_types': list(discovered['document_types'])
+        }
+    
     def learn_patterns(self, successful_searches: List[Dict]) -> None:
         """
         Learn from successful searches to improve future discovery
@@ -174,6 +250,26 @@ class EntityDiscovery:
         Returns:
             List of alternative suggestions
         """
+        if fuzz_process is not None:
+            if category == 'contractor':
+                candidates = self.discovered_entities['contractors']
+            elif category == 'project':
+                candidates = self.discovered_entities['projects']
+            else:
+                return []
+            
+            # partial_ratio scores substring-style matches and tolerates typos;
+            # default_process lowercases/strips in C, so no per-call .lower()
+            matches = fuzz_process.extract(
+                term,
+                list(candidates),
+                scorer=fuzz.partial_ratio,
+                processor=fuzz_utils.default_process,
+                limit=5,
+                score_cutoff=70
+            )
+            return [choice for choice, _score, _index in matches]
+        
         suggestions = []
         term_lower = term.lower()
         
@@ -4,8 +4,15 @@ Uses LLM with structured output to dynamically extract entities
 No hardcoding - learns from context and data
 """
 
+import os
 import json
+import asyncio
+import time
+import hashlib
 import logging
+import sqlite3
+import threading
+from pathlib import Path
 from typing import Dict, List, Optional, Any
 from pydantic import BaseModel, Field
 from langchain_openai import ChatOpenAI
@@ -13,6 +20,86 @@ from langchain_core.messages import SystemMessage, HumanMessage
 
 logger = logging.getLogger(__name__)
 
+EXTRACTION_MODEL = "gpt-4o-mini"
+
+# A cache hit refreshes its LRU timestamp at most this often, so most hits stay read-only
+CACHE_TOUCH_INTERVAL_SECONDS = 3600
+
+
+class _ExtractionCache:
+    """
+    Persistent LRU cache of entity extractions backed by SQLite
+    Keys are hashes of (model, system prompt, query); values are SearchEntities JSON
+    """
+    
+    def __init__(self, path: str, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS extractions "
+            "(key TEXT PRIMARY KEY, value TEXT NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._conn.commit()
+    
+    @staticmethod
+    def make_key(*parts: str) -> str:
+        """Hash the prompt inputs into a fixed-size cache key"""
+        digest = hashlib.blake2b(digest_size=16)
+        for part in parts:
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\x00")
+        return digest.hexdigest()
+    
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, last_used FROM extractions WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            
+            # Recency only matters for eviction, which is coarse; skip the write
+            # transaction unless the timestamp is stale
+            now = time.time()
+            if now - row[1] > CACHE_TOUCH_INTERVAL_SECONDS:
+                self._conn.execute(
+                    "UPDATE extractions SET last_used = ? WHERE key = ?", (now, key)
+                )
+                self._conn.commit()
+            return row[0]
+    
+    def set(self, key: str, value: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO extractions (key, value, last_used) VALUES (?, ?, ?)",
+                (key, value, time.time())
+            )
+            # Evict least recently used rows beyond the size limit
+            self._conn.execute(
+                "DELETE FROM extractions WHERE key IN ("
+                "SELECT key FROM extractions ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+            self._conn.commit()
+
+
+_extraction_cache = None
+
+
+def _get_extraction_cache() -> Optional[_ExtractionCache]:
+    """Get or create the shared extraction cache (None if it cannot be opened)"""
+    global _extraction_cache
+    if _extraction_cache is None:
+        path = os.getenv("ENTITY_CACHE_PATH", ".cache/entity_extractions.sqlite3")
+        try:
+            _extraction_cache = _ExtractionCache(path)
+        except Exception as e:
+            logger.warning(f"Entity extraction cache disabled: {e}")
+            return None
+    return _extraction_cache
+
 
 class SearchEntities(BaseModel):
     """Structured output schema for entity extraction"""
@@ -25,6 +112,14 @@ class SearchEntities(BaseModel):
     specific_file: Optional[str] = Field(None, description="Specific filename if mentioned")
 
 
+class SearchEntitiesBatch(BaseModel):
+    """Structured output schema for extracting several queries in one call"""
+    items: List[SearchEntities] = Field(
+        default_factory=list,
+        description="One extraction per query, in the same order as the queries"
+    )
+
+
 class DropboxEntityExtractor:
     """
     Extracts structured entities from natural language queries
@@ -34,11 +129,13 @@ class DropboxEntityExtractor:
     def __init__(self):
         """Initialize the entity extractor with structured output"""
         # Use GPT-4o-mini for cost-effective extraction
-        self.llm = ChatOpenAI(
-            model="gpt-4o-mini",
+        base_llm = ChatOpenAI(
+            model=EXTRACTION_MODEL,
             temperature=0.1,  # Low temperature for consistent extraction
             timeout=20
-        ).with_structured_output(SearchEntities)
+        )
+        self.llm = base_llm.with_structured_output(SearchEntities)
+        self.batch_llm = base_llm.with_structured_output(SearchEntitiesBatch)
         
         # System prompt with construction domain context
         self.system_prompt = """You are an entity extraction specialist for a construction company's document search system.
@@ -64,8 +161,80 @@ Examples to guide you:
 
 Remember: Extract what's there, don't invent or assume."""
         
+        # Frozen copy of the base prompt; per-call prompts are always built from
+        # it into fresh strings/messages, never by mutating shared state
+        self._base_prompt = self.system_prompt
+        
+        # Enhanced prompts keyed by the discovered-entity hints they embed
+        self._enhanced_prompt_cache: Dict[tuple, str] = {}
+        
+        # Identical queries skip the LLM round-trip entirely
+        self.cache = _get_extraction_cache()
+        
         logger.info("DropboxEntityExtractor initialized with structured output")
     
+    def _cache_lookup(self, messages: List):
+        """Return (cache key, cached SearchEntities or None) for these messages"""
+        if self.cache is None:
+            return None, None
+        
+        key = _ExtractionCache.make_key(
+            EXTRACTION_MODEL, *(message.content for message in messages)
+        )
+        try:
+            cached = self.cache.get(key)
+            if cached is not None:
+                # Entries were produced by model_dump_json, so skip re-validation
+                return key, SearchEntities.model_construct(**json.loads(cached))
+        except Exception as e:
+            logger.debug(f"Extraction cache read failed: {e}")
+        return key, None
+    
+    def _cache_store(self, key: Optional[str], entities: SearchEntities) -> None:
+        """Persist an extraction under its cache key"""
+        if key is None:
+            return
+        try:
+            self.cache.set(key, entities.model_dump_json())
+        except Exception as e:
+            logger.debug(f"Extraction cache write failed: {e}")
+    
+    def _invoke_cached(self, messages: List) -> SearchEntities:
+        """Invoke the LLM, serving repeat prompts from the persistent cache"""
+        key, cached = self._cache_lookup(messages)
+        if cached is not None:
+            return cached
+        
+        entities = self.llm.invoke(messages)
+        self._cache_store(key, entities)
+        return entities
+    
+    async def _ainvoke_cached(self, messages: List) -> SearchEntities:
+        """Async counterpart of _invoke_cached"""
+        key, cached = self._cache_lookup(messages)
+        if cached is not None:
+            return cached
+        
+        entities = await self.llm.ainvoke(messages)
+        self._cache_store(key, entities)
+        return entities
+    
+    def _build_extract_messages(self, query: str, context: Optional[Dict] = None) -> List:
+        """Build the system + user messages for a single extraction"""
+        content = self._base_prompt
+        
+        # Add context if provided (for follow-up queries)
+        if context:
+            context_msg = f"\nContext from previous interaction:\n"
+            if context.get('last_document'):
+                context_msg += f"Last document found: {context['last_document']}\n"
+            if context.get('last_search'):
+                context_msg += f"Last search: {context['last_search']}\n"
+            
+            content += context_msg
+        
+        return [SystemMessage(content=content), HumanMessage(content=query)]
+    
     def extract(self, query: str, context: Optional[Dict] = None) -> SearchEntities:
         """
         Extract entities from a user query
@@ -78,24 +247,10 @@ Remember: Extract what's there, don't invent or assume."""
             SearchEntities object with extracted information
         """
         try:
-            # Build the messages
-            messages = [SystemMessage(content=self.system_prompt)]
-            
-            # Add context if provided (for follow-up queries)
-            if context:
-                context_msg = f"\nContext from previous interaction:\n"
-                if context.get('last_document'):
-                    context_msg += f"Last document found: {context['last_document']}\n"
-                if context.get('last_search'):
-                    context_msg += f"Last search: {context['last_search']}\n"
-                
-                messages[0].content += context_msg
-            
-            # Add the user query
-            messages.append(HumanMessage(content=query))
+            messages = self._build_extract_messages(query, context)
             
             # Get structured extraction
-            entities = self.llm.invoke(messages)
+            entities = self._invoke_cached(messages)
             
             logger.info(f"Extracted entities: {entities.model_dump_json()}")
             return entities
@@ -105,6 +260,119 @@ Remember: Extract what's there, don't invent or assume."""
             # Return empty entities on failure
             return SearchEntities()
     
+    async def aextract(self, query: str, context: Optional[Dict] = None) -> SearchEntities:
+        """
+        Async version of extract so concurrent queries overlap on the OpenAI side
+        
+        Args:
+            query: Natural language query from user
+            context: Optional context about previous searches or current document
+            
+        Returns:
+            SearchEntities object with extracted information
+        """
+        try:
+            messages = self._build_extract_messages(query, context)
+            entities = await self._ainvoke_cached(messages)
+            
+            logger.info(f"Extracted entities: {entities.model_dump_json()}")
+            return entities
+            
+        except Exception as e:
+            logger.error(f"Entity extraction failed: {e}")
+            return SearchEntities()
+    
+    async def aextract_batch(self, queries: List[str], max_concurrency: int = 10) -> List[SearchEntities]:
+        """
+        Extract entities for many queries concurrently
+        
+        Args:
+            queries: Natural language queries
+            max_concurrency: Maximum in-flight LLM calls (respects rate limits)
+            
+        Returns:
+            SearchEntities for each query, in input order
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def _bounded(query: str) -> SearchEntities:
+            async with semaphore:
+                return await self.aextract(query)
+        
+        return list(await asyncio.gather(*(_bounded(query) for query in queries)))
+    
+    def extract_many(self, queries: List[str], batch_size: int = 20) -> List[SearchEntities]:
+        """
+        Extract entities for several queries, sharing one LLM call per batch
+        The system prompt is sent once per batch instead of once per query
+        
+        Args:
+            queries: Natural language queries
+            batch_size: Maximum queries per LLM call
+            
+        Returns:
+            SearchEntities for each query, in input order
+        """
+        if len(queries) <= 1:
+            return [self.extract(query) for query in queries]
+        
+        results: List[SearchEntities] = []
+        for start in range(0, len(queries), batch_size):
+            batch = queries[start:start + batch_size]
+            
+            try:
+                listing = "\n".join(f"Query {i}: {query}" for i, query in enumerate(batch))
+                messages = [
+                    SystemMessage(content=self._base_prompt + (
+                        "\n\nYou will receive several numbered queries. "
+                        "Return exactly one extraction per query, in the same order."
+                    )),
+                    HumanMessage(content=listing)
+                ]
+                
+                extracted = self.batch_llm.invoke(messages).items
+                if len(extracted) != len(batch):
+                    raise ValueError(f"expected {len(batch)} extractions, got {len(extracted)}")
+                results.extend(extracted)
+                
+            except Exception as e:
+                # Fall back to one call per query so a bad batch doesn't lose results
+                logger.warning(f"Batch extraction failed, extracting individually: {e}")
+                results.extend(self.extract(query) for query in batch)
+        
+        return results
+    
+    def _get_enhanced_prompt(self, discovered_entities: Optional[Dict]) -> str:
+        """
+        Build the system prompt with discovered-entity hints
+        Only the first 10 projects/contractors are embedded, so those form the cache key
+        """
+        if not discovered_entities:
+            return self._base_prompt
+        
+        projects = tuple(discovered_entities.get('projects') or ())[:10]
+        contractors = tuple(discovered_entities.get('contractors') or ())[:10]
+        key = (projects, contractors)
+        
+        cached = self._enhanced_prompt_cache.get(key)
+        if cached is not None:
+            return cached
+        
+        # Build enhanced prompt with discovered context
+        parts = [self._base_prompt, "\n\nDiscovered entities from the system:\n"]
+        if projects:
+            parts.append(f"Known projects: {', '.join(projects)}\n")
+        if contractors:
+            parts.append(f"Known contractors: {', '.join(contractors)}\n")
+        parts.append("\nUse these as hints but don't force matches - extract what the user actually said.")
+        enhanced_prompt = "".join(parts)
+        
+        # Discovered entities change rarely; keep the cache from growing unbounded
+        if len(self._enhanced_prompt_cache) >= 32:
+            self._enhanced_prompt_cache.clear()
+        self._enhanced_prompt_cache[key] = enhanced_prompt
+        return enhanced_prompt
+    
     def extract_with_examples(self, query: str, discovered_entities: Optional[Dict] = None) -> SearchEntities:
         """
         Enhanced extraction that can use discovered entities from the actual data
@@ -117,26 +385,14 @@ Remember: Extract what's there, don't invent or assume."""
             SearchEntities with extraction
         """
         try:
-            # Build enhanced prompt with discovered context
-            enhanced_prompt = self.system_prompt
-            
-            if discovered_entities:
-                enhanced_prompt += "\n\nDiscovered entities from the system:\n"
-                
-                if discovered_entities.get('projects'):
-                    enhanced_prompt += f"Known projects: {', '.join(discovered_entities['projects'][:10])}\n"
-                
-                if discovered_entities.get('contractors'):
-                    enhanced_prompt += f"Known contractors: {', '.join(discovered_entities['contractors'][:10])}\n"
-                
-                enhanced_prompt += "\nUse these as hints but don't force matches - extract what the user actually said."
+            enhanced_prompt = self._get_enhanced_prompt(discovered_entities)
             
             messages = [
                 SystemMessage(content=enhanced_prompt),
                 HumanMessage(content=query)
             ]
             
-            entities = self.llm.invoke(messages)
+            entities = self._invoke_cached(messages)
             return entities
             
         except Exception as e:
@@ -180,7 +436,7 @@ Provide a refined extraction that might yield better results."""
                 HumanMessage(content="Refine the extraction for better search results")
             ]
             
-            refined = self.llm.invoke(messages)
+            refined = self._invoke_cached(messages)
             logger.info(f"Refined entities: {refined.model_dump_json()}")
             return refined
             
@@ -4,19 +4,300 @@ Implements cursor-based change detection and daily sync
 Cursor-based incremental indexing for production use
 """
 
+import asyncio
+import copy
+import functools
 import logging
+import logging.handlers
 import json
-from typing import Dict, List, Optional, Any
-from datetime import datetime, timedelta
+import mmap
+import multiprocessing
+import queue
+import sqlite3
+from itertools import islice
+import threading
+import time
+from contextlib import contextmanager
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait
+from typing import Dict, List, Optional, Any, Iterator, Set, Tuple
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 import os
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from src.utils.bloom_filter import BloomFilter
+
 from .dropbox_client import DropboxClient
 from .document_processor import DocumentProcessor
 from .weaviate_indexer import WeaviateIndexer
 
 logger = logging.getLogger(__name__)
 
+# Files handed to the worker pool at a time (download + index are IO-bound)
+SYNC_BATCH_SIZE = 200
+
+# Downloaded files buffered ahead of the parser pool (back-pressure on downloads)
+PREFETCH_QUEUE_SIZE = 32
+
+# Listing entries buffered ahead of the sync loop, so pagination RPCs overlap processing
+LISTING_PREFETCH_SIZE = 256
+
+# Processed documents flushed to Weaviate per batch request, by count or size
+INDEX_BATCH_SIZE = 100
+INDEX_BATCH_MAX_BYTES = 10 * 1024 * 1024
+
+# Deleted file IDs removed from Weaviate per batch request
+DELETE_BATCH_SIZE = 100
+
+# In-flight file tasks for the async sync path
+ASYNC_MAX_IN_FLIGHT = 32
+
+# File extensions (without the dot) that the processor can index
+SUPPORTED_EXTENSIONS = frozenset({'pdf', 'txt', 'md', 'csv', 'doc', 'docx'})
+
+# Same extensions as lowercase suffixes, for a single str.endswith check
+SUPPORTED_SUFFIXES = tuple(sorted(f'.{ext}' for ext in SUPPORTED_EXTENSIONS))
+
+# Sync runs older than this are pruned from the history log
+HISTORY_RETENTION_DAYS = 30
+
+# get_sync_status results are reused for this long (status pollers hit it often)
+SYNC_STATUS_TTL_SECONDS = 5
+
+# Progress is logged every N files (initial sync) / changes (incremental sync)
+INITIAL_PROGRESS_EVERY = 10
+INCREMENTAL_PROGRESS_EVERY = 5
+
+
+def _dumps(obj: Any, indent: bool = False) -> bytes:
+    """
+    Serialize to JSON bytes, using orjson when available
+    No default= fallback: everything stored is already JSON-native, which
+    keeps both serializers on their C paths
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None).encode("utf-8")
+
+
+def _loads(data: bytes) -> Any:
+    """Parse JSON bytes, using orjson when available"""
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def _load_file(path: Path) -> Any:
+    """
+    Parse a JSON file; with orjson the file is memory-mapped and parsed
+    straight from the page cache instead of being read into a bytes copy
+    """
+    if orjson is None:
+        return json.loads(path.read_bytes())
+    
+    with open(path, 'rb') as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files can't be mapped
+            return orjson.loads(b"")
+        with mm, memoryview(mm) as view:
+            return orjson.loads(view)
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    """
+    Replace path with data without ever exposing a torn file
+    Only the temp file is fsynced; os.replace then swaps it in atomically
+    """
+    tmp_file = path.with_name(path.name + '.tmp')
+    with open(tmp_file, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_file, path)
+
+
+class _RevisionIndex:
+    """
+    Last indexed (rev, content_hash, path) per Dropbox file, backed by SQLite
+    Lets incremental sync skip changes whose content and path are unchanged
+    """
+    
+    def __init__(self, path: Path):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS revisions "
+            "(file_id TEXT PRIMARY KEY, rev TEXT, content_hash TEXT, path_lower TEXT)"
+        )
+        self._conn.commit()
+    
+    def is_unchanged(self, file_metadata: Dict[str, Any]) -> bool:
+        """True if this exact revision (or identical content) is already indexed at this path"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT rev, content_hash, path_lower FROM revisions WHERE file_id = ?",
+                (file_metadata['id'],)
+            ).fetchone()
+        if row is None or row[2] != file_metadata.get('path_lower'):
+            return False
+        rev, content_hash = row[0], row[1]
+        return (rev is not None and rev == file_metadata.get('rev')) or \
+            (content_hash is not None and content_hash == file_metadata.get('content_hash'))
+    
+    def record(self, file_metadata: Dict[str, Any]) -> None:
+        """Remember the revision that was just indexed (committed by commit())"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO revisions (file_id, rev, content_hash, path_lower) VALUES (?, ?, ?, ?)",
+                (file_metadata['id'], file_metadata.get('rev'), file_metadata.get('content_hash'),
+                 file_metadata.get('path_lower'))
+            )
+    
+    def forget(self, file_id: str) -> None:
+        """Drop a deleted file"""
+        with self._lock:
+            self._conn.execute("DELETE FROM revisions WHERE file_id = ?", (file_id,))
+    
+    def commit(self) -> None:
+        with self._lock:
+            self._conn.commit()
+
+
+_PREFETCH_DONE = object()
+
+
+def _prefetch(iterable, maxsize: int) -> Iterator[Any]:
+    """
+    Drain iterable on a daemon thread through a bounded queue
+    The producer runs ahead by at most maxsize items; its exceptions are
+    re-raised in the consumer
+    
+    Args:
+        iterable: Source to consume in the background (e.g. a listing generator)
+        maxsize: Queue bound providing back-pressure
+        
+    Yields:
+        Items of iterable, in order
+    """
+    items: queue.Queue = queue.Queue(maxsize=maxsize)
+    stop = threading.Event()
+    
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                items.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+    
+    def produce():
+        try:
+            for item in iterable:
+                if not put(item):
+                    return
+            put(_PREFETCH_DONE)
+        except BaseException as e:
+            put(e)
+    
+    threading.Thread(target=produce, name="listing-prefetch", daemon=True).start()
+    try:
+        while True:
+            item = items.get()
+            if item is _PREFETCH_DONE:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stop.set()
+
+
+# Logger of this package (dropbox_v2); only its records go through the
+# background queue while a sync runs
+_PACKAGE_LOGGER = __package__ or __name__
+
+_log_lock = threading.Lock()
+_log_depth = 0
+_log_listener: Optional[logging.handlers.QueueListener] = None
+_log_queue_handler: Optional[logging.handlers.QueueHandler] = None
+
+
+class _ParentHandlers(logging.Handler):
+    """Listener-side handler passing records to the handlers above a logger, as propagation would"""
+    
+    def __init__(self, logger: logging.Logger):
+        super().__init__()
+        self._logger = logger
+    
+    def emit(self, record: logging.LogRecord) -> None:
+        self._logger.callHandlers(record)
+
+
+@contextmanager
+def _background_logging():
+    """
+    Route this package's log records through a queue drained by a listener
+    thread, so formatting and I/O don't run on the sync threads. Other
+    loggers and the root handlers are left alone. Reentrant.
+    """
+    global _log_depth, _log_listener, _log_queue_handler
+    package_logger = logging.getLogger(_PACKAGE_LOGGER)
+    
+    with _log_lock:
+        _log_depth += 1
+        # A package logger that doesn't propagate has nothing above it to offload
+        if _log_depth == 1 and package_logger.propagate and package_logger.parent is not None:
+            log_queue = queue.SimpleQueue()
+            _log_queue_handler = logging.handlers.QueueHandler(log_queue)
+            _log_listener = logging.handlers.QueueListener(log_queue, _ParentHandlers(package_logger.parent))
+            package_logger.addHandler(_log_queue_handler)
+            package_logger.propagate = False
+            _log_listener.start()
+    try:
+        yield
+    finally:
+        with _log_lock:
+            _log_depth -= 1
+            if _log_depth == 0 and _log_listener is not None:
+                package_logger.removeHandler(_log_queue_handler)
+                package_logger.propagate = True
+                # stop() flushes whatever is still queued
+                _log_listener.stop()
+                _log_listener, _log_queue_handler = None, None
+
+
+def _logs_in_background(func):
+    """Run a sync entry point (plain or async) inside _background_logging"""
+    if asyncio.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            with _background_logging():
+                return await func(*args, **kwargs)
+        return async_wrapper
+    
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with _background_logging():
+            return func(*args, **kwargs)
+    return wrapper
+
+
+# Per-process DocumentProcessor, created on first use inside a pool worker
+_worker_processor: Optional[DocumentProcessor] = None
+
+
+def _process_document_in_worker(content: bytes, file_metadata: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Parse a downloaded file inside a process pool worker"""
+    global _worker_processor
+    if _worker_processor is None:
+        _worker_processor = DocumentProcessor()
+    return _worker_processor.process_document(content, file_metadata)
+
 
 class IncrementalSync:
     """
@@ -35,38 +316,287 @@ class IncrementalSync:
         self.dropbox = DropboxClient()
         self.processor = DocumentProcessor()
         self.indexer = WeaviateIndexer()
+        self.max_workers = int(os.getenv("SYNC_WORKERS", "16"))
         
-        # Sync state file
+        # PDF/DOCX parsing is CPU-bound, so it runs in worker processes
+        # while downloads stay on threads
+        self.process_workers = int(os.getenv("SYNC_PROCESS_WORKERS", str(os.cpu_count() or 1)))
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        
+        # Processed documents waiting for the next batch index request
+        self._pending_docs: List[Tuple[Dict[str, Any], Dict[str, Any]]] = []
+        self._pending_bytes = 0
+        # Results of a final flush that ran after processing failed or was
+        # abandoned, left for the caller to record
+        self._unreported_results: List[Tuple[Dict[str, Any], bool]] = []
+        
+        # Small core state file (rewritten atomically) plus an append-only
+        # JSONL log of per-run stats, so saves don't grow with history
         self.state_file = Path("dropbox_sync_state.json")
+        self.history_file = Path("dropbox_sync_history.jsonl")
+        self._state_writer: Optional[threading.Thread] = None
+        self._status_cache: Optional[Tuple[float, Dict[str, Any]]] = None
         self.sync_state = self._load_sync_state()
         
+        # Dropbox IDs already in the index, loaded lazily so add-vs-modify
+        # classification is a set lookup instead of a Weaviate query per file.
+        # Snapshotted to a sidecar file for warm starts.
+        self.known_ids_file = Path("dropbox_known_ids.txt")
+        self._known_ids: Optional[Set[str]] = None
+        
+        # Persisted Bloom filter over the same IDs: a miss answers "new file"
+        # without loading the full set on a cold start
+        self.known_ids_bloom_file = Path("dropbox_known_ids.bloom")
+        self._known_ids_bloom: Optional[BloomFilter] = self._load_known_ids_bloom()
+        
+        # Revision of each indexed file, so unchanged changes skip download/parse/embed
+        self.rev_index_file = Path("dropbox_rev_index.sqlite3")
+        self._rev_index: Optional[_RevisionIndex] = None
+        
         logger.info(f"IncrementalSync initialized for {root_path}")
     
     def _load_sync_state(self) -> Dict[str, Any]:
         """Load sync state from file"""
         if self.state_file.exists():
             try:
-                with open(self.state_file, 'r') as f:
-                    return json.load(f)
+                state = _load_file(self.state_file)
+                
+                # Migrate history embedded by older versions into the log
+                legacy_history = state.pop('sync_history', None)
+                if legacy_history and not self.history_file.exists():
+                    for entry in legacy_history:
+                        self._history_timestamp(entry)
+                        self._append_sync_history(entry)
+                
+                return state
             except Exception as e:
                 logger.error(f"Failed to load sync state: {e}")
         
         return {
             'last_sync': None,
             'total_indexed': 0,
-            'last_cursor': None,
-            'sync_history': []
+            'last_cursor': None
         }
     
-    def _save_sync_state(self) -> None:
-        """Save sync state to file"""
+    def _load_known_ids(self) -> Set[str]:
+        """Load the indexed-ID set from the sidecar snapshot, else from Weaviate"""
+        if self._known_ids is not None:
+            return self._known_ids
+        
+        if self.known_ids_file.exists():
+            try:
+                with open(self.known_ids_file, 'r', encoding='utf-8') as f:
+                    self._known_ids = {line.rstrip('\n') for line in f if line.strip()}
+                return self._known_ids
+            except Exception as e:
+                logger.error(f"Failed to load known IDs snapshot: {e}")
+        
+        try:
+            self._known_ids = self.indexer.list_document_ids()
+        except Exception as e:
+            logger.error(f"Failed to list indexed document IDs: {e}")
+            self._known_ids = set()
+        return self._known_ids
+    
+    def _load_known_ids_bloom(self) -> Optional[BloomFilter]:
+        """Load the persisted ID Bloom filter, if one exists"""
+        if not self.known_ids_bloom_file.exists():
+            return None
         try:
-            with open(self.state_file, 'w') as f:
-                json.dump(self.sync_state, f, indent=2, default=str)
+            return BloomFilter.from_bytes(self.known_ids_bloom_file.read_bytes())
+        except Exception as e:
+            logger.error(f"Failed to load known IDs bloom filter: {e}")
+            return None
+    
+    def _remember_indexed_id(self, file_id: str) -> None:
+        """Record a newly indexed file in the ID set and Bloom filter"""
+        self._load_known_ids().add(file_id)
+        if self._known_ids_bloom is not None:
+            self._known_ids_bloom.add(file_id)
+    
+    def _get_rev_index(self) -> Optional[_RevisionIndex]:
+        """Open the revision index on first use (None if it cannot be opened)"""
+        if self._rev_index is None:
+            try:
+                self._rev_index = _RevisionIndex(self.rev_index_file)
+            except Exception as e:
+                logger.warning(f"Revision index disabled: {e}")
+                return None
+        return self._rev_index
+    
+    def _is_unchanged(self, file_metadata: Dict[str, Any]) -> bool:
+        """Check whether this revision of the file is already indexed"""
+        rev_index = self._get_rev_index()
+        return rev_index is not None and rev_index.is_unchanged(file_metadata)
+    
+    def _record_revision(self, file_metadata: Dict[str, Any]) -> None:
+        """Remember the revision of a successfully indexed file"""
+        rev_index = self._get_rev_index()
+        if rev_index is not None:
+            rev_index.record(file_metadata)
+    
+    def _save_known_ids(self) -> None:
+        """Snapshot the indexed-ID set (and a rebuilt Bloom filter) and commit revisions for the next run"""
+        if self._rev_index is not None:
+            try:
+                self._rev_index.commit()
+            except Exception as e:
+                logger.error(f"Failed to save revision index: {e}")
+        
+        if self._known_ids is None:
+            return
+        try:
+            _atomic_write(self.known_ids_file, ''.join(f"{file_id}\n" for file_id in self._known_ids).encode('utf-8'))
+            
+            # Rebuild rather than update so deleted IDs stop matching
+            self._known_ids_bloom = BloomFilter.from_items(
+                self._known_ids, capacity=max(100_000, 2 * len(self._known_ids))
+            )
+            _atomic_write(self.known_ids_bloom_file, self._known_ids_bloom.to_bytes())
+        except Exception as e:
+            logger.error(f"Failed to save known IDs snapshot: {e}")
+    
+    def _save_sync_state(self, background: bool = False) -> None:
+        """
+        Save sync state to file
+        
+        Args:
+            background: Write (and fsync) on a separate thread so the sync run
+                can return; the state is serialized before this returns
+        """
+        self._status_cache = None
+        try:
+            data = _dumps(self.sync_state, indent=True)
+        except Exception as e:
+            logger.error(f"Failed to save sync state: {e}")
+            return
+        
+        # One writer at a time, so saves land in order
+        self._wait_for_state_writer()
+        if background:
+            self._state_writer = threading.Thread(
+                target=self._write_sync_state, args=(data,), name="sync-state-writer"
+            )
+            self._state_writer.start()
+        else:
+            self._write_sync_state(data)
+    
+    def _write_sync_state(self, data: bytes) -> None:
+        """Atomically replace the state file with serialized state"""
+        try:
+            _atomic_write(self.state_file, data)
             logger.debug("Saved sync state")
         except Exception as e:
             logger.error(f"Failed to save sync state: {e}")
     
+    def _wait_for_state_writer(self) -> None:
+        """Block until a background state write (if any) has finished"""
+        if self._state_writer is not None:
+            self._state_writer.join()
+            self._state_writer = None
+    
+    def _append_sync_history(self, stats: Dict[str, Any]) -> None:
+        """Append one run's stats to the history log"""
+        self._status_cache = None
+        try:
+            with open(self.history_file, 'ab') as f:
+                f.write(_dumps(stats) + b"\n")
+        except Exception as e:
+            logger.error(f"Failed to append sync history: {e}")
+    
+    def _scan_sync_history(self) -> Tuple[List[bytes], List[float]]:
+        """
+        Read the history log column-wise: raw entry lines plus a parallel
+        column of start epochs, without keeping a dict per entry
+        
+        Returns:
+            (lines, started_at_epochs)
+        """
+        lines: List[bytes] = []
+        epochs: List[float] = []
+        if not self.history_file.exists():
+            return lines, epochs
+        
+        with open(self.history_file, 'rb') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                entry = _loads(line)
+                if 'started_at_epoch' not in entry:
+                    # Older entry: backfill the epoch so the rewrite persists it
+                    self._history_timestamp(entry)
+                    line = _dumps(entry)
+                lines.append(line)
+                epochs.append(entry['started_at_epoch'])
+        return lines, epochs
+    
+    def _read_last_sync_history(self) -> Optional[Dict[str, Any]]:
+        """Read only the most recent history entry by seeking from the end"""
+        if not self.history_file.exists():
+            return None
+        
+        with open(self.history_file, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            end = f.tell()
+            block = b""
+            pos = end
+            # Grow the tail window until it holds a complete last line
+            while pos > 0:
+                step = min(4096, pos)
+                pos -= step
+                f.seek(pos)
+                block = f.read(step) + block
+                lines = block.rstrip(b"\n").split(b"\n")
+                if len(lines) > 1 or pos == 0:
+                    last = lines[-1].strip()
+                    return _loads(last) if last else None
+        return None
+    
+    def _count_sync_history(self) -> int:
+        """Number of retained runs (one per line)"""
+        if not self.history_file.exists():
+            return 0
+        with open(self.history_file, 'rb') as f:
+            return sum(1 for line in f if line.strip())
+    
+    def _prune_sync_history(self) -> None:
+        """
+        Drop runs older than the retention window
+        Only rewrites the log when its oldest entry has actually expired
+        """
+        if not self.history_file.exists():
+            return
+        
+        try:
+            cutoff = time.time() - HISTORY_RETENTION_DAYS * 86400
+            
+            with open(self.history_file, 'rb') as f:
+                first = f.readline().strip()
+            if not first or self._history_timestamp(_loads(first)) > cutoff:
+                return
+            
+            # Filter on the epoch column and write kept lines back verbatim
+            lines, epochs = self._scan_sync_history()
+            kept = [line for line, epoch in zip(lines, epochs) if epoch > cutoff]
+            _atomic_write(self.history_file, b"".join(line + b"\n" for line in kept))
+        except Exception as e:
+            logger.error(f"Failed to prune sync history: {e}")
+    
+    @staticmethod
+    def _history_timestamp(entry: Dict[str, Any]) -> float:
+        """
+        Epoch start time of a history entry
+        Entries from older versions are parsed once and backfilled, so the
+        value is persisted the next time the entry is written
+        """
+        epoch = entry.get('started_at_epoch')
+        if epoch is None:
+            epoch = datetime.fromisoformat(entry['started_at']).replace(tzinfo=timezone.utc).timestamp()
+            entry['started_at_epoch'] = epoch
+        return epoch
+    
+    @_logs_in_background
     def perform_initial_sync(self) -> Dict[str, Any]:
         """
         Perform initial full sync of all files
@@ -76,8 +606,10 @@ class IncrementalSync:
             Sync statistics
         """
         logger.info("Starting initial full sync...")
+        t0 = time.monotonic()
         stats = {
             'started_at': datetime.utcnow().isoformat(),
+            'started_at_epoch': time.time(),
             'files_processed': 0,
             'files_indexed': 0,
             'files_failed': 0,
@@ -85,46 +617,59 @@ class IncrementalSync:
         }
         
         try:
-            # List all files recursively
-            for file_metadata in self.dropbox.list_folder(self.root_path, recursive=True):
-                if file_metadata['type'] == 'folder':
-                    stats['folders_found'] += 1
-                    continue
-                
-                if file_metadata['type'] != 'file':
-                    continue
-                
-                # Check if it's a supported file type
-                file_path = file_metadata['path_display']
-                if not self._should_index_file(file_path):
-                    logger.debug(f"Skipping unsupported file: {file_path}")
-                    continue
-                
-                stats['files_processed'] += 1
-                
-                # Download and process file
-                success = self._process_and_index_file(file_metadata)
+            # List supported files recursively (folders and other types are
+            # filtered inside the client), in batches so downloads overlap
+            skipped = {}
+            files = _prefetch(
+                self.dropbox.list_folder_files(self.root_path, SUPPORTED_SUFFIXES, skipped=skipped),
+                LISTING_PREFETCH_SIZE
+            )
+            processed = 0
+            next_log_at = INITIAL_PROGRESS_EVERY
+            
+            def record(file_metadata, success):
+                nonlocal processed, next_log_at
+                processed += 1
                 if success:
                     stats['files_indexed'] += 1
+                    self._remember_indexed_id(file_metadata['id'])
+                    self._record_revision(file_metadata)
                 else:
                     stats['files_failed'] += 1
                 
-                # Log progress every 10 files
-                if stats['files_processed'] % 10 == 0:
-                    logger.info(f"Progress: {stats['files_processed']} files processed, "
+                # Log progress every INITIAL_PROGRESS_EVERY files
+                if processed >= next_log_at:
+                    next_log_at += INITIAL_PROGRESS_EVERY
+                    logger.info(f"Progress: {processed} files processed, "
                               f"{stats['files_indexed']} indexed")
             
+            for pending in iter(lambda: list(islice(files, SYNC_BATCH_SIZE)), []):
+                # Download, process and index the batch concurrently
+                batch = self._process_files_concurrently(pending)
+                try:
+                    for file_metadata, success in batch:
+                        record(file_metadata, success)
+                finally:
+                    # Closing runs the final flush now; documents already queued
+                    # when processing failed still get indexed and counted
+                    batch.close()
+                    for file_metadata, success in self._take_unreported_results():
+                        record(file_metadata, success)
+            
+            stats['files_processed'] = processed
+            stats['folders_found'] = skipped.get('folders', 0)
+            logger.debug(f"Skipped {skipped.get('unsupported', 0)} unsupported entries")
+            
             # Update sync state
             stats['completed_at'] = datetime.utcnow().isoformat()
-            stats['duration_seconds'] = (
-                datetime.fromisoformat(stats['completed_at']) - 
-                datetime.fromisoformat(stats['started_at'])
-            ).total_seconds()
+            stats['duration_seconds'] = time.monotonic() - t0
             
             self.sync_state['last_sync'] = stats['completed_at']
+            self.sync_state['last_cursor'] = self.dropbox.get_cursor(self.root_path)
             self.sync_state['total_indexed'] = stats['files_indexed']
-            self.sync_state['sync_history'].append(stats)
-            self._save_sync_state()
+            self._save_sync_state(background=True)
+            self._append_sync_history(stats)
+            self._save_known_ids()
             
             logger.info(f"Initial sync completed: {stats['files_indexed']} files indexed")
             return stats
@@ -132,8 +677,12 @@ class IncrementalSync:
         except Exception as e:
             logger.error(f"Initial sync failed: {e}")
             stats['error'] = str(e)
+            stats['files_processed'] = stats['files_indexed'] + stats['files_failed']
             return stats
+        finally:
+            self._shutdown_process_pool()
     
+    @_logs_in_background
     def perform_incremental_sync(self) -> Dict[str, Any]:
         """
         Perform incremental sync using cursors
@@ -143,149 +692,463 @@ class IncrementalSync:
             Sync statistics
         """
         logger.info("Starting incremental sync...")
-        stats = {
-            'started_at': datetime.utcnow().isoformat(),
-            'changes_processed': 0,
-            'files_added': 0,
-            'files_modified': 0,
-            'files_deleted': 0,
-            'files_failed': 0
-        }
+        t0 = time.monotonic()
+        stats = self._new_incremental_stats()
         
         try:
             # Get changes since last sync
             changes_found = False
-            for change in self.dropbox.list_folder_changes(self.root_path):
+            pending = []
+            pending_ids = set()
+            pending_deletes = []
+            next_log_at = INCREMENTAL_PROGRESS_EVERY
+            
+            def flush_pending():
+                # Index queued adds/modifications concurrently
+                batch = self._process_files_concurrently(pending)
+                try:
+                    for change, success in batch:
+                        self._record_indexed_change(stats, change, success)
+                finally:
+                    # Closing runs the final flush now; documents already queued
+                    # when processing failed still get indexed and counted
+                    batch.close()
+                    pending.clear()
+                    pending_ids.clear()
+                    for change, success in self._take_unreported_results():
+                        self._record_indexed_change(stats, change, success)
+            
+            def flush_deletes():
+                # Remove queued deletions with one batch request
+                if pending_deletes:
+                    self._record_deletions(stats, pending_deletes, self._remove_many_from_index(pending_deletes))
+                    pending_deletes.clear()
+            
+            # Resume from the cursor stored with our own state so only the delta is
+            # listed; pages are fetched ahead while earlier changes are processed
+            changes = self.dropbox.list_folder_changes(self.root_path, self.sync_state.get('last_cursor'))
+            for change in _prefetch(changes, LISTING_PREFETCH_SIZE):
                 changes_found = True
                 change_type = change.get('change_type', 'unknown')
                 
                 if change_type == 'deleted':
-                    # Remove from index
-                    self._remove_from_index(change)
-                    stats['files_deleted'] += 1
+                    # Finish a queued modify of the same file first so it stays ordered
+                    if change.get('id') in pending_ids:
+                        flush_pending()
+                    
+                    # Remove from index (queued for a batch delete)
+                    if change.get('id'):
+                        pending_deletes.append(change['id'])
+                        if len(pending_deletes) >= DELETE_BATCH_SIZE:
+                            flush_deletes()
                     
                 elif change_type == 'added_or_modified':
                     # Check if it's a supported file
                     if not self._should_index_file(change['path_display']):
                         continue
                     
-                    # Process and index
-                    success = self._process_and_index_file(change)
-                    if success:
-                        # Determine if add or modify based on existing index
-                        if self._file_exists_in_index(change['id']):
-                            stats['files_modified'] += 1
-                        else:
-                            stats['files_added'] += 1
-                    else:
-                        stats['files_failed'] += 1
+                    # Same revision already indexed: skip download, parse and embed
+                    if self._is_unchanged(change):
+                        stats['files_unchanged'] += 1
+                        continue
+                    
+                    # A queued delete of the same file must land before it is re-added
+                    if change['id'] in pending_deletes:
+                        flush_deletes()
+                    
+                    # Process and index (queued for the worker pool)
+                    pending.append(change)
+                    pending_ids.add(change['id'])
+                    if len(pending) >= SYNC_BATCH_SIZE:
+                        flush_pending()
                 
                 stats['changes_processed'] += 1
                 
                 # Log progress
-                if stats['changes_processed'] % 5 == 0:
+                if stats['changes_processed'] >= next_log_at:
+                    next_log_at += INCREMENTAL_PROGRESS_EVERY
                     logger.info(f"Processed {stats['changes_processed']} changes")
             
+            flush_pending()
+            flush_deletes()
+            
             if not changes_found:
                 logger.info("No changes detected since last sync")
             
-            # Update sync state
-            stats['completed_at'] = datetime.utcnow().isoformat()
-            stats['duration_seconds'] = (
-                datetime.fromisoformat(stats['completed_at']) - 
-                datetime.fromisoformat(stats['started_at'])
-            ).total_seconds()
+            return self._complete_incremental_sync(stats, t0)
             
-            self.sync_state['last_sync'] = stats['completed_at']
-            self.sync_state['sync_history'].append(stats)
+        except Exception as e:
+            logger.error(f"Incremental sync failed: {e}")
+            stats['error'] = str(e)
+            return stats
+        finally:
+            self._shutdown_process_pool()
+    
+    @_logs_in_background
+    async def aperform_incremental_sync(self, max_in_flight: int = ASYNC_MAX_IN_FLIGHT) -> Dict[str, Any]:
+        """
+        Async variant of perform_incremental_sync
+        File downloads/indexing run as concurrent tasks capped by a semaphore
+        
+        Args:
+            max_in_flight: Maximum files being processed at once
             
-            # Keep only last 30 days of history
-            cutoff = datetime.utcnow() - timedelta(days=30)
-            self.sync_state['sync_history'] = [
-                h for h in self.sync_state['sync_history']
-                if datetime.fromisoformat(h['started_at']) > cutoff
-            ]
+        Returns:
+            Sync statistics
+        """
+        logger.info("Starting incremental sync (async)...")
+        t0 = time.monotonic()
+        stats = self._new_incremental_stats()
+        semaphore = asyncio.Semaphore(max_in_flight)
+        
+        loop = asyncio.get_running_loop()
+        
+        async def process(change):
+            async with semaphore:
+                # Dropbox SDK is blocking; its pooled session is shared
+                # across the worker threads
+                content = await asyncio.to_thread(self._download_file, change)
+                if content is None:
+                    return change, None
+                return change, await self._parse_async(loop, content, change)
+        
+        try:
+            # Get changes since last sync
+            changes = await asyncio.to_thread(
+                lambda: list(self.dropbox.list_folder_changes(self.root_path, self.sync_state.get('last_cursor')))
+            )
+            pending = []
+            pending_deletes = []
             
-            self._save_sync_state()
+            async def flush_deletes():
+                if pending_deletes:
+                    deleted = await asyncio.to_thread(self._remove_many_from_index, list(pending_deletes))
+                    self._record_deletions(stats, pending_deletes, deleted)
+                    pending_deletes.clear()
             
-            logger.info(f"Incremental sync completed: {stats['changes_processed']} changes, "
-                       f"{stats['files_added']} added, {stats['files_modified']} modified, "
-                       f"{stats['files_deleted']} deleted")
-            return stats
+            async def flush_pending():
+                try:
+                    for task in asyncio.as_completed([process(change) for change in pending]):
+                        change, document = await task
+                        if document is None:
+                            self._record_indexed_change(stats, change, False)
+                        elif self._queue_document(change, document):
+                            for indexed, success in await asyncio.to_thread(self._flush_batch):
+                                self._record_indexed_change(stats, indexed, success)
+                    for indexed, success in await asyncio.to_thread(self._flush_batch):
+                        self._record_indexed_change(stats, indexed, success)
+                finally:
+                    pending.clear()
+                    # Documents already queued when processing failed still get indexed and counted
+                    for indexed, success in await asyncio.to_thread(self._flush_batch):
+                        self._record_indexed_change(stats, indexed, success)
+            
+            for change in changes:
+                change_type = change.get('change_type', 'unknown')
+                
+                if change_type == 'deleted':
+                    # Finish a queued modify of the same file first so it stays ordered
+                    if any(queued['id'] == change.get('id') for queued in pending):
+                        await flush_pending()
+                    if change.get('id'):
+                        pending_deletes.append(change['id'])
+                        if len(pending_deletes) >= DELETE_BATCH_SIZE:
+                            await flush_deletes()
+                    
+                elif change_type == 'added_or_modified':
+                    if not self._should_index_file(change['path_display']):
+                        continue
+                    if self._is_unchanged(change):
+                        stats['files_unchanged'] += 1
+                        continue
+                    if change['id'] in pending_deletes:
+                        await flush_deletes()
+                    pending.append(change)
+                
+                stats['changes_processed'] += 1
+            
+            await flush_pending()
+            await flush_deletes()
+            
+            if not changes:
+                logger.info("No changes detected since last sync")
+            
+            return await asyncio.to_thread(self._complete_incremental_sync, stats, t0)
             
         except Exception as e:
             logger.error(f"Incremental sync failed: {e}")
             stats['error'] = str(e)
             return stats
+        finally:
+            self._shutdown_process_pool()
     
-    def _should_index_file(self, file_path: str) -> bool:
+    @staticmethod
+    def _new_incremental_stats() -> Dict[str, Any]:
+        """Fresh statistics record for an incremental sync run"""
+        return {
+            'started_at': datetime.utcnow().isoformat(),
+            'started_at_epoch': time.time(),
+            'changes_processed': 0,
+            'files_added': 0,
+            'files_modified': 0,
+            'files_deleted': 0,
+            'files_unchanged': 0,
+            'files_failed': 0
+        }
+    
+    def _record_indexed_change(self, stats: Dict[str, Any], change: Dict[str, Any], success: bool) -> None:
+        """Count an added_or_modified change once its indexing finished"""
+        if success:
+            self._record_revision(change)
+            # Determine if add or modify based on what was indexed before this run
+            if self._file_exists_in_index(change['id']):
+                stats['files_modified'] += 1
+            else:
+                stats['files_added'] += 1
+                self._remember_indexed_id(change['id'])
+        else:
+            stats['files_failed'] += 1
+    
+    def _complete_incremental_sync(self, stats: Dict[str, Any], t0: float) -> Dict[str, Any]:
+        """
+        Finalize stats, prune history, and persist sync state
+        
+        Args:
+            stats: Statistics for the run
+            t0: time.monotonic() at the start of the run
+        """
+        # Update sync state
+        stats['completed_at'] = datetime.utcnow().isoformat()
+        stats['duration_seconds'] = time.monotonic() - t0
+        
+        self.sync_state['last_sync'] = stats['completed_at']
+        self.sync_state['last_cursor'] = self.dropbox.get_cursor(self.root_path)
+        self._save_sync_state(background=True)
+        self._append_sync_history(stats)
+        self._save_known_ids()
+        
+        # Keep only last 30 days of history
+        self._prune_sync_history()
+        
+        logger.info(f"Incremental sync completed: {stats['changes_processed']} changes, "
+                   f"{stats['files_added']} added, {stats['files_modified']} modified, "
+                   f"{stats['files_deleted']} deleted")
+        return stats
+    
+    @staticmethod
+    def _should_index_file(file_path: str) -> bool:
         """Check if file should be indexed based on type"""
-        supported_extensions = {'.pdf', '.txt', '.md', '.csv', '.doc', '.docx'}
-        ext = Path(file_path).suffix.lower()
-        return ext in supported_extensions
+        # No '.' in the name leaves a value that can't match any extension
+        ext = file_path.rpartition('.')[2].lower()
+        return ext in SUPPORTED_EXTENSIONS
     
-    def _process_and_index_file(self, file_metadata: Dict[str, Any]) -> bool:
+    def _process_files_concurrently(self, files: List[Dict[str, Any]]) -> Iterator[Tuple[Dict[str, Any], bool]]:
         """
-        Download, process, and index a single file
+        Download files on a thread pool, parse them on a process pool,
+        then index them in batches on the calling thread
+        
+        Args:
+            files: File metadata entries to download, process, and index
+            
+        Yields:
+            (file_metadata, success) as files fail or batches are indexed.
+            If processing raises or the caller stops early, the remaining queued
+            documents are still indexed and their results are left for
+            _take_unreported_results
+        """
+        if not files:
+            return
+        
+        # Bounded hand-off so downloads can't run far ahead of parsing
+        downloads: queue.Queue = queue.Queue(maxsize=PREFETCH_QUEUE_SIZE)
+        stop = threading.Event()
+        
+        def prefetch(file_metadata):
+            # Skip downloads still queued once processing has stopped
+            if stop.is_set():
+                return
+            item = (file_metadata, self._download_file(file_metadata))
+            while not stop.is_set():
+                try:
+                    downloads.put(item, timeout=0.5)
+                    return
+                except queue.Full:
+                    continue
+        
+        process_pool = self._get_process_pool()
+        parsing: Dict[Any, Dict[str, Any]] = {}
+        
+        def collect(done):
+            for future in done:
+                file_metadata = parsing.pop(future)
+                document = self._parse_result(future, file_metadata)
+                if document is None:
+                    yield file_metadata, False
+                elif self._queue_document(file_metadata, document):
+                    yield from self._flush_batch()
+        
+        try:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(files))) as io_pool:
+                try:
+                    for file_metadata in files:
+                        io_pool.submit(prefetch, file_metadata)
+                    
+                    for _ in range(len(files)):
+                        file_metadata, content = downloads.get()
+                        if content is None:
+                            yield file_metadata, False
+                            continue
+                        
+                        parsing[process_pool.submit(_process_document_in_worker, content, file_metadata)] = file_metadata
+                        # Keep at most one queue's worth of files waiting on parsers
+                        if len(parsing) >= PREFETCH_QUEUE_SIZE:
+                            done, _ = wait(parsing, return_when=FIRST_COMPLETED)
+                            yield from collect(done)
+                    
+                    yield from collect(as_completed(list(parsing)))
+                finally:
+                    # Unblock any downloader still waiting on a full queue
+                    stop.set()
+            
+            yield from self._flush_batch()
+        finally:
+            # Don't drop processed documents if processing fails or the caller stops early
+            self._unreported_results.extend(self._flush_batch())
+    
+    def _take_unreported_results(self) -> List[Tuple[Dict[str, Any], bool]]:
+        """Hand over (file_metadata, success) pairs from a flush the caller never saw"""
+        results, self._unreported_results = self._unreported_results, []
+        return results
+    
+    def _download_file(self, file_metadata: Dict[str, Any]) -> Optional[bytes]:
+        """
+        Download a single file's content
         
         Args:
             file_metadata: File metadata from Dropbox
             
         Returns:
-            True if successful
+            Raw file content, or None on failure
         """
+        file_path = file_metadata.get('path_display')
         try:
-            file_path = file_metadata['path_display']
-            logger.debug(f"Processing {file_path}")
-            
-            # Download file content
+            logger.debug(f"Downloading {file_path}")
             content = self.dropbox.download_file(file_path)
             if not content:
                 logger.error(f"Failed to download {file_path}")
-                return False
-            
-            # Process document
-            document = self.processor.process_document(content, file_metadata)
-            if not document:
-                logger.warning(f"Failed to process {file_path}")
-                return False
-            
-            # Index in Weaviate
-            success = self.indexer.index_document(document)
+                return None
+            return content
+        except Exception as e:
+            logger.error(f"Error downloading file {file_path}: {e}")
+            return None
+    
+    async def _parse_async(self, loop: asyncio.AbstractEventLoop, content: bytes,
+                           file_metadata: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Parse downloaded content on the process pool from the async path"""
+        future = loop.run_in_executor(self._get_process_pool(), _process_document_in_worker, content, file_metadata)
+        await asyncio.wait([future])
+        return self._parse_result(future, file_metadata)
+    
+    @staticmethod
+    def _parse_result(future, file_metadata: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Unwrap a finished parse future, logging failures"""
+        file_path = file_metadata.get('path_display')
+        try:
+            document = future.result()
+        except Exception as e:
+            logger.error(f"Error processing file {file_path}: {e}")
+            return None
+        if not document:
+            logger.warning(f"Failed to process {file_path}")
+            return None
+        return document
+    
+    def _get_process_pool(self) -> ProcessPoolExecutor:
+        """Create the parser process pool on first use"""
+        if self._process_pool is None:
+            # spawn: a forked child would inherit the background log queue (never
+            # drained in the child) and the state of the running sync threads
+            self._process_pool = ProcessPoolExecutor(max_workers=self.process_workers,
+                                                     mp_context=multiprocessing.get_context("spawn"))
+        return self._process_pool
+    
+    def _shutdown_process_pool(self) -> None:
+        """Release parser worker processes at the end of a sync run"""
+        if self._process_pool is not None:
+            self._process_pool.shutdown(cancel_futures=True)
+            self._process_pool = None
+    
+    def _queue_document(self, file_metadata: Dict[str, Any], document: Dict[str, Any]) -> bool:
+        """
+        Queue a processed document for the next batch index request
+        
+        Returns:
+            True once the batch is full and should be flushed
+        """
+        self._pending_docs.append((file_metadata, document))
+        self._pending_bytes += len(document.get('content') or '') + len(document.get('full_text') or '')
+        return len(self._pending_docs) >= INDEX_BATCH_SIZE or self._pending_bytes >= INDEX_BATCH_MAX_BYTES
+    
+    def _flush_batch(self) -> List[Tuple[Dict[str, Any], bool]]:
+        """
+        Index all queued documents with a single batch request
+        
+        Returns:
+            (file_metadata, success) for every flushed document
+        """
+        if not self._pending_docs:
+            return []
+        
+        pending, self._pending_docs, self._pending_bytes = self._pending_docs, [], 0
+        results = self.indexer.batch_index([document for _, document in pending])
+        
+        flushed = []
+        for file_metadata, document in pending:
+            success = results.get(document.get('id'), False)
             if success:
-                logger.debug(f"Successfully indexed {file_path}")
-                return True
+                logger.debug(f"Successfully indexed {file_metadata['path_display']}")
             else:
-                logger.error(f"Failed to index {file_path}")
-                return False
-                
-        except Exception as e:
-            logger.error(f"Error processing file {file_metadata.get('path_display')}: {e}")
-            return False
+                logger.error(f"Failed to index {file_metadata['path_display']}")
+            flushed.append((file_metadata, success))
+        return flushed
     
-    def _remove_from_index(self, file_metadata: Dict[str, Any]) -> bool:
-        """Remove deleted file from index"""
+    def _remove_many_from_index(self, file_ids: List[str]) -> bool:
+        """Remove deleted files from index with one batch request"""
         try:
-            file_id = file_metadata.get('id')
-            if file_id:
-                return self.indexer.delete_document(file_id)
-            return False
+            deleted = self.indexer.delete_documents(file_ids)
+            if deleted:
+                known_ids = self._load_known_ids()
+                rev_index = self._get_rev_index()
+                for file_id in file_ids:
+                    known_ids.discard(file_id)
+                    if rev_index is not None:
+                        rev_index.forget(file_id)
+            return deleted
         except Exception as e:
-            logger.error(f"Failed to remove file from index: {e}")
+            logger.error(f"Failed to remove {len(file_ids)} files from index: {e}")
             return False
     
+    @staticmethod
+    def _record_deletions(stats: Dict[str, Any], file_ids: List[str], deleted: bool) -> None:
+        """Count a flushed delete batch"""
+        stats['files_deleted' if deleted else 'files_failed'] += len(file_ids)
+    
     def _file_exists_in_index(self, file_id: str) -> bool:
         """Check if file already exists in index"""
-        try:
-            return self.indexer.document_exists(file_id)
-        except Exception:
+        # A Bloom miss is definitive; a hit may be a false positive
+        if self._known_ids_bloom is not None and file_id not in self._known_ids_bloom:
             return False
+        return file_id in self._load_known_ids()
     
-    def run_daily_sync(self) -> Dict[str, Any]:
+    @_logs_in_background
+    def run_daily_sync(self, use_async: bool = False) -> Dict[str, Any]:
         """
         Main entry point for daily scheduled sync
         Determines whether to run initial or incremental sync
         
+        Args:
+            use_async: Run the incremental pass on the asyncio pipeline
+        
         Returns:
             Sync statistics
         """
@@ -306,19 +1169,28 @@ class IncrementalSync:
             return self.perform_initial_sync()
         
         # Run incremental sync
+        if use_async:
+            return asyncio.run(self.aperform_incremental_sync())
         return self.perform_incremental_sync()
     
     def get_sync_status(self) -> Dict[str, Any]:
-        """Get current sync status and statistics"""
+        """
+        Get current sync status and statistics
+        Cached for SYNC_STATUS_TTL_SECONDS; state and history writes invalidate it
+        """
+        cached = self._status_cache
+        if cached is not None and time.monotonic() - cached[0] < SYNC_STATUS_TTL_SECONDS:
+            return copy.deepcopy(cached[1])
+        
         status = {
             'last_sync': self.sync_state.get('last_sync'),
             'total_indexed': self.sync_state.get('total_indexed', 0),
-            'sync_count': len(self.sync_state.get('sync_history', [])),
+            'sync_count': self._count_sync_history(),
         }
         
         # Add recent sync stats
-        if self.sync_state.get('sync_history'):
-            recent = self.sync_state['sync_history'][-1]
+        recent = self._read_last_sync_history()
+        if recent:
             status['last_sync_stats'] = {
                 'duration_seconds': recent.get('duration_seconds'),
                 'changes_processed': recent.get('changes_processed', 0),
@@ -334,7 +1206,8 @@ class IncrementalSync:
             status['next_sync'] = next_sync.isoformat()
             status['next_sync_in_hours'] = max(0, (next_sync - datetime.utcnow()).total_seconds() / 3600)
         
-        return status
+        self._status_cache = (time.monotonic(), status)
+        return copy.deepcopy(status)
 
 
 # Command-line interface for manual sync
@@ -4,18 +4,63 @@ Implements dynamic search strategies without hardcoding
 Uses Weaviate hybrid search with intelligent query generation
 """
 
+import copy
+import functools
 import logging
-from typing import Dict, List, Optional, Any
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Any, Tuple
 import weaviate
 from weaviate.classes.query import Filter, MetadataQuery, HybridFusion
 from datetime import datetime
 import os
+import voyageai
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
 
 from .entity_extractor import DropboxEntityExtractor, SearchEntities
 from .entity_discovery import EntityDiscovery
+from src.utils.semantic_cache import SemanticCache
 
 logger = logging.getLogger(__name__)
 
+# Shared pool for Weaviate read queries (IO-bound; the v4 client is thread-safe for reads).
+# Tasks submitted here never submit further work, so concurrent searches can't deadlock it.
+_SEARCH_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="dropbox-search")
+
+# Speculative LLM refinements run separately: a cancelled future doesn't stop a call
+# already in flight, and 1-2s LLM calls must not hold slots that Weaviate reads wait on
+_REFINEMENT_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="dropbox-refine")
+
+# Discovered entities are re-queried from Weaviate at most this often
+DISCOVERY_TTL_SECONDS = 300
+
+# In-process memo of entity extractions per (query, discovery version)
+EXTRACTION_MEMO_SIZE = 1024
+
+# How long the DocumentChunk existence check is trusted before re-checking
+CHUNK_COLLECTION_CHECK_SECONDS = 300
+
+# Properties returned by search queries (content is fetched separately for final results)
+_DOC_PROPS = ("dropbox_id", "name", "file_path", "project_name", "contractor", "vendor_name",
+              "document_type", "file_size", "modified_date")
+_CHUNK_PROPS = ("parent_dropbox_id", "parent_name", "file_path", "chunk_index", "total_chunks",
+                "project_name", "contractor", "vendor_name", "document_type")
+
+# Chunks requested per chunk query (search() asks for max_results * 3)
+CHUNK_LIMIT_DEFAULT = 30
+
+# Ranking scans all entity terms in one Aho-Corasick pass from this many terms up
+AHO_CORASICK_MIN_TERMS = 4
+
+# Query embeddings for the semantic cache and strategy queries (same model the collections use)
+QUERY_EMBEDDING_MODEL = "voyage-3-large"
+
 
 class DropboxSearchOrchestrator:
     """
@@ -31,12 +76,48 @@ class DropboxSearchOrchestrator:
         # Connect to Weaviate
         self.weaviate_client = self._connect_weaviate()
         
+        # Collection handles are reused for every query
+        # (DocumentChunk existence is checked separately before it is queried)
+        self._collections = {
+            name: self.weaviate_client.collections.get(name) for name in ("Document", "DocumentChunk")
+        } if self.weaviate_client else {}
+        
         # Entity discovery from actual data
         self.discovery = EntityDiscovery(self.weaviate_client)
         
+        # Discovery results (refreshed after DISCOVERY_TTL_SECONDS) and extraction
+        # memo; the version changes whenever the discovered entities do
+        self._memo_lock = threading.Lock()
+        self._discovered: Optional[Dict[str, List[str]]] = None
+        self._discovered_at = 0.0
+        self._discovered_version = 0
+        self._extraction_memo: "OrderedDict[Tuple[str, int], SearchEntities]" = OrderedDict()
+        
+        # Whether DocumentChunk exists (re-checked after CHUNK_COLLECTION_CHECK_SECONDS)
+        self._chunk_collection_exists = False
+        self._chunk_collection_checked_at: Optional[float] = None
+        
+        # Vector strategies skip DocumentChunk unless enabled (Document embeddings
+        # usually cover the same passages, so the chunk query duplicates work)
+        self.search_chunks_on_vector = os.getenv("SEARCH_CHUNKS_ON_VECTOR", "false").lower() == "true"
+        
         # Track search context for follow-ups
         self.search_context = {}
         
+        # Semantic cache: near-identical queries reuse earlier results
+        # (persisted to SQLite so restarts and other workers share hits)
+        self.voyage_client = None
+        self.semantic_cache = None
+        voyage_key = os.getenv("VOYAGE_API_KEY")
+        if voyage_key:
+            try:
+                self.voyage_client = voyageai.Client(api_key=voyage_key)
+                self.semantic_cache = SemanticCache(
+                    path=os.getenv("SEARCH_CACHE_PATH", ".cache/search_semantic_cache.sqlite3")
+                )
+            except Exception as e:
+                logger.warning(f"Semantic search cache disabled: {e}")
+        
         logger.info("DropboxSearchOrchestrator initialized")
     
     def _connect_weaviate(self) -> Optional[weaviate.Client]:
@@ -66,63 +147,113 @@ class DropboxSearchOrchestrator:
             logger.error(f"Failed to connect to Weaviate: {e}")
             return None
     
-    def search(self, query: str, max_results: int = 10) -> Dict[str, Any]:
+    def _embed_query(self, query: str) -> Optional[List[float]]:
+        """Embed a query for the semantic cache (None if unavailable)"""
+        if not self.voyage_client:
+            return None
+        try:
+            response = self.voyage_client.embed([query], model=QUERY_EMBEDDING_MODEL, input_type="query")
+            return response.embeddings[0]
+        except Exception as e:
+            logger.warning(f"Failed to embed query for cache: {e}")
+            return None
+    
+    def search(self, query: str, max_results: int = 10, namespace: str = "") -> Dict[str, Any]:
         """
         Main search method - orchestrates the entire search process
         
         Args:
             query: Natural language query from user
             max_results: Maximum number of results to return
+            namespace: Semantic cache partition (e.g. user or workspace ID)
             
         Returns:
             Search results with metadata
         """
+        # A semantically equivalent query answered recently skips the whole pipeline
+        cache_namespace = f"{namespace}:{max_results}"
+        query_vector = self._embed_query(query) if self.semantic_cache else None
+        if query_vector is not None:
+            cached = self.semantic_cache.lookup(query_vector, cache_namespace)
+            if cached is not None:
+                logger.info("Semantic cache hit")
+                # Copy: callers may annotate results, which must not reach the cache entry
+                cached = copy.deepcopy(cached)
+                self.search_context['last_search'] = query
+                self.search_context['last_document'] = cached['results'][0].get('name')
+                self.search_context['last_entities'] = cached['entities_extracted']
+                return {**cached, 'cached': True}
+        
         try:
-            # Step 1: Discover entities from the system (if first run)
-            discovered = self.discovery.discover_from_weaviate()
+            # Step 1: Discover entities from the system (cached for a few minutes)
+            discovered, discovered_version = self._get_discovered()
             
             # Step 2: Extract entities from the query
-            entities = self.extractor.extract_with_examples(query, discovered)
+            entities = self._extract_cached(query, discovered, discovered_version)
+            entities_dict = entities.model_dump()
+            
+            # Weak extractions often find nothing; refine speculatively alongside the search
+            # (the refined entities are discarded if the first pass finds results)
+            refinement = None
+            if not entities.project and not entities.contractor and len(entities.keywords) < 2:
+                refinement = _REFINEMENT_EXECUTOR.submit(
+                    self.extractor.refine_with_feedback, query, entities, no_results=True
+                )
             
             # Step 3: Build search strategy based on extracted entities
             search_strategies = self._build_search_strategies(entities)
             
-            # Step 4: Execute searches with fallback logic
+            # Step 4: Execute the most precise strategy first; the others run concurrently
+            # only if it found fewer than max_results * 2 distinct files
+            # Identical requests within this search are only sent once
+            query_memo = {}
+            chunk_limit = max_results * 3
             results = []
-            for strategy in search_strategies:
-                strategy_results = self._execute_search(strategy)
-                if strategy_results:
+            for batch in (search_strategies[:1], search_strategies[1:]):
+                if not batch or len({r.get('file_path') for r in results}) >= max_results * 2:
+                    break
+                for strategy_results in self._execute_searches(batch, query_memo, chunk_limit):
                     results.extend(strategy_results)
             
             # Step 5: If no results, try refinement
             if not results and entities:
-                refined_entities = self.extractor.refine_with_feedback(
-                    query, entities, no_results=True
-                )
+                if refinement is not None:
+                    refined_entities = refinement.result()
+                else:
+                    refined_entities = self.extractor.refine_with_feedback(
+                        query, entities, no_results=True
+                    )
                 refined_strategies = self._build_search_strategies(refined_entities)
                 
-                for strategy in refined_strategies[:2]:  # Try top 2 refined strategies
-                    strategy_results = self._execute_search(strategy)
-                    if strategy_results:
-                        results.extend(strategy_results)
+                # Try top 2 refined strategies
+                for strategy_results in self._execute_searches(refined_strategies[:2], query_memo, chunk_limit):
+                    results.extend(strategy_results)
+            elif refinement is not None:
+                refinement.cancel()
             
-            # Step 6: Rank and format results
+            # Step 6: Rank and format results, then fetch content for the kept ones only
             ranked_results = self._rank_results(results, entities)
+            self._hydrate_content(ranked_results[:max_results])
             
             # Update context for follow-up queries
             if ranked_results:
                 self.search_context['last_search'] = query
                 self.search_context['last_document'] = ranked_results[0].get('name')
-                self.search_context['last_entities'] = entities.model_dump()
+                self.search_context['last_entities'] = entities_dict
             
-            return {
+            response = {
                 'success': bool(ranked_results),
                 'results': ranked_results[:max_results],
-                'entities_extracted': entities.model_dump(),
+                'entities_extracted': entities_dict,
                 'strategies_tried': len(search_strategies),
                 'total_found': len(results)
             }
             
+            if query_vector is not None and ranked_results:
+                self.semantic_cache.store(query_vector, copy.deepcopy(response), cache_namespace)
+            
+            return response
+            
         except Exception as e:
             logger.error(f"Search failed: {e}")
             return {
@@ -131,6 +262,51 @@ class DropboxSearchOrchestrator:
                 'results': []
             }
     
+    def _get_discovered(self) -> Tuple[Dict[str, List[str]], int]:
+        """
+        Discovered entities, re-queried at most every DISCOVERY_TTL_SECONDS
+        
+        Returns:
+            (discovered entities, version that changes whenever they do)
+        """
+        with self._memo_lock:
+            if self._discovered is not None and time.monotonic() - self._discovered_at < DISCOVERY_TTL_SECONDS:
+                return self._discovered, self._discovered_version
+        
+        discovered = self.discovery.discover_from_weaviate()
+        with self._memo_lock:
+            if discovered != self._discovered:
+                self._discovered_version += 1
+                self._extraction_memo.clear()
+            self._discovered = discovered
+            self._discovered_at = time.monotonic()
+            return self._discovered, self._discovered_version
+    
+    def _extract_cached(self, query: str, discovered: Dict[str, List[str]],
+                        discovered_version: int) -> SearchEntities:
+        """
+        extract_with_examples memoized per (query, discovery version)
+        Empty extractions (including failures) are not memoized
+        
+        Returns:
+            A private copy of the extracted entities (callers may mutate it)
+        """
+        key = (query, discovered_version)
+        with self._memo_lock:
+            entities = self._extraction_memo.get(key)
+            if entities is not None:
+                self._extraction_memo.move_to_end(key)
+        
+        if entities is None:
+            entities = self.extractor.extract_with_examples(query, discovered)
+            if entities != SearchEntities():
+                with self._memo_lock:
+                    self._extraction_memo[key] = entities
+                    if len(self._extraction_memo) > EXTRACTION_MEMO_SIZE:
+                        self._extraction_memo.popitem(last=False)
+        
+        return entities.model_copy(deep=True)
+    
     def _build_search_strategies(self, entities: SearchEntities) -> List[Dict]:
         """
         Build multiple search strategies from extracted entities
@@ -153,21 +329,30 @@ class DropboxSearchOrchestrator:
         if entities.document_type:
             terms.append(entities.document_type)
         terms.extend(entities.keywords)
+        query_str = ' '.join(terms)
+        
+        # Filters are identical for every filtered strategy; build them once
+        # A contractor is matched on `contractor` first and on `vendor_name` only
+        # for strategies that come back empty
+        shared_filters = self._build_filters(entities)
+        vendor_filters = self._build_filters(entities, contractor_field="vendor_name") if entities.contractor else None
         
         if terms:
             strategies.append({
                 'type': 'hybrid',
-                'query': ' '.join(terms),
+                'query': query_str,
                 'alpha': 0.5,  # Equal weight to semantic and keyword
-                'filters': self._build_filters(entities)
+                'filters': shared_filters,
+                'fallback_filters': vendor_filters
             })
         
         # Strategy 2: Pure semantic search if we have natural language
-        if len(' '.join(terms)) > 10:  # Substantial query
+        if len(query_str) > 10:  # Substantial query
             strategies.append({
                 'type': 'vector',
-                'query': ' '.join(terms),
-                'filters': self._build_filters(entities)
+                'query': query_str,
+                'filters': shared_filters,
+                'fallback_filters': vendor_filters
             })
         
         # Strategy 3: Keyword search for specific identifiers
@@ -176,49 +361,62 @@ class DropboxSearchOrchestrator:
             strategies.append({
                 'type': 'keyword',
                 'query': entities.specific_file or ' '.join(entities.keywords),
-                'filters': self._build_filters(entities)
+                'filters': shared_filters,
+                'fallback_filters': vendor_filters
             })
         
         # Strategy 4: Broader search without filters if needed
         if terms:
             strategies.append({
                 'type': 'hybrid',
-                'query': ' '.join(terms),
+                'query': query_str,
                 'alpha': 0.7,  # More semantic weight for broader matching
                 'filters': None  # No filters for broader search
             })
         
         return strategies
     
-    def _build_filters(self, entities: SearchEntities) -> Optional[Filter]:
+    def _build_filters(self, entities: SearchEntities, contractor_field: str = "contractor") -> Optional[Filter]:
         """
         Build Weaviate v4 Filter objects from entities
         Uses LIKE operator for flexible matching
         
         Args:
             entities: Extracted entities
+            contractor_field: Property the contractor is matched against
+                ("contractor", or "vendor_name" for the fallback filters)
             
         Returns:
             Weaviate v4 Filter object or None
         """
+        return self._filters_for(entities.project, entities.contractor, entities.document_type, contractor_field)
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def _filters_for(project: Optional[str], contractor: Optional[str], document_type: Optional[str],
+                     contractor_field: str) -> Optional[Filter]:
+        """
+        Filters for one combination of entity values, memoized across searches
+        The returned Filter is shared, so callers must not modify it
+        """
         conditions = []
         
-        if entities.project:
+        if project:
             # Use LIKE for partial matching (e.g., "123 Main" matches "123 Main Street")
             conditions.append(
-                Filter.by_property("project_name").like(f"*{entities.project}*")
+                Filter.by_property("project_name").like(f"*{project}*")
             )
         
-        if entities.contractor:
-            # Search in both contractor AND vendor_name fields (OR logic)
-            # This ensures we find documents where the company might be in either field
-            contractor_condition = Filter.by_property("contractor").like(f"*{entities.contractor}*") | \
-                                 Filter.by_property("vendor_name").like(f"*{entities.contractor}*")
-            conditions.append(contractor_condition)
+        if contractor:
+            # One field per filter: OR-ing contractor and vendor_name costs two
+            # inverted-index scans, so vendor_name is a separate fallback filter
+            conditions.append(
+                Filter.by_property(contractor_field).like(f"*{contractor}*")
+            )
         
-        if entities.document_type:
+        if document_type:
             conditions.append(
-                Filter.by_property("document_type").like(f"*{entities.document_type}*")
+                Filter.by_property("document_type").like(f"*{document_type}*")
             )
         
         if not conditions:
@@ -245,38 +443,120 @@ class DropboxSearchOrchestrator:
         Returns:
             List of search results
         """
-        if not self.weaviate_client:
-            return []
+        return self._execute_searches([strategy])[0]
+    
+    def _execute_searches(self, strategies: List[Dict],
+                          memo: Optional[Dict[tuple, List[Dict]]] = None,
+                          chunk_limit: int = CHUNK_LIMIT_DEFAULT) -> List[List[Dict]]:
+        """
+        Execute several search strategies concurrently
+        Every Document and DocumentChunk query is dispatched to the shared pool at once;
+        strategies that come back empty are retried with their 'fallback_filters'
         
-        try:
-            # Search both collections
-            documents = self._search_documents(strategy)
-            chunks = self._search_chunks(strategy)
-            
-            # Combine and deduplicate results
-            combined = self._combine_results(documents, chunks)
-            return combined
+        Args:
+            strategies: Search strategy configurations
+            memo: Results of requests already sent during this search, keyed by
+                _strategy_key; duplicates are answered from here instead of Weaviate
+            chunk_limit: Chunks to request from each chunk query
             
+        Returns:
+            Combined results for each strategy, in the same order
+        """
+        if not self.weaviate_client or not strategies:
+            return [[] for _ in strategies]
+        
+        memo = {} if memo is None else memo
+        keys = [self._strategy_key(strategy) for strategy in strategies]
+        self._attach_query_vectors([s for key, s in zip(keys, strategies) if key not in memo])
+        
+        futures = {}
+        for key, strategy in zip(keys, strategies):
+            if key not in memo and key not in futures:
+                search_chunks = strategy['type'] != 'vector' or self.search_chunks_on_vector
+                futures[key] = (_SEARCH_EXECUTOR.submit(self._search_documents, strategy),
+                                _SEARCH_EXECUTOR.submit(self._search_chunks, strategy, chunk_limit)
+                                if search_chunks else None)
+        
+        for key, (doc_future, chunk_future) in futures.items():
+            try:
+                # Combine and deduplicate results
+                chunks = chunk_future.result() if chunk_future else []
+                memo[key] = self._combine_results(doc_future.result(), chunks)
+            except Exception as e:
+                logger.error(f"Search execution failed: {e}")
+                memo[key] = []
+        
+        results = [memo[key] for key in keys]
+        
+        retry = [i for i, strategy in enumerate(strategies)
+                 if not results[i] and strategy.get('fallback_filters') is not None]
+        if retry:
+            fallbacks = [{**strategies[i], 'filters': strategies[i]['fallback_filters'], 'fallback_filters': None}
+                         for i in retry]
+            for i, fallback_results in zip(retry, self._execute_searches(fallbacks, memo, chunk_limit)):
+                results[i] = fallback_results
+        
+        return results
+    
+    def _attach_query_vectors(self, strategies: List[Dict]) -> None:
+        """
+        Embed the queries of hybrid and vector strategies in one Voyage call
+        Vectors are stored as strategy['_vec'] so Weaviate doesn't embed each query itself;
+        without a Voyage client (or on failure) strategies fall back to server-side embedding
+        
+        Args:
+            strategies: Strategies about to be sent (updated in place)
+        """
+        pending = [s for s in strategies if s['type'] in ('hybrid', 'vector') and '_vec' not in s]
+        if not self.voyage_client or not pending:
+            return
+        
+        texts = list(dict.fromkeys(s['query'] for s in pending))
+        try:
+            response = self.voyage_client.embed(texts, model=QUERY_EMBEDDING_MODEL, input_type="query")
         except Exception as e:
-            logger.error(f"Search execution failed: {e}")
-            return []
+            logger.warning(f"Failed to embed strategy queries: {e}")
+            return
+        
+        vectors = dict(zip(texts, response.embeddings))
+        for strategy in pending:
+            strategy['_vec'] = vectors.get(strategy['query'])
+    
+    @staticmethod
+    def _strategy_key(strategy: Dict) -> tuple:
+        """Identity of the request a strategy sends (filters compared by their repr)"""
+        filters = strategy.get('filters')
+        return (strategy['type'], strategy['query'], strategy.get('alpha'),
+                repr(filters) if filters is not None else None)
     
     def _search_documents(self, strategy: Dict) -> List[Dict]:
-        """Search the main Document collection"""
+        """
+        Search the main Document collection
+        Returns metadata and scores only; content is hydrated for the final results
+        """
         try:
-            collection = self.weaviate_client.collections.get("Document")
+            collection = self._collections["Document"]
             
             # Build and execute query based on strategy type
             if strategy['type'] == 'hybrid':
                 # Hybrid search combining vector and keyword
                 response = collection.query.hybrid(
                     query=strategy['query'],
+                    vector=strategy.get('_vec'),
                     alpha=strategy.get('alpha', 0.5),
                     fusion_type=HybridFusion.RELATIVE_SCORE,
                     limit=20,
                     filters=strategy.get('filters'),
-                    return_properties=["name", "file_path", "project_name", "contractor", "vendor_name",
-                                     "document_type", "content", "file_size", "modified_date"],
+                    return_properties=_DOC_PROPS,
+                    return_metadata=MetadataQuery(score=True)
+                )
+            elif strategy['type'] == 'vector' and strategy.get('_vec') is not None:
+                # Pure vector/semantic search with a client-side query embedding
+                response = collection.query.near_vector(
+                    near_vector=strategy['_vec'],
+                    limit=20,
+                    filters=strategy.get('filters'),
+                    return_properties=_DOC_PROPS,
                     return_metadata=MetadataQuery(score=True)
                 )
             elif strategy['type'] == 'vector':
@@ -285,8 +565,7 @@ class DropboxSearchOrchestrator:
                     query=strategy['query'],
                     limit=20,
                     filters=strategy.get('filters'),
-                    return_properties=["name", "file_path", "project_name", "contractor", "vendor_name",
-                                     "document_type", "content", "file_size", "modified_date"],
+                    return_properties=_DOC_PROPS,
                     return_metadata=MetadataQuery(score=True)
                 )
             elif strategy['type'] == 'keyword':
@@ -295,8 +574,7 @@ class DropboxSearchOrchestrator:
                     query=strategy['query'],
                     limit=20,
                     filters=strategy.get('filters'),
-                    return_properties=["name", "file_path", "project_name", "contractor", "vendor_name",
-                                     "document_type", "content", "file_size", "modified_date"],
+                    return_properties=_DOC_PROPS,
                     return_metadata=MetadataQuery(score=True)
                 )
             else:
@@ -304,17 +582,7 @@ class DropboxSearchOrchestrator:
                 response = collection.query.fetch_objects(
                     limit=20,
                     filters=strategy.get('filters'),
-                    return_properties=[
-                        "name",
-                        "file_path",
-                        "project_name",
-                        "contractor",
-                        "vendor_name",
-                        "document_type",
-                        "content",
-                        "file_size",
-                        "modified_date",
-                    ]
+                    return_properties=_DOC_PROPS
                 )
             
             # Extract results from v4 response
@@ -335,74 +603,70 @@ class DropboxSearchOrchestrator:
             logger.error(f"Document search failed: {e}")
             return []
     
-    def _search_chunks(self, strategy: Dict) -> List[Dict]:
-        """Search the DocumentChunk collection"""
+    def _has_chunk_collection(self) -> bool:
+        """Whether the DocumentChunk collection exists (cached for CHUNK_COLLECTION_CHECK_SECONDS)"""
+        with self._memo_lock:
+            checked_at = self._chunk_collection_checked_at
+            if checked_at is not None and time.monotonic() - checked_at < CHUNK_COLLECTION_CHECK_SECONDS:
+                return self._chunk_collection_exists
+        
+        exists = "DocumentChunk" in self.weaviate_client.collections.list_all()
+        with self._memo_lock:
+            self._chunk_collection_exists = exists
+            self._chunk_collection_checked_at = time.monotonic()
+        return exists
+    
+    def _search_chunks(self, strategy: Dict, chunk_limit: int = CHUNK_LIMIT_DEFAULT) -> List[Dict]:
+        """
+        Search the DocumentChunk collection
+        Returns metadata and scores only; content is hydrated for the final results
+        (ungrouped: grouped results carry no score, and _combine_results already
+        keeps the best chunk per parent)
+        
+        Args:
+            strategy: Search strategy configuration
+            chunk_limit: Number of chunks to return
+        """
         try:
-            # Check if chunk collection exists
-            collections = self.weaviate_client.collections.list_all()
-            if "DocumentChunk" not in collections:
+            if not self._has_chunk_collection():
                 return []
             
-            collection = self.weaviate_client.collections.get("DocumentChunk")
+            collection = self._collections["DocumentChunk"]
             
             # Execute same query against chunks
             if strategy['type'] == 'hybrid':
                 response = collection.query.hybrid(
                     query=strategy['query'],
+                    vector=strategy.get('_vec'),
                     alpha=strategy.get('alpha', 0.5),
                     fusion_type=HybridFusion.RELATIVE_SCORE,
-                    limit=30,
+                    limit=chunk_limit,
                     filters=strategy.get('filters'),
-                    return_properties=[
-                        "parent_dropbox_id",
-                        "parent_name",
-                        "file_path",
-                        "chunk_index",
-                        "total_chunks",
-                        "content",
-                        "project_name",
-                        "contractor",
-                        "vendor_name",
-                        "document_type",
-                    ],
+                    return_properties=_CHUNK_PROPS,
+                    return_metadata=MetadataQuery(score=True)
+                )
+            elif strategy['type'] == 'vector' and strategy.get('_vec') is not None:
+                response = collection.query.near_vector(
+                    near_vector=strategy['_vec'],
+                    limit=chunk_limit,
+                    filters=strategy.get('filters'),
+                    return_properties=_CHUNK_PROPS,
                     return_metadata=MetadataQuery(score=True)
                 )
             elif strategy['type'] == 'vector':
                 response = collection.query.near_text(
                     query=strategy['query'],
-                    limit=30,
+                    limit=chunk_limit,
                     filters=strategy.get('filters'),
-                    return_properties=[
-                        "parent_dropbox_id",
-                        "parent_name",
-                        "file_path",
-                        "chunk_index",
-                        "total_chunks",
-                        "content",
-                        "project_name",
-                        "contractor",
-                        "vendor_name",
-                        "document_type",
-                    ],
+                    return_properties=_CHUNK_PROPS,
                     return_metadata=MetadataQuery(score=True)
                 )
             elif strategy['type'] == 'keyword':
                 response = collection.query.bm25(
                     query=strategy['query'],
-                    limit=30,
+                    limit=chunk_limit,
                     filters=strategy.get('filters'),
-                    return_properties=[
-                        "parent_dropbox_id",
-                        "parent_name",
-                        "file_path",
-                        "chunk_index",
-                        "total_chunks",
-                        "content",
-                        "project_name",
-                        "contractor",
-                        "vendor_name",
-                        "document_type",
-                    ],
+                    return_properties=_CHUNK_PROPS,
                     return_metadata=MetadataQuery(score=True)
                 )
             else:
@@ -427,6 +691,44 @@ class DropboxSearchOrchestrator:
             logger.error(f"Chunk search failed: {e}")
             return []
     
+    def _hydrate_content(self, results: List[Dict]) -> None:
+        """
+        Fill in 'content' for final results with one fetch per collection
+        Documents use their own content; chunk-derived results use the best chunk's
+        
+        Args:
+            results: Ranked results to hydrate in place
+        """
+        doc_ids = [r['_id'] for r in results if not r.get('_from_chunks') and r.get('_id')]
+        chunk_ids = [r['_chunk_id'] for r in results if r.get('_from_chunks') and r.get('_chunk_id')]
+        
+        futures = [
+            _SEARCH_EXECUTOR.submit(self._fetch_content, name, ids)
+            for name, ids in (("Document", doc_ids), ("DocumentChunk", chunk_ids)) if ids
+        ]
+        content_by_id = {}
+        for future in futures:
+            content_by_id.update(future.result())
+        
+        for result in results:
+            key = result.get('_chunk_id') if result.get('_from_chunks') else result.get('_id')
+            if key in content_by_id:
+                result['content'] = content_by_id[key]
+    
+    def _fetch_content(self, collection_name: str, ids: List[str]) -> Dict[str, str]:
+        """Fetch the content property for objects by UUID"""
+        try:
+            collection = self._collections[collection_name]
+            response = collection.query.fetch_objects(
+                filters=Filter.by_id().contains_any(ids),
+                limit=len(ids),
+                return_properties=["content"]
+            )
+            return {str(obj.uuid): obj.properties.get('content') for obj in response.objects}
+        except Exception as e:
+            logger.error(f"Failed to fetch content from {collection_name}: {e}")
+            return {}
+    
     def _combine_results(self, documents: List[Dict], chunks: List[Dict]) -> List[Dict]:
         """
         Combine document and chunk results
@@ -450,22 +752,20 @@ class DropboxSearchOrchestrator:
                 seen_ids.add(doc_id)
                 combined.append(doc)
         
-        # Group chunks by parent document and track best score
-        chunks_by_parent = {}
+        # Single pass over chunks: keep only the best chunk and a match count per parent
+        best_by_parent = {}
+        counts = {}
         for chunk in chunks:
             parent_id = chunk.get('parent_dropbox_id')
             if parent_id:
-                if parent_id not in chunks_by_parent:
-                    chunks_by_parent[parent_id] = []
-                chunks_by_parent[parent_id].append(chunk)
+                counts[parent_id] = counts.get(parent_id, 0) + 1
+                best = best_by_parent.get(parent_id)
+                if best is None or chunk.get('_score', 0) > best.get('_score', 0):
+                    best_by_parent[parent_id] = chunk
         
         # Add documents found via chunks (if not already added)
-        for parent_id, chunk_list in chunks_by_parent.items():
+        for parent_id, best_chunk in best_by_parent.items():
             if parent_id not in seen_ids:
-                # Sort chunks by score to get best match
-                chunk_list.sort(key=lambda c: c.get('_score', 0), reverse=True)
-                best_chunk = chunk_list[0]
-                
                 # Create a synthetic document from chunk info
                 synthetic_doc = {
                     'dropbox_id': parent_id,
@@ -474,9 +774,9 @@ class DropboxSearchOrchestrator:
                     'project_name': best_chunk.get('project_name'),
                     'contractor': best_chunk.get('contractor'),
                     'document_type': best_chunk.get('document_type'),
-                    # Include best matching chunk content
-                    'content': best_chunk.get('content'),
-                    '_matched_chunks': len(chunk_list),
+                    # Best matching chunk; its content is fetched if this result is kept
+                    '_chunk_id': best_chunk.get('_id'),
+                    '_matched_chunks': counts[parent_id],
                     '_from_chunks': True,
                     # Use the best chunk's score
                     '_score': best_chunk.get('_score', 0)
@@ -484,7 +784,7 @@ class DropboxSearchOrchestrator:
                 combined.append(synthetic_doc)
                 seen_ids.add(parent_id)
         
-        logger.info(f"Combined {len(documents)} documents and {len(chunks_by_parent)} from chunks")
+        logger.info(f"Combined {len(documents)} documents and {len(best_by_parent)} from chunks")
         return combined
     
     
@@ -500,6 +800,15 @@ class DropboxSearchOrchestrator:
         Returns:
             Ranked and deduplicated results
         """
+        # Entity terms and their weights, lowercased once for all results
+        weighted_terms = [
+            (term.lower(), weight)
+            for term, weight in ((entities.project, 3), (entities.contractor, 3), (entities.document_type, 2))
+            if term
+        ]
+        weighted_terms.extend((keyword.lower(), 1) for keyword in entities.keywords)
+        automaton = self._build_term_automaton(weighted_terms)
+        
         # Deduplicate by file path
         seen_paths = set()
         unique_results = []
@@ -510,22 +819,14 @@ class DropboxSearchOrchestrator:
                 seen_paths.add(path)
                 
                 # Calculate heuristic score for entity matches (used as tiebreaker)
-                heuristic_score = 0
-                
-                # Score based on entity matches
-                if entities.project and entities.project.lower() in str(result).lower():
-                    heuristic_score += 3
-                
-                if entities.contractor and entities.contractor.lower() in str(result).lower():
-                    heuristic_score += 3
-                
-                if entities.document_type and entities.document_type.lower() in str(result).lower():
-                    heuristic_score += 2
-                
-                # Score based on keyword matches
-                for keyword in entities.keywords:
-                    if keyword.lower() in str(result).lower():
-                        heuristic_score += 1
+                # against the result's text fields, lowercased once
+                haystack = " ".join(v for v in result.values() if isinstance(v, str)).lower()
+                if automaton is not None:
+                    # Each distinct term counts once, as with the substring checks
+                    matched = {term for _, (term, _) in automaton.iter(haystack)}
+                    heuristic_score = sum(automaton.get(term)[1] for term in matched)
+                else:
+                    heuristic_score = sum(weight for term, weight in weighted_terms if term in haystack)
                 
                 result['heuristic_score'] = heuristic_score
                 unique_results.append(result)
@@ -542,6 +843,26 @@ class DropboxSearchOrchestrator:
         
         return unique_results
     
+    @staticmethod
+    def _build_term_automaton(weighted_terms: List[Tuple[str, int]]):
+        """
+        Aho-Corasick automaton over the ranking terms (None for few terms or without pyahocorasick)
+        Each term maps to (term, total weight) so repeated terms keep their combined weight
+        """
+        if ahocorasick is None or len(weighted_terms) < AHO_CORASICK_MIN_TERMS:
+            return None
+        
+        weights = {}
+        for term, weight in weighted_terms:
+            if term:
+                weights[term] = weights.get(term, 0) + weight
+        
+        automaton = ahocorasick.Automaton()
+        for term, weight in weights.items():
+            automaton.add_word(term, (term, weight))
+        automaton.make_automaton()
+        return automaton
+    
     def search_with_context(self, query: str) -> Dict[str, Any]:
         """
         Search with context from previous searches
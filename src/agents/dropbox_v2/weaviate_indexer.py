@@ -4,19 +4,252 @@ Manages document indexing in Weaviate vector database
 Single unified collection design for predictable indexing and search
 """
 
+import asyncio
+import atexit
 import logging
+import multiprocessing
 import os
-from typing import Dict, List, Optional, Any
+import re
+import threading
+import time
+import zlib
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, NamedTuple, Optional, Any, Set, Tuple
 import weaviate
 from weaviate.classes.config import Configure, Property, DataType, StopwordsPreset
+from weaviate.classes.init import AdditionalConfig, Timeout
 from weaviate.classes.query import Filter, MetadataQuery
 from weaviate.classes.aggregate import GroupByAggregate
+from weaviate.classes.data import DataObject
+from weaviate.util import generate_uuid5
 from datetime import datetime, timezone
 import hashlib
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
+from weaviate.exceptions import WeaviateConnectionError, WeaviateQueryError, WeaviateTimeoutError
+from tenacity import retry, stop_after_attempt, wait_exponential_jitter, retry_if_exception_type
 
 logger = logging.getLogger(__name__)
 
+# Only retry errors that can succeed on a second attempt; validation, schema
+# and auth errors surface immediately
+TRANSIENT_ERRORS = (
+    WeaviateConnectionError,
+    WeaviateQueryError,
+    WeaviateTimeoutError,
+)
+
+# Chunk objects sent per insert_many request (one document can yield many)
+CHUNK_INSERT_BATCH_SIZE = 500
+
+# Characters encoded per step when hashing document content
+HASH_SLICE_CHARS = 65536
+
+# Timestamps already in Weaviate's RFC3339 UTC form (e.g. Dropbox's server_modified)
+_RFC3339_UTC = re.compile(r'^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(?:\.\d+)?Z$')
+
+# Longest get_index_stats serves counters before re-aggregating (bounds drift
+# from writes made by other processes)
+STATS_REFRESH_SECONDS = 300
+
+# Batch sizing used inside WeaviateIndexer.bulk_mode()
+BULK_BATCH_SIZE = 200
+BULK_CONCURRENT_REQUESTS = 4
+
+# Document properties as (Weaviate property, processor key, default if missing)
+_DOCUMENT_FIELDS = (
+    ('dropbox_id', 'id', None),
+    ('name', 'name', None),
+    ('file_path', 'file_path', None),
+    ('content', 'content', ''),
+    
+    # Dynamic metadata (may be None)
+    ('project_name', 'project_name', None),
+    ('contractor', 'contractor', None),
+    ('document_type', 'document_type', None),
+    
+    # File metadata
+    ('file_size', 'file_size', 0),
+    
+    # Document metadata
+    ('invoice_number', 'invoice_number', None),
+    ('invoice_amount', 'invoice_amount', None),
+    ('invoice_date', 'invoice_date', None),
+    ('vendor_name', 'vendor_name', None),
+    
+    # Processing metadata
+    ('text_length', 'text_length', 0),
+    ('word_count', 'word_count', 0),
+    ('content_hash', 'content_hash', None),
+)
+
+# Clusters whose schema this process has already verified (keyed by cluster URL)
+_SCHEMA_READY: Set[str] = set()
+
+# One long-lived client per cluster per process, shared by every WeaviateIndexer
+_CLIENTS: Dict[str, Any] = {}
+_CLIENTS_LOCK = threading.Lock()
+
+# Index stats counters per cluster, shared by every WeaviateIndexer so the
+# status endpoint sees writes made through the sync's indexer
+_INDEX_STATS: Dict[str, "_IndexStats"] = {}
+_INDEX_STATS_LOCK = threading.Lock()
+
+# Client timeouts in seconds (inserts wait on server-side vectorization)
+CLIENT_TIMEOUT = Timeout(init=30, query=60, insert=120)
+
+# Chunk inserts (each vectorized by Voyage) in flight at once on the async path
+CHUNK_INSERT_CONCURRENCY = 16
+
+
+class _ExistingDocument(NamedTuple):
+    """A stored Document found by _find_existing_document"""
+    uuid: str
+    dropbox_id: Optional[str] = None
+    content_hash: Optional[str] = None
+    file_path: Optional[str] = None
+    name: Optional[str] = None
+    document_type: Optional[str] = None
+
+
+class _IndexStats:
+    """Document counters maintained on insert/delete; doc_count is None until seeded"""
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.doc_count: Optional[int] = None
+        self.type_counts: Counter = Counter()
+        self.refreshed_at = 0.0
+
+
+def _compile_field_mapper(fields: Tuple[Tuple[str, str, Any], ...]):
+    """
+    Generate a straight-line mapper for a fixed (property, key, default) table
+    One inlined get/None check per field, with no per-call loop or tuple unpacking
+    
+    Returns:
+        Function mapping a processor document to a dict without None values
+    """
+    lines = ["def _map_document_fields(document):", "    get = document.get", "    out = {}"]
+    for prop, key, default in fields:
+        lines.append(f"    value = get({key!r}, {default!r})")
+        lines.append("    if value is not None:")
+        lines.append(f"        out[{prop!r}] = value")
+    lines.append("    return out")
+    
+    namespace: Dict[str, Any] = {}
+    exec(compile("\n".join(lines), "<_map_document_fields>", "exec"), namespace)
+    return namespace["_map_document_fields"]
+
+
+_map_document_fields = _compile_field_mapper(_DOCUMENT_FIELDS)
+
+
+def _hash_content(content: str, legacy: bool = False) -> str:
+    """
+    BLAKE2b-256 of the UTF-8 content, encoded slice by slice
+    Same digest as hashing content.encode(), without a full encoded copy in memory
+    
+    Args:
+        content: Text to fingerprint
+        legacy: Use SHA-256, the algorithm of content hashes stored before BLAKE2b
+    """
+    digest = hashlib.sha256() if legacy else hashlib.blake2b(digest_size=32)
+    for start in range(0, len(content), HASH_SLICE_CHARS):
+        digest.update(content[start:start + HASH_SLICE_CHARS].encode())
+    return digest.hexdigest()
+
+
+def _cluster_key() -> str:
+    """Identify the configured Weaviate cluster (cloud URL or the local default)"""
+    return os.getenv("WEAVIATE_URL") or "localhost:8080"
+
+
+def _index_stats(key: str) -> _IndexStats:
+    """The process-wide index stats counters for a cluster"""
+    with _INDEX_STATS_LOCK:
+        stats = _INDEX_STATS.get(key)
+        if stats is None:
+            stats = _INDEX_STATS[key] = _IndexStats()
+        return stats
+
+
+def _bulk_index_shard(documents: List[Dict[str, Any]], enable_chunking: bool) -> Tuple[int, int]:
+    """
+    Worker-process entry point for WeaviateIndexer.bulk_index
+    Each process opens its own connection (clients can't cross process boundaries)
+    
+    Returns:
+        (documents indexed, documents in shard)
+    """
+    # The process-wide client is left open for later shards handled by this worker
+    indexer = WeaviateIndexer()
+    with indexer.bulk_mode():
+        results = indexer.index_documents(documents, enable_chunking)
+    return sum(1 for ok in results.values() if ok), len(documents)
+
+
+def _shared_client(key: str) -> Optional[weaviate.Client]:
+    """
+    The process-wide client for a cluster, (re)opened if missing or closed
+    Resolved on every access so a client closed elsewhere never leaves an
+    indexer holding a dead connection
+    """
+    with _CLIENTS_LOCK:
+        client = _CLIENTS.get(key)
+        if client is not None and client.is_connected():
+            return client
+        
+        client = _open_client()
+        if client is not None:
+            _CLIENTS[key] = client
+        return client
+
+
+def _open_client() -> Optional[weaviate.Client]:
+    """Open a new Weaviate client connection (cloud or local)"""
+    try:
+        if os.getenv("WEAVIATE_URL") and os.getenv("WEAVIATE_API_KEY"):
+            # Production: Weaviate Cloud
+            # Build headers with Voyage API key
+            headers = {}
+            voyage_key = os.getenv("VOYAGE_API_KEY")
+            if voyage_key:
+                headers["X-VoyageAI-Api-Key"] = voyage_key
+            
+            client = weaviate.connect_to_weaviate_cloud(
+                cluster_url=os.getenv("WEAVIATE_URL"),
+                auth_credentials=weaviate.auth.AuthApiKey(os.getenv("WEAVIATE_API_KEY")),
+                headers=headers if headers else None,
+                additional_config=AdditionalConfig(timeout=CLIENT_TIMEOUT)
+            )
+            logger.info("Connected to Weaviate Cloud")
+        else:
+            # Local: Docker instance
+            client = weaviate.connect_to_local(
+                host="localhost", port=8080,
+                additional_config=AdditionalConfig(timeout=CLIENT_TIMEOUT)
+            )
+            logger.info("Connected to local Weaviate")
+        
+        return client
+        
+    except Exception as e:
+        logger.error(f"Failed to connect to Weaviate: {e}")
+        return None
+
+
+@atexit.register
+def _close_shared_clients() -> None:
+    """Close every process-wide client at interpreter exit"""
+    with _CLIENTS_LOCK:
+        for client in _CLIENTS.values():
+            try:
+                client.close()
+            except Exception:
+                pass
+        _CLIENTS.clear()
+
 
 class WeaviateIndexer:
     """
@@ -24,9 +257,31 @@ class WeaviateIndexer:
     Uses a single unified collection for all documents
     """
     
-    def __init__(self):
-        """Initialize Weaviate connection and schema"""
-        self.client = self._connect_weaviate()
+    def __init__(self, batch_size: int = 100, concurrent_requests: int = 2):
+        """
+        Initialize Weaviate connection and schema
+        
+        Args:
+            batch_size: Objects per request when batching a document's chunks
+            concurrent_requests: Batch requests the client keeps in flight
+        """
+        self.batch_size = batch_size
+        self.concurrent_requests = concurrent_requests
+        
+        # Process-wide client for this cluster, resolved through the client property
+        self._client_key = _cluster_key()
+        self._connected = _shared_client(self._client_key) is not None
+        
+        # Async client for aindex_document_chunks, created on first use per event loop
+        self._async_client = None
+        self._async_client_loop = None
+        
+        # DocumentProcessor for chunking, shared by every document
+        self._chunk_processor = None
+        
+        # Index stats maintained on insert/delete, shared per cluster
+        self._stats = _index_stats(self._client_key)
+        
         self.collection_name = "Document"
         self.chunk_collection_name = "DocumentChunk"
         
@@ -36,42 +291,77 @@ class WeaviateIndexer:
         else:
             logger.error("Failed to initialize WeaviateIndexer")
     
-    def _connect_weaviate(self) -> Optional[weaviate.Client]:
-        """Connect to Weaviate (cloud or local)"""
+    @property
+    def client(self) -> Optional[weaviate.Client]:
+        """
+        Shared Weaviate client (cloud or local) for this indexer's cluster
+        Queries and batches go over its gRPC channel; it is reopened if something
+        closed it, so callers must not close it themselves
+        """
+        if not self._connected:
+            return None
+        return _shared_client(self._client_key)
+    
+    async def _get_async_client(self):
+        """
+        Connect the async Weaviate client (cloud or local) for the running event loop
+        
+        Returns:
+            Connected WeaviateAsyncClient, or None if connecting failed
+        """
+        loop = asyncio.get_running_loop()
+        if self._async_client is not None and self._async_client_loop is loop:
+            return self._async_client
+        
         try:
             if os.getenv("WEAVIATE_URL") and os.getenv("WEAVIATE_API_KEY"):
-                # Production: Weaviate Cloud
-                # Build headers with Voyage API key
                 headers = {}
                 voyage_key = os.getenv("VOYAGE_API_KEY")
                 if voyage_key:
                     headers["X-VoyageAI-Api-Key"] = voyage_key
-                    
-                client = weaviate.connect_to_weaviate_cloud(
+                
+                client = weaviate.use_async_with_weaviate_cloud(
                     cluster_url=os.getenv("WEAVIATE_URL"),
                     auth_credentials=weaviate.auth.AuthApiKey(os.getenv("WEAVIATE_API_KEY")),
-                    headers=headers if headers else None
+                    headers=headers if headers else None,
+                    additional_config=AdditionalConfig(timeout=CLIENT_TIMEOUT)
                 )
-                logger.info("Connected to Weaviate Cloud")
             else:
-                # Local: Docker instance
-                client = weaviate.connect_to_local(host="localhost", port=8080)
-                logger.info("Connected to local Weaviate")
+                client = weaviate.use_async_with_local(
+                    host="localhost", port=8080,
+                    additional_config=AdditionalConfig(timeout=CLIENT_TIMEOUT)
+                )
             
+            await client.connect()
+            self._async_client = client
+            self._async_client_loop = loop
             return client
             
         except Exception as e:
-            logger.error(f"Failed to connect to Weaviate: {e}")
+            logger.error(f"Failed to connect async Weaviate client: {e}")
             return None
     
+    async def aclose(self) -> None:
+        """Close the async client if one was opened"""
+        if self._async_client is not None:
+            await self._async_client.close()
+            self._async_client = None
+            self._async_client_loop = None
+    
     def _ensure_schema(self) -> None:
         """
         Ensure both Document and DocumentChunk collections exist
         Implements chunked indexing for better recall
+        Runs once per cluster per process; later indexers skip the schema calls
         """
         if not self.client:
             return
         
+        schema_key = _cluster_key()
+        if schema_key in _SCHEMA_READY:
+            logger.debug("Weaviate schema already verified")
+            return
+        
         try:
             # Check if collections exist
             collections = self.client.collections.list_all()
@@ -108,6 +398,11 @@ class WeaviateIndexer:
                     pass
             except Exception as e:
                 logger.debug(f"Could not ensure DocumentChunk.vendor_name: {e}")
+            
+            # Collections created just now are confirmed before the schema counts as ready
+            created = [name for name in (self.collection_name, self.chunk_collection_name) if name not in collections]
+            if all(self.client.collections.exists(name) for name in created):
+                _SCHEMA_READY.add(schema_key)
                 
         except Exception as e:
             logger.error(f"Failed to ensure schema: {e}")
@@ -216,13 +511,16 @@ class WeaviateIndexer:
         except Exception as e:
             logger.error(f"Failed to create DocumentChunk collection: {e}")
     
-    def index_document(self, document: Dict[str, Any], enable_chunking: bool = True) -> bool:
+    def index_document(self, document: Dict[str, Any], enable_chunking: bool = True,
+                       force_reindex: bool = False) -> bool:
         """
         Index a document in Weaviate with optional chunking
+        A document whose stored content hash, path and name are unchanged is skipped
         
         Args:
             document: Document data to index
             enable_chunking: Whether to chunk the document for better recall
+            force_reindex: Rewrite (and re-embed) the document even if unchanged
             
         Returns:
             True if successful
@@ -233,7 +531,7 @@ class WeaviateIndexer:
         try:
             # Generate content hash for deduplication
             content = document.get('content', '')
-            content_hash = hashlib.sha256(content.encode()).hexdigest()
+            content_hash = _hash_content(content)
             document['content_hash'] = content_hash
             
             # Check if document already exists (by dropbox_id or content_hash)
@@ -242,6 +540,10 @@ class WeaviateIndexer:
                 content_hash
             )
             
+            if existing and not force_reindex and self._is_unchanged(existing, document):
+                logger.debug(f"Skipped unchanged document {document.get('name')}")
+                return True
+            
             # If updating, clean up old chunks first
             if existing and enable_chunking:
                 self._delete_document_chunks(document.get('id'))
@@ -255,13 +557,15 @@ class WeaviateIndexer:
                 # Update existing document with retry
                 self._update_document_with_retry(
                     collection,
-                    existing['_additional']['id'],
+                    existing.uuid,
                     weaviate_doc
                 )
+                self._count_retyped(existing.document_type, document.get('document_type'))
                 logger.debug(f"Updated document {document.get('name')}")
             else:
                 # Create new document with retry
                 self._insert_document_with_retry(collection, weaviate_doc)
+                self._count_inserted([document.get('document_type')])
                 logger.debug(f"Indexed new document {document.get('name')}")
             
             # Index chunks if enabled and content is substantial
@@ -274,10 +578,217 @@ class WeaviateIndexer:
             logger.error(f"Failed to index document {document.get('name')}: {e}")
             return False
     
+    @staticmethod
+    def _is_unchanged(existing: _ExistingDocument, document: Dict[str, Any]) -> bool:
+        """
+        Same Dropbox file with identical content and location: nothing to re-embed
+        (objects indexed before the switch to BLAKE2b still carry a SHA-256 hash)
+        
+        Args:
+            existing: Stored document found for it
+            document: Document with 'content_hash' already set
+        """
+        return (existing.dropbox_id == document.get('id')
+                and existing.file_path == document.get('file_path')
+                and existing.name == document.get('name')
+                and (existing.content_hash == document['content_hash']
+                     or existing.content_hash == _hash_content(document.get('content', ''), legacy=True)))
+    
+    @contextmanager
+    def bulk_mode(self, batch_size: int = BULK_BATCH_SIZE, concurrent_requests: int = BULK_CONCURRENT_REQUESTS):
+        """
+        Larger batches and more requests in flight for the duration of a backfill
+        HNSW construction can't be deferred per collection from the client; for
+        insert throughput decoupled from graph building, run the server with
+        ASYNC_INDEXING=true
+        
+        Args:
+            batch_size: Objects per batch request while in bulk mode
+            concurrent_requests: Batch requests kept in flight while in bulk mode
+        """
+        previous = (self.batch_size, self.concurrent_requests)
+        self.batch_size, self.concurrent_requests = batch_size, concurrent_requests
+        try:
+            yield self
+        finally:
+            self.batch_size, self.concurrent_requests = previous
+    
+    def index_documents(self, documents: List[Dict[str, Any]], enable_chunking: bool = True,
+                        force_reindex: bool = False) -> Dict[str, bool]:
+        """
+        Bulk-index any number of documents
+        Splits the input into batch_index calls of batch_size documents, so each
+        batch costs one existence lookup and one insert request; documents are
+        ordered by length so each batch embeds similarly sized texts (less padding)
+        
+        Args:
+            documents: Processed documents to index
+            enable_chunking: Whether to chunk the documents for better recall
+            force_reindex: Rewrite (and re-embed) documents even if unchanged
+            
+        Returns:
+            Mapping of Dropbox ID to success
+        """
+        # Keep only the last version of each file so reordering can't put a stale one last
+        latest = {document.get('id') or f"#{i}": document for i, document in enumerate(documents)}
+        ordered = sorted(latest.values(), key=self._text_length)
+        
+        results = {}
+        for start in range(0, len(ordered), self.batch_size):
+            results.update(self.batch_index(ordered[start:start + self.batch_size], enable_chunking, force_reindex))
+        return results
+    
+    @staticmethod
+    def _text_length(document: Dict[str, Any]) -> int:
+        """Length used to group similarly sized texts into the same embedding batch"""
+        return document.get('text_length') or len(document.get('content', ''))
+    
+    def bulk_index(self, documents: Iterable[Dict[str, Any]], workers: int = 4,
+                   enable_chunking: bool = True) -> Dict[int, Tuple[int, int]]:
+        """
+        Backfill a corpus across several worker processes
+        Documents are sharded by a stable hash of their Dropbox ID, so each file
+        always lands in the same shard; every worker indexes its shard with
+        index_documents over its own connection
+        
+        Args:
+            documents: Processed documents to index
+            workers: Number of worker processes
+            enable_chunking: Whether to chunk the documents for better recall
+            
+        Returns:
+            Mapping of shard number to (documents indexed, documents in shard)
+        """
+        shards: Dict[int, List[Dict[str, Any]]] = {}
+        for document in documents:
+            shard = zlib.crc32(str(document.get('id', '')).encode()) % workers
+            shards.setdefault(shard, []).append(document)
+        if not shards:
+            return {}
+        
+        # spawn: a forked child would inherit this process's gRPC channel
+        with ProcessPoolExecutor(max_workers=min(workers, len(shards)),
+                                 mp_context=multiprocessing.get_context("spawn")) as pool:
+            futures = {
+                shard: pool.submit(_bulk_index_shard, shard_documents, enable_chunking)
+                for shard, shard_documents in shards.items()
+            }
+            results = {}
+            for shard, future in futures.items():
+                try:
+                    results[shard] = future.result()
+                except Exception as e:
+                    logger.error(f"Bulk index shard {shard} failed: {e}")
+                    results[shard] = (0, len(shards[shard]))
+        
+        # Workers wrote through their own processes; re-aggregate on the next stats call
+        with self._stats.lock:
+            self._stats.doc_count = None
+        
+        indexed = sum(ok for ok, _ in results.values())
+        total = sum(count for _, count in results.values())
+        logger.info(f"Bulk indexed {indexed}/{total} documents across {len(shards)} processes")
+        return results
+    
+    def batch_index(self, documents: List[Dict[str, Any]], enable_chunking: bool = True,
+                    force_reindex: bool = False) -> Dict[str, bool]:
+        """
+        Index many documents with one batch request instead of one per document
+        Existing documents are replaced in place (batch inserts upsert by UUID);
+        those whose stored content hash, path and name are unchanged are skipped
+        
+        Args:
+            documents: Processed documents to index
+            enable_chunking: Whether to chunk the documents for better recall
+            force_reindex: Rewrite (and re-embed) documents even if unchanged
+            
+        Returns:
+            Mapping of Dropbox ID to success
+        """
+        if not documents:
+            return {}
+        if not self.client:
+            return {document.get('id'): False for document in documents}
+        
+        try:
+            # Generate content hashes for deduplication
+            for document in documents:
+                document['content_hash'] = _hash_content(document.get('content', ''))
+            
+            # One lookup for the whole batch: document index -> existing document
+            existing = self._find_existing_documents(documents)
+            
+            # Unchanged documents count as indexed without re-embedding them or their chunks
+            results = {}
+            if not force_reindex:
+                unchanged = {i for i, found in existing.items() if self._is_unchanged(found, documents[i])}
+                if unchanged:
+                    logger.debug(f"Skipped {len(unchanged)} unchanged documents")
+                    results = {documents[i].get('id'): True for i in unchanged}
+                    changed = [i for i in range(len(documents)) if i not in unchanged]
+                    existing = {j: existing[i] for j, i in enumerate(changed) if i in existing}
+                    documents = [documents[i] for i in changed]
+                    if not documents:
+                        return results
+            
+            # If updating, clean up old chunks first
+            if existing and enable_chunking:
+                self._delete_chunks_for_documents([documents[i].get('id') for i in existing])
+            
+            # New documents get a UUID derived from their Dropbox ID, so a file
+            # queued twice in one batch upserts a single object
+            collection = self.client.collections.get(self.collection_name)
+            objects = [
+                DataObject(
+                    properties=self._prepare_document_for_weaviate(document),
+                    uuid=existing[i].uuid if i in existing else (
+                        generate_uuid5(document['id']) if document.get('id') else None
+                    )
+                )
+                for i, document in enumerate(documents)
+            ]
+            response = self._insert_many_with_retry(collection, objects)
+            
+            # Per-object errors are keyed by position in the request
+            inserted = {}
+            for i, document in enumerate(documents):
+                error = response.errors.get(i)
+                if error is not None:
+                    logger.error(f"Failed to index document {document.get('name')}: {error.message}")
+                elif i in existing:
+                    self._count_retyped(existing[i].document_type, document.get('document_type'))
+                else:
+                    # Repeats of a Dropbox ID upserted the same object
+                    inserted[document.get('id') or i] = document.get('document_type')
+                results[document.get('id')] = error is None
+            self._count_inserted(inserted.values())
+            
+            if enable_chunking:
+                self._batch_index_chunks([
+                    document for i, document in enumerate(documents)
+                    if i not in response.errors and len(document.get('content', '')) > 500
+                ])
+            
+            logger.debug(f"Batch indexed {len(documents) - len(response.errors)}/{len(documents)} documents")
+            return results
+            
+        except Exception as e:
+            logger.error(f"Failed to batch index {len(documents)} documents: {e}")
+            return {document.get('id'): False for document in documents}
+    
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential_jitter(initial=1, max=4),
+        retry=retry_if_exception_type(TRANSIENT_ERRORS)
+    )
+    def _insert_many_with_retry(self, collection, objects: List[DataObject]):
+        """Batch insert objects with retry logic"""
+        return collection.data.insert_many(objects)
+    
     @retry(
         stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-        retry=retry_if_exception_type(Exception)
+        wait=wait_exponential_jitter(initial=1, max=4),
+        retry=retry_if_exception_type(TRANSIENT_ERRORS)
     )
     def _insert_document_with_retry(self, collection, properties: Dict[str, Any]):
         """Insert document with retry logic"""
@@ -285,8 +796,8 @@ class WeaviateIndexer:
     
     @retry(
         stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-        retry=retry_if_exception_type(Exception)
+        wait=wait_exponential_jitter(initial=1, max=4),
+        retry=retry_if_exception_type(TRANSIENT_ERRORS)
     )
     def _update_document_with_retry(self, collection, uuid: str, properties: Dict[str, Any]):
         """Update document with retry logic"""
@@ -294,8 +805,8 @@ class WeaviateIndexer:
     
     @retry(
         stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-        retry=retry_if_exception_type(Exception)
+        wait=wait_exponential_jitter(initial=1, max=4),
+        retry=retry_if_exception_type(TRANSIENT_ERRORS)
     )
     def _insert_chunk_with_retry(self, collection, properties: Dict[str, Any]):
         """Insert chunk with retry logic"""
@@ -306,32 +817,9 @@ class WeaviateIndexer:
         Prepare document for Weaviate indexing
         Handles type conversions and field mapping
         """
-        # Map fields from processor to Weaviate schema
-        weaviate_doc = {
-            'dropbox_id': document.get('id'),
-            'name': document.get('name'),
-            'file_path': document.get('file_path'),
-            'content': document.get('content', ''),
-            
-            # Dynamic metadata (may be None)
-            'project_name': document.get('project_name'),
-            'contractor': document.get('contractor'),
-            'document_type': document.get('document_type'),
-            
-            # File metadata
-            'file_size': document.get('file_size', 0),
-            
-            # Document metadata
-            'invoice_number': document.get('invoice_number'),
-            'invoice_amount': document.get('invoice_amount'),
-            'invoice_date': document.get('invoice_date'),
-            'vendor_name': document.get('vendor_name'),
-            
-            # Processing metadata
-            'text_length': document.get('text_length', 0),
-            'word_count': document.get('word_count', 0),
-            'content_hash': document.get('content_hash')
-        }
+        # Map fields from processor to Weaviate schema in one pass, skipping
+        # None values (Weaviate doesn't like them)
+        weaviate_doc = _map_document_fields(document)
         
         # Handle dates
         if document.get('modified_date'):
@@ -341,13 +829,14 @@ class WeaviateIndexer:
         if document.get('indexed_at'):
             weaviate_doc['indexed_at'] = self._parse_date(document['indexed_at'])
         
-        # Remove None values (Weaviate doesn't like them)
-        weaviate_doc = {k: v for k, v in weaviate_doc.items() if v is not None}
-        
         return weaviate_doc
     
     def _parse_date(self, date_str: str) -> str:
         """Parse date string to RFC3339 format for Weaviate"""
+        # Fast path: already RFC3339 UTC, nothing to normalize
+        if isinstance(date_str, str) and _RFC3339_UTC.match(date_str):
+            return date_str
+        
         try:
             # Try to parse ISO format and normalize to UTC
             dt = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
@@ -364,13 +853,13 @@ class WeaviateIndexer:
             return datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
     
     def _find_existing_document(self, dropbox_id: Optional[str], 
-                               content_hash: str) -> Optional[Dict]:
+                               content_hash: str) -> Optional[_ExistingDocument]:
         """
         Find existing document by Dropbox ID or content hash
         
         Args:
             dropbox_id: Dropbox file ID
-            content_hash: SHA256 hash of content
+            content_hash: Content hash (see _hash_content)
             
         Returns:
             Existing document or None
@@ -387,27 +876,36 @@ class WeaviateIndexer:
                 response = collection.query.fetch_objects(
                     filters=Filter.by_property("dropbox_id").equal(dropbox_id),
                     limit=1,
-                    return_properties=["dropbox_id"],
+                    return_properties=["dropbox_id", "content_hash", "file_path", "name", "document_type"],
                     include_vector=False
                 )
                 
                 if response and response.objects:
                     obj = response.objects[0]
-                    return {"dropbox_id": obj.properties.get("dropbox_id"), 
-                           "_additional": {"id": str(obj.uuid)}}
+                    return _ExistingDocument(
+                        uuid=str(obj.uuid),
+                        dropbox_id=obj.properties.get("dropbox_id"),
+                        content_hash=obj.properties.get("content_hash"),
+                        file_path=obj.properties.get("file_path"),
+                        name=obj.properties.get("name"),
+                        document_type=obj.properties.get("document_type")
+                    )
             
             # Fallback to content hash
             response = collection.query.fetch_objects(
                 filters=Filter.by_property("content_hash").equal(content_hash),
                 limit=1,
-                return_properties=["content_hash"],
+                return_properties=["content_hash", "document_type"],
                 include_vector=False
             )
             
             if response and response.objects:
                 obj = response.objects[0]
-                return {"content_hash": obj.properties.get("content_hash"),
-                       "_additional": {"id": str(obj.uuid)}}
+                return _ExistingDocument(
+                    uuid=str(obj.uuid),
+                    content_hash=obj.properties.get("content_hash"),
+                    document_type=obj.properties.get("document_type")
+                )
             
             return None
             
@@ -415,6 +913,58 @@ class WeaviateIndexer:
             logger.error(f"Error finding existing document: {e}")
             return None
     
+    def _find_existing_documents(self, documents: List[Dict[str, Any]]) -> Dict[int, _ExistingDocument]:
+        """
+        Batch version of _find_existing_document
+        Matches by Dropbox ID first, then by content hash for the rest
+        (OR of equal filters: contains_any would match on shared word tokens such as "id")
+        
+        Args:
+            documents: Documents with 'id' and 'content_hash' set
+            
+        Returns:
+            Mapping of document index to existing document
+        """
+        collection = self.client.collections.get(self.collection_name)
+        existing: Dict[int, _ExistingDocument] = {}
+        
+        # A Dropbox ID match also fetches what the unchanged check compares
+        lookups = (
+            ("dropbox_id", "id", ["dropbox_id", "content_hash", "file_path", "name", "document_type"]),
+            ("content_hash", "content_hash", ["content_hash", "document_type"]),
+        )
+        for prop, key, properties in lookups:
+            wanted: Dict[str, List[int]] = {}
+            for i, document in enumerate(documents):
+                if i not in existing and document.get(key):
+                    wanted.setdefault(document[key], []).append(i)
+            if not wanted:
+                continue
+            
+            try:
+                response = collection.query.fetch_objects(
+                    filters=Filter.any_of([Filter.by_property(prop).equal(value) for value in wanted]),
+                    limit=2 * len(wanted),
+                    return_properties=properties,
+                    include_vector=False
+                )
+            except Exception as e:
+                logger.error(f"Error finding existing documents by {prop}: {e}")
+                continue
+            
+            for obj in response.objects:
+                for i in wanted.pop(obj.properties.get(prop), ()):
+                    existing[i] = _ExistingDocument(
+                        uuid=str(obj.uuid),
+                        dropbox_id=obj.properties.get("dropbox_id"),
+                        content_hash=obj.properties.get("content_hash"),
+                        file_path=obj.properties.get("file_path"),
+                        name=obj.properties.get("name"),
+                        document_type=obj.properties.get("document_type")
+                    )
+        
+        return existing
+    
     def delete_document(self, dropbox_id: str) -> bool:
         """
         Delete a document and all its chunks from Weaviate
@@ -432,23 +982,86 @@ class WeaviateIndexer:
             # First delete all chunks for this document
             self._delete_document_chunks(dropbox_id)
             
-            # Find document
-            existing = self._find_existing_document(dropbox_id, "")
-            if not existing:
+            # Delete by filter (no lookup round-trip for the UUID)
+            collection = self.client.collections.get(self.collection_name)
+            where = Filter.by_property("dropbox_id").equal(dropbox_id)
+            deleting = self._types_matching(collection, where, limit=2)
+            result = collection.data.delete_many(where=where, verbose=False)
+            self._count_deleted(deleting, result.successful)
+            
+            if result.failed:
+                logger.error(f"Failed to delete {result.failed}/{result.matches} objects for document {dropbox_id}")
+                return False
+            if not result.matches:
                 logger.warning(f"Document {dropbox_id} not found for deletion")
                 return True  # Already gone
             
-            # Delete by UUID
+            logger.debug(f"Deleted document {dropbox_id} ({result.successful} objects) and its chunks")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Failed to delete document {dropbox_id}: {e}")
+            return False
+    
+    def delete_documents(self, dropbox_ids: List[str]) -> bool:
+        """
+        Delete several documents and all their chunks
+        Two filtered delete_many requests instead of lookups and deletes per document
+        
+        Args:
+            dropbox_ids: Dropbox file IDs
+            
+        Returns:
+            True if successful (IDs that are already gone count as deleted)
+        """
+        if not self.client:
+            return False
+        
+        dropbox_ids = [dropbox_id for dropbox_id in dropbox_ids if dropbox_id]
+        if not dropbox_ids:
+            return True
+        
+        try:
+            # First delete all chunks for these documents
+            self._delete_chunks_for_documents(dropbox_ids)
+            
             collection = self.client.collections.get(self.collection_name)
-            collection.data.delete_by_id(existing['_additional']['id'])
+            where = Filter.any_of([
+                Filter.by_property("dropbox_id").equal(dropbox_id) for dropbox_id in dropbox_ids
+            ])
+            deleting = self._types_matching(collection, where, limit=2 * len(dropbox_ids))
+            result = collection.data.delete_many(where=where)
+            self._count_deleted(deleting, result.successful)
+            
+            if result.failed:
+                logger.error(f"Failed to delete {result.failed}/{result.matches} documents")
+                return False
             
-            logger.debug(f"Deleted document {dropbox_id} and its chunks")
+            logger.debug(f"Deleted {result.successful} documents (of {len(dropbox_ids)} IDs) and their chunks")
             return True
             
         except Exception as e:
-            logger.error(f"Failed to delete document {dropbox_id}: {e}")
+            logger.error(f"Failed to delete {len(dropbox_ids)} documents: {e}")
             return False
     
+    def list_document_ids(self) -> Set[str]:
+        """
+        Get the Dropbox IDs of every indexed document
+        Streams the collection with the cursor iterator, fetching only dropbox_id
+        
+        Returns:
+            Set of Dropbox file IDs
+        """
+        if not self.client:
+            return set()
+        
+        collection = self.client.collections.get(self.collection_name)
+        return {
+            obj.properties["dropbox_id"]
+            for obj in collection.iterator(return_properties=["dropbox_id"], cache_size=1000)
+            if obj.properties.get("dropbox_id")
+        }
+    
     def document_exists(self, dropbox_id: str) -> bool:
         """Check if document exists in index"""
         return self._find_existing_document(dropbox_id, "") is not None
@@ -461,14 +1074,7 @@ class WeaviateIndexer:
             document: Document with content to chunk
         """
         try:
-            from .document_processor import DocumentProcessor
-            
-            # Create processor instance to use chunk_text method
-            processor = DocumentProcessor()
-            
-            # Use full_text if available (for complete chunking), otherwise fall back to content
-            content = document.get('full_text') or document.get('content', '')
-            chunks = processor.chunk_text(content, chunk_size=1000, overlap=200)
+            chunks = self._build_chunks(document)
             
             if not chunks:
                 return
@@ -476,43 +1082,153 @@ class WeaviateIndexer:
             # Get chunk collection
             chunk_collection = self.client.collections.get(self.chunk_collection_name)
             
-            # Prepare metadata that's common to all chunks
-            base_metadata = {
-                'parent_dropbox_id': document.get('id'),
-                'parent_name': document.get('name'),
-                'file_path': document.get('file_path'),
-                'project_name': document.get('project_name'),
-                'contractor': document.get('contractor'),
-                'vendor_name': document.get('vendor_name'),
-                'document_type': document.get('document_type'),
-                'total_chunks': len(chunks)
-            }
+            # Let the batch client coalesce the chunks into a few requests
+            with chunk_collection.batch.fixed_size(
+                batch_size=self.batch_size,
+                concurrent_requests=self.concurrent_requests
+            ) as batch:
+                for chunk_data in chunks:
+                    batch.add_object(properties=chunk_data)
             
-            # Handle dates
-            if document.get('modified_date'):
-                base_metadata['modified_date'] = self._parse_date(document['modified_date'])
-            
-            # Index each chunk
-            for idx, chunk_text in enumerate(chunks):
-                chunk_data = {
-                    **base_metadata,
-                    'chunk_index': idx,
-                    'content': chunk_text,
-                    'chunk_size': len(chunk_text),
-                    'indexed_at': datetime.utcnow().isoformat() + 'Z'
-                }
-                
-                # Remove None values
-                chunk_data = {k: v for k, v in chunk_data.items() if v is not None}
-                
-                # Insert chunk with retry
-                self._insert_chunk_with_retry(chunk_collection, chunk_data)
+            # Retry anything the batch rejected one by one
+            failed_objects = chunk_collection.batch.failed_objects
+            if failed_objects:
+                logger.warning(f"Retrying {len(failed_objects)} failed chunks for {document.get('name')}")
+                for failure in failed_objects:
+                    self._insert_chunk_with_retry(chunk_collection, failure.object_.properties)
             
             logger.debug(f"Indexed {len(chunks)} chunks for {document.get('name')}")
             
         except Exception as e:
             logger.error(f"Failed to index chunks for {document.get('name')}: {e}")
     
+    async def aindex_document_chunks(self, document: Dict[str, Any]) -> int:
+        """
+        Async version of _index_document_chunks
+        Inserts chunks concurrently (at most CHUNK_INSERT_CONCURRENCY in flight) so
+        their vectorization and write round-trips overlap
+        
+        Args:
+            document: Document with content to chunk
+            
+        Returns:
+            Number of chunks indexed
+        """
+        try:
+            chunks = self._build_chunks(document)
+            if not chunks:
+                return 0
+            
+            client = await self._get_async_client()
+            if client is None:
+                # Fall back to the batched sync path off the event loop
+                await asyncio.to_thread(self._index_document_chunks, document)
+                return len(chunks)
+            
+            chunk_collection = client.collections.get(self.chunk_collection_name)
+            semaphore = asyncio.Semaphore(CHUNK_INSERT_CONCURRENCY)
+            
+            async def insert(chunk_data: Dict[str, Any]):
+                async with semaphore:
+                    return await chunk_collection.data.insert(properties=chunk_data)
+            
+            results = await asyncio.gather(*(insert(chunk) for chunk in chunks), return_exceptions=True)
+            failed = sum(1 for result in results if isinstance(result, Exception))
+            
+            if failed:
+                logger.error(f"Failed to index {failed}/{len(chunks)} chunks for {document.get('name')}")
+            logger.debug(f"Indexed {len(chunks) - failed} chunks for {document.get('name')}")
+            return len(chunks) - failed
+            
+        except Exception as e:
+            logger.error(f"Failed to index chunks for {document.get('name')}: {e}")
+            return 0
+    
+    def _batch_index_chunks(self, documents: List[Dict[str, Any]]) -> None:
+        """
+        Index chunks for several documents with batched inserts
+        
+        Args:
+            documents: Documents with content to chunk
+        """
+        if not documents:
+            return
+        
+        try:
+            chunks = [chunk for document in documents for chunk in self._build_chunks(document)]
+            # Similar lengths per request keep embedding batches from padding to one long chunk
+            chunks.sort(key=lambda chunk: chunk['chunk_size'])
+            
+            chunk_collection = self.client.collections.get(self.chunk_collection_name)
+            failed = 0
+            for start in range(0, len(chunks), CHUNK_INSERT_BATCH_SIZE):
+                response = self._insert_many_with_retry(
+                    chunk_collection, chunks[start:start + CHUNK_INSERT_BATCH_SIZE]
+                )
+                failed += len(response.errors)
+            
+            if failed:
+                logger.error(f"Failed to index {failed}/{len(chunks)} chunks")
+            logger.debug(f"Indexed {len(chunks) - failed} chunks for {len(documents)} documents")
+            
+        except Exception as e:
+            logger.error(f"Failed to batch index chunks for {len(documents)} documents: {e}")
+    
+    def _get_chunk_processor(self):
+        """DocumentProcessor used for chunk_text, created on first use and reused"""
+        if self._chunk_processor is None:
+            from .document_processor import DocumentProcessor
+            self._chunk_processor = DocumentProcessor()
+        return self._chunk_processor
+    
+    def _build_chunks(self, document: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Split a document into chunk objects ready for the chunk collection
+        
+        Args:
+            document: Document with content to chunk
+            
+        Returns:
+            Chunk property dicts
+        """
+        # Use full_text if available (for complete chunking), otherwise fall back to content
+        content = document.get('full_text') or document.get('content', '')
+        chunks = self._get_chunk_processor().chunk_text(content, chunk_size=1000, overlap=200)
+        
+        if not chunks:
+            return []
+        
+        # Prepare metadata that's common to all chunks
+        base_metadata = {
+            'parent_dropbox_id': document.get('id'),
+            'parent_name': document.get('name'),
+            'file_path': document.get('file_path'),
+            'project_name': document.get('project_name'),
+            'contractor': document.get('contractor'),
+            'vendor_name': document.get('vendor_name'),
+            'document_type': document.get('document_type'),
+            'total_chunks': len(chunks)
+        }
+        
+        # Handle dates
+        if document.get('modified_date'):
+            base_metadata['modified_date'] = self._parse_date(document['modified_date'])
+        
+        # Remove None values once; each chunk copies this template and sets
+        # only its own fields (which are never None)
+        template = {k: v for k, v in base_metadata.items() if v is not None}
+        template['indexed_at'] = datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
+        
+        chunk_objects = []
+        for idx, chunk_text in enumerate(chunks):
+            chunk_data = template.copy()
+            chunk_data['chunk_index'] = idx
+            chunk_data['content'] = chunk_text
+            chunk_data['chunk_size'] = len(chunk_text)
+            chunk_objects.append(chunk_data)
+        
+        return chunk_objects
+    
     def _delete_document_chunks(self, dropbox_id: str) -> None:
         """
         Delete all chunks for a document
@@ -523,22 +1239,136 @@ class WeaviateIndexer:
         try:
             chunk_collection = self.client.collections.get(self.chunk_collection_name)
             
-            # Find and delete all chunks for this document
-            response = chunk_collection.query.fetch_objects(
-                filters=Filter.by_property("parent_dropbox_id").equal(dropbox_id),
-                limit=1000
+            # One server-side filtered delete instead of fetching and deleting each chunk
+            result = chunk_collection.data.delete_many(
+                where=Filter.by_property("parent_dropbox_id").equal(dropbox_id),
+                verbose=False
             )
             
-            if response and response.objects:
-                for obj in response.objects:
-                    chunk_collection.data.delete_by_id(str(obj.uuid))
-                logger.debug(f"Deleted {len(response.objects)} chunks for document {dropbox_id}")
+            if result.failed:
+                logger.error(f"Failed to delete {result.failed}/{result.matches} chunks for {dropbox_id}")
+            elif result.successful:
+                logger.debug(f"Deleted {result.successful} chunks for document {dropbox_id}")
                 
         except Exception as e:
             logger.error(f"Failed to delete chunks for {dropbox_id}: {e}")
     
+    def _delete_chunks_for_documents(self, dropbox_ids: List[str]) -> None:
+        """
+        Delete all chunks for several documents in one request
+        
+        Args:
+            dropbox_ids: Dropbox IDs of the parent documents
+        """
+        dropbox_ids = [dropbox_id for dropbox_id in dropbox_ids if dropbox_id]
+        if not dropbox_ids:
+            return
+        
+        try:
+            chunk_collection = self.client.collections.get(self.chunk_collection_name)
+            result = chunk_collection.data.delete_many(
+                where=Filter.any_of([
+                    Filter.by_property("parent_dropbox_id").equal(dropbox_id) for dropbox_id in dropbox_ids
+                ]),
+                verbose=False
+            )
+            if result.failed:
+                logger.error(f"Failed to delete {result.failed}/{result.matches} chunks for {len(dropbox_ids)} documents")
+            else:
+                logger.debug(f"Deleted {result.successful} chunks for {len(dropbox_ids)} documents")
+        except Exception as e:
+            logger.error(f"Failed to delete chunks for {len(dropbox_ids)} documents: {e}")
+    
+    def _count_inserted(self, document_types: Iterable[Optional[str]]) -> None:
+        """Add newly inserted documents to the cached index stats"""
+        stats = self._stats
+        with stats.lock:
+            if stats.doc_count is None:
+                return
+            for document_type in document_types:
+                stats.doc_count += 1
+                stats.type_counts[document_type] += 1
+    
+    def _count_retyped(self, old_type: Optional[str], new_type: Optional[str]) -> None:
+        """Move an updated document between document_type counts"""
+        stats = self._stats
+        with stats.lock:
+            if stats.doc_count is None or old_type == new_type:
+                return
+            stats.type_counts[old_type] -= 1
+            stats.type_counts[new_type] += 1
+    
+    def _types_matching(self, collection, where, limit: int) -> Optional[Counter]:
+        """
+        document_type counts of the Documents a delete is about to remove
+        Only looked up while the cached stats are live
+        
+        Returns:
+            Counter of document types, or None if not tracked or the lookup failed
+        """
+        if self._stats.doc_count is None:
+            return None
+        
+        try:
+            response = collection.query.fetch_objects(
+                filters=where,
+                limit=limit,
+                return_properties=["document_type"],
+                include_vector=False
+            )
+        except Exception as e:
+            logger.debug(f"Could not look up document types before delete: {e}")
+            return None
+        return Counter(obj.properties.get("document_type") for obj in response.objects)
+    
+    def _count_deleted(self, deleting: Optional[Counter], successful: int) -> None:
+        """Remove deleted documents from the cached stats, or drop the stats on a mismatch"""
+        stats = self._stats
+        with stats.lock:
+            if stats.doc_count is None:
+                return
+            if deleting is None or sum(deleting.values()) != successful:
+                stats.doc_count = None
+                return
+            stats.doc_count -= successful
+            stats.type_counts.subtract(deleting)
+    
     def get_index_stats(self) -> Dict[str, Any]:
-        """Get statistics about the index"""
+        """
+        Get statistics about the index
+        Served from counters kept on insert/delete; aggregates on the server only
+        when the counters are cold, invalidated or older than STATS_REFRESH_SECONDS
+        """
+        if not self.client:
+            return {'error': 'No client connection'}
+        
+        with self._stats.lock:
+            doc_count = self._stats.doc_count
+            stale = doc_count is None or time.monotonic() - self._stats.refreshed_at > STATS_REFRESH_SECONDS
+            type_counts = dict(self._stats.type_counts)
+        if stale:
+            return self.refresh_stats()
+        
+        stats = {
+            'total_documents': doc_count,
+            'collection': self.collection_name,
+            'cached': True
+        }
+        document_types = {
+            document_type: count for document_type, count in type_counts.items()
+            if document_type and count > 0
+        }
+        if document_types:
+            stats['document_types'] = document_types
+        return stats
+    
+    def refresh_stats(self) -> Dict[str, Any]:
+        """
+        Recount the index with aggregate queries and reseed the cached counters
+        
+        Returns:
+            Index statistics (with 'cached': False)
+        """
         if not self.client:
             return {'error': 'No client connection'}
         
@@ -548,7 +1378,8 @@ class WeaviateIndexer:
             
             stats = {
                 'total_documents': 0,
-                'collection': self.collection_name
+                'collection': self.collection_name,
+                'cached': False
             }
             
             # Get document count using v4 aggregate API
@@ -564,12 +1395,18 @@ class WeaviateIndexer:
                 group_by=GroupByAggregate(prop="document_type")
             )
             
+            type_counts = Counter()
             if type_aggregate and type_aggregate.groups:
                 stats['document_types'] = {}
                 for group in type_aggregate.groups:
-                    if group.grouped_by and group.grouped_by.get('document_type'):
-                        stats['document_types'][group.grouped_by['document_type']] = group.total_count or 0
+                    if group.grouped_by and group.grouped_by.value:
+                        stats['document_types'][group.grouped_by.value] = group.total_count or 0
+                type_counts.update(stats['document_types'])
             
+            with self._stats.lock:
+                self._stats.doc_count = stats['total_documents']
+                self._stats.type_counts = type_counts
+                self._stats.refreshed_at = time.monotonic()
             return stats
             
         except Exception as e:
@@ -5,8 +5,17 @@ Uses Weaviate v4 best practices with proper filter syntax
 
 import os
 import json
+import hashlib
 import logging
-from typing import List, Dict, Optional, Any
+import queue
+import re
+import sqlite3
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Dict, Optional, Any, Tuple
 from enum import Enum
 from pathlib import Path
 from dotenv import load_dotenv
@@ -19,8 +28,163 @@ from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
 import voyageai
 
+from src.utils.semantic_cache import SemanticCache
+
 logger = logging.getLogger(__name__)
 
+QUERY_EMBEDDING_MODEL = "voyage-3-large"
+
+# Query embeddings kept in memory per agent (the SQLite store holds more)
+EMBEDDING_MEMORY_ENTRIES = 1024
+
+# Micro-batching of concurrent embedding requests into one Voyage call
+EMBED_BATCH_SIZE = 64
+EMBED_BATCH_WINDOW_SECONDS = 0.008
+# Rough token budget per call (~4 characters per token, under the model's request limit)
+EMBED_BATCH_MAX_TOKENS = 100000
+
+# Runs the Company and WorkLog halves of search_hybrid concurrently (the v4 client is thread-safe for reads)
+_HYBRID_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="obsidian-hybrid")
+
+# LLM extractions (service type, service tags) memoized per query string
+LLM_MEMO_SIZE = 2048
+
+# Search results reused for queries whose embeddings are at least this similar
+RESULT_CACHE_THRESHOLD = 0.97
+RESULT_CACHE_ENTRIES = 1024
+
+
+class _EmbeddingStore:
+    """
+    Persistent store of query embeddings backed by SQLite
+    Keys are SHA-256 digests of (model, text); vectors are stored as float32 bytes
+    """
+    
+    def __init__(self, path: str, max_entries: int = 50000):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (hash BLOB PRIMARY KEY, vec BLOB NOT NULL)"
+        )
+        self._conn.commit()
+    
+    @staticmethod
+    def make_key(model: str, text: str) -> bytes:
+        """Hash the embedding inputs into a fixed-size cache key"""
+        return hashlib.sha256(f"{model}\x00{text}".encode("utf-8")).digest()
+    
+    def get(self, key: bytes) -> Optional[List[float]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT vec FROM embeddings WHERE hash = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return array("f", row[0]).tolist()
+    
+    def set(self, key: bytes, vector: List[float]) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO embeddings (hash, vec) VALUES (?, ?)",
+                (key, array("f", vector).tobytes())
+            )
+            # Drop the oldest rows beyond the size limit
+            self._conn.execute(
+                "DELETE FROM embeddings WHERE rowid IN ("
+                "SELECT rowid FROM embeddings ORDER BY rowid DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+            self._conn.commit()
+
+
+class _EmbeddingBatcher:
+    """
+    Coalesces embed requests from concurrent threads into batched Voyage calls
+    A background thread collects requests arriving within EMBED_BATCH_WINDOW_SECONDS
+    (up to EMBED_BATCH_SIZE texts or EMBED_BATCH_MAX_TOKENS) and embeds them together
+    """
+    
+    def __init__(self, voyage_client, model: str):
+        self.voyage_client = voyage_client
+        self.model = model
+        self._queue: "queue.Queue[Tuple[str, Future]]" = queue.Queue()
+        self._carry: Optional[Tuple[str, Future]] = None
+        self._worker: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+    
+    def embed(self, text: str) -> List[float]:
+        """Embed one query text, blocking until its batch returns"""
+        future: Future = Future()
+        self._queue.put((text, future))
+        if self._worker is None:
+            with self._start_lock:
+                if self._worker is None:
+                    self._worker = threading.Thread(target=self._run, name="voyage-embed-batcher", daemon=True)
+                    self._worker.start()
+        return future.result()
+    
+    @staticmethod
+    def _estimate_tokens(text: str) -> int:
+        return len(text) // 4 + 1
+    
+    def _next_batch(self) -> List[Tuple[str, Future]]:
+        """Block for the first request, then gather more until the window closes"""
+        batch = [self._carry] if self._carry else [self._queue.get()]
+        self._carry = None
+        tokens = self._estimate_tokens(batch[0][0])
+        deadline = time.monotonic() + EMBED_BATCH_WINDOW_SECONDS
+        while len(batch) < EMBED_BATCH_SIZE:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            tokens += self._estimate_tokens(item[0])
+            if tokens > EMBED_BATCH_MAX_TOKENS:
+                # Starts the next batch
+                self._carry = item
+                break
+            batch.append(item)
+        return batch
+    
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            # Identical texts in one window share a single input
+            texts = list(dict.fromkeys(text for text, _ in batch))
+            try:
+                response = self.voyage_client.embed(texts, model=self.model, input_type="query")
+                vectors = dict(zip(texts, response.embeddings))
+                for text, future in batch:
+                    future.set_result(vectors[text])
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+            if len(batch) > 1:
+                logger.debug(f"Embedded {len(texts)} queries for {len(batch)} requests in one call")
+
+
+_embedding_store = None
+
+
+def _get_embedding_store() -> Optional[_EmbeddingStore]:
+    """Get or create the shared embedding store (None if it cannot be opened)"""
+    global _embedding_store
+    if _embedding_store is None:
+        path = os.getenv("EMBEDDING_CACHE_PATH", ".cache/query_embeddings.sqlite3")
+        try:
+            _embedding_store = _EmbeddingStore(path)
+        except Exception as e:
+            logger.warning(f"Query embedding cache disabled: {e}")
+            return None
+    return _embedding_store
+
+
 class QueryType(Enum):
     """Types of queries we handle"""
     LIST_ALL = "list_all"        # "list all X suppliers"
@@ -32,23 +196,52 @@ class AtomicDocumentAgent:
     """Document agent with clean 3-stage architecture"""
     
     def generate_embedding(self, text: str) -> List[float]:
-        """Generate embedding using Voyage AI"""
+        """
+        Generate embedding using Voyage AI
+        Repeated texts are served from the in-memory LRU, then the SQLite store
+        """
         if not hasattr(self, 'voyage_client') or not self.voyage_client:
             return None
-        try:
-            response = self.voyage_client.embed(
-                [text],
-                model="voyage-3-large",
-                input_type="query"  # Use query type for search
-            )
-            return response.embeddings[0]
-        except Exception as e:
-            logger.warning(f"Failed to generate embedding: {e}")
-            return None
+        
+        key = _EmbeddingStore.make_key(QUERY_EMBEDDING_MODEL, text)
+        with self._embed_lock:
+            vector = self._embed_cache.get(key)
+            if vector is not None:
+                self._embed_cache.move_to_end(key)
+                return vector
+        
+        store = _get_embedding_store()
+        vector = store.get(key) if store else None
+        if vector is None:
+            try:
+                # Batched with concurrent callers' queries (input_type="query")
+                vector = self._embed_batcher.embed(text)
+            except Exception as e:
+                logger.warning(f"Failed to generate embedding: {e}")
+                return None
+            if store:
+                try:
+                    store.set(key, vector)
+                except Exception as e:
+                    logger.warning(f"Failed to cache embedding: {e}")
+        
+        with self._embed_lock:
+            self._embed_cache[key] = vector
+            if len(self._embed_cache) > EMBEDDING_MEMORY_ENTRIES:
+                self._embed_cache.popitem(last=False)
+        return vector
     
     def __init__(self):
         load_dotenv()
         
+        # Query embeddings by SHA-256 of the text, most recently used last
+        self._embed_cache: "OrderedDict[bytes, List[float]]" = OrderedDict()
+        self._embed_lock = threading.Lock()
+        
+        # LLM extractions by (kind, query), most recently used last
+        self._llm_memo: "OrderedDict[Tuple[str, str], Any]" = OrderedDict()
+        self._llm_memo_lock = threading.Lock()
+        
         # Connect to Weaviate 
         try:
             weaviate_url = os.getenv("WEAVIATE_URL")
@@ -91,12 +284,24 @@ class AtomicDocumentAgent:
         voyage_api_key = os.getenv('VOYAGE_API_KEY')
         if voyage_api_key:
             self.voyage_client = voyageai.Client(api_key=voyage_api_key)
+            self._embed_batcher = _EmbeddingBatcher(self.voyage_client, QUERY_EMBEDDING_MODEL)
             self.rerank_model = "rerank-2.5"
             logger.info("Voyage reranking enabled")
         else:
             self.voyage_client = None
             logger.info("Voyage reranking not available")
         
+        # Search results keyed by query embedding, so paraphrased queries skip Weaviate
+        self.result_cache = None
+        if self.voyage_client:
+            try:
+                self.result_cache = SemanticCache(
+                    max_entries=RESULT_CACHE_ENTRIES,
+                    threshold=RESULT_CACHE_THRESHOLD
+                )
+            except Exception as e:
+                logger.warning(f"Semantic result cache disabled: {e}")
+        
         # Load service tags for intelligent mapping
         self.service_tags = self._load_service_tags()
         
@@ -123,6 +328,38 @@ class AtomicDocumentAgent:
         
         logger.info("Atomic Document Agent v4 initialized")
     
+    def _cached_results(self, vector: Optional[List[float]], namespace: str) -> Optional[List[Dict]]:
+        """Results cached for a near-identical query in the same namespace, or None"""
+        if not self.result_cache or not vector:
+            return None
+        cached = self.result_cache.lookup(vector, namespace)
+        if cached is None:
+            return None
+        logger.info(f"[RESULT CACHE] Hit for {namespace}")
+        # Copies: callers annotate result dicts (e.g. relevance_score)
+        return [dict(result) for result in cached]
+    
+    def _cache_results(self, vector: Optional[List[float]], namespace: str, results: List[Dict]) -> None:
+        """Cache search results under the query embedding"""
+        if self.result_cache and vector:
+            self.result_cache.store(vector, [dict(result) for result in results], namespace)
+    
+    def _memo_get(self, kind: str, query: str) -> Optional[Any]:
+        """Memoized LLM extraction for a query, or None"""
+        key = (kind, query)
+        with self._llm_memo_lock:
+            value = self._llm_memo.get(key)
+            if value is not None:
+                self._llm_memo.move_to_end(key)
+            return value
+    
+    def _memo_put(self, kind: str, query: str, value: Any) -> None:
+        """Memoize an LLM extraction (the prompts are deterministic in the query)"""
+        with self._llm_memo_lock:
+            self._llm_memo[(kind, query)] = value
+            if len(self._llm_memo) > LLM_MEMO_SIZE:
+                self._llm_memo.popitem(last=False)
+    
     def _load_service_tags(self) -> List[str]:
         """Load service tags from JSON file"""
         tags_file = Path(__file__).parent / 'service_tags.json'
@@ -188,6 +425,11 @@ class AtomicDocumentAgent:
         if not self.service_tags:
             return []
         
+        cached = self._memo_get("service_tags", query)
+        if cached is not None:
+            logger.info(f"Mapped '{query}' to tags (cached): {list(cached)}")
+            return list(cached)
+        
         prompt = f"""Map this user query to the exact service tags from the list below.
 User Query: "{query}"
 
@@ -210,7 +452,6 @@ Tags:"""
         try:
             response = self.llm.invoke(prompt)
             # Parse the response to get tags
-            import re
             # Extract JSON array from response
             match = re.search(r'\[.*?\]', response.content, re.DOTALL)
             if match:
@@ -218,6 +459,7 @@ Tags:"""
                 # Filter to ensure only valid tags
                 valid_tags = [tag for tag in tags if tag in self.service_tags]
                 logger.info(f"Mapped '{query}' to tags: {valid_tags}")
+                self._memo_put("service_tags", query, tuple(valid_tags))
                 return valid_tags
         except Exception as e:
             logger.warning(f"Failed to extract service tags: {e}")
@@ -245,9 +487,12 @@ Examples: door, plumbing, glass, electrical, concrete
 Service:"""
             
             try:
-                # Quick LLM extraction using the existing self.llm
-                response = self.llm.invoke(extraction_prompt)
-                service = response.content.strip().lower()
+                # Quick LLM extraction using the existing self.llm (memoized per query)
+                service = self._memo_get("service", query)
+                if service is None:
+                    response = self.llm.invoke(extraction_prompt)
+                    service = response.content.strip().lower()
+                    self._memo_put("service", query, service)
                 
                 # Clean up common words that aren't services
                 if service and service not in ["companies", "all", "that", "provide", "services", "none", ""]:
@@ -292,41 +537,49 @@ Service:"""
         """Search for companies with exact service tag matches"""
         logger.info(f"[EXACT TAG SEARCH] Searching for tags: {tags}")
         
+        if not tags:
+            return []
+        
         all_results = []
         seen_companies = set()
         
-        for tag in tags:
-            try:
-                # Get ALL companies with this exact tag
-                response = self.company.query.fetch_objects(
-                    limit=200,  # Get all matches
-                    return_properties=["company", "services", "office_phone", "mobile_phone", 
-                                     "email", "phone_e164", "email_lower", "entity_uid", "hired"]
-                )
+        try:
+            # One server-side filter for all tags; services is word-tokenized, so
+            # contains_any can also match on shared words and exact matching stays below
+            response = self.company.query.fetch_objects(
+                filters=Filter.by_property("services").contains_any(tags),
+                limit=len(tags) * 200,
+                return_properties=["company", "services", "office_phone", "mobile_phone", 
+                                 "email", "phone_e164", "email_lower", "entity_uid", "hired"]
+            )
+            
+            for obj in response.objects:
+                company_name = obj.properties.get("company", "")
+                services = obj.properties.get("services", [])
                 
-                for obj in response.objects:
-                    company_name = obj.properties.get("company", "")
-                    services = obj.properties.get("services", [])
+                # Check for exact match (first matching tag in the requested order)
+                tag = next((tag for tag in tags if tag in services), None)
+                if tag is not None and company_name not in seen_companies:
+                    seen_companies.add(company_name)
                     
-                    # Check for exact match
-                    if tag in services and company_name not in seen_companies:
-                        seen_companies.add(company_name)
-                        
-                        result = {
-                            "company": company_name,
-                            "services": services,
-                            "phone": obj.properties.get("office_phone", "") or obj.properties.get("mobile_phone", ""),
-                            "phone_e164": obj.properties.get("phone_e164", ""),
-                            "email": obj.properties.get("email", []),
-                            "email_lower": obj.properties.get("email_lower", []),
-                            "entity_uid": obj.properties.get("entity_uid", ""),
-                            "hired": obj.properties.get("hired", False),
-                            "matched_tag": tag  # Track which tag matched
-                        }
-                        all_results.append(result)
-                        
-            except Exception as e:
-                logger.error(f"[EXACT TAG SEARCH] Error searching for '{tag}': {e}")
+                    result = {
+                        "company": company_name,
+                        "services": services,
+                        "phone": obj.properties.get("office_phone", "") or obj.properties.get("mobile_phone", ""),
+                        "phone_e164": obj.properties.get("phone_e164", ""),
+                        "email": obj.properties.get("email", []),
+                        "email_lower": obj.properties.get("email_lower", []),
+                        "entity_uid": obj.properties.get("entity_uid", ""),
+                        "hired": obj.properties.get("hired", False),
+                        "matched_tag": tag  # Track which tag matched
+                    }
+                    all_results.append(result)
+                    
+        except Exception as e:
+            logger.error(f"[EXACT TAG SEARCH] Error searching for {tags}: {e}")
+        
+        # Group by tag in the requested order
+        all_results.sort(key=lambda x: tags.index(x["matched_tag"]))
         
         # Sort by hired status (hired companies first)
         all_results.sort(key=lambda x: x.get("hired", False), reverse=True)
@@ -358,42 +611,49 @@ Service:"""
         all_results = []
         seen_companies = set()
         
-        for term in search_terms:
-            try:
-                # Try case-insensitive contains for each term
-                # This ensures we get ALL companies with the service
-                response = self.company.query.fetch_objects(
-                    limit=limit,
-                    return_properties=["company", "services", "office_phone", "mobile_phone", 
-                                     "email", "phone_e164", "email_lower", "entity_uid", "hired"]
-                )
+        # Any substring match on a service contains each word of the term inside one
+        # of the service's tokens, so a wildcard filter per word narrows the fetch
+        # server-side without losing matches
+        words = {word for term in search_terms for word in re.findall(r"[a-z0-9]+", term)}
+        filters = Filter.any_of([
+            Filter.by_property("services").like(f"*{word}*") for word in sorted(words)
+        ]) if words else None
+        
+        try:
+            response = self.company.query.fetch_objects(
+                filters=filters,
+                limit=limit,
+                return_properties=["company", "services", "office_phone", "mobile_phone", 
+                                 "email", "phone_e164", "email_lower", "entity_uid", "hired"]
+            )
+            
+            # Filter results that contain a service term
+            for obj in response.objects:
+                company_name = obj.properties.get("company", "")
+                services = obj.properties.get("services", [])
+                
+                # Check if any service matches a search term (case-insensitive)
+                services_lower = [str(svc).lower() for svc in services]
+                service_match = any(term in svc for term in search_terms for svc in services_lower)
                 
-                # Filter results that contain the service term
-                for obj in response.objects:
-                    company_name = obj.properties.get("company", "")
-                    services = obj.properties.get("services", [])
+                if service_match and company_name not in seen_companies:
+                    seen_companies.add(company_name)
                     
-                    # Check if any service matches our search term (case-insensitive)
-                    service_match = any(term.lower() in str(svc).lower() for svc in services)
+                    # Include normalized fields for integrations
+                    result = {
+                        "company": company_name,
+                        "services": services,
+                        "phone": obj.properties.get("office_phone", "") or obj.properties.get("mobile_phone", ""),
+                        "phone_e164": obj.properties.get("phone_e164", ""),
+                        "email": obj.properties.get("email", []),
+                        "email_lower": obj.properties.get("email_lower", []),
+                        "entity_uid": obj.properties.get("entity_uid", ""),
+                        "hired": obj.properties.get("hired", False)
+                    }
+                    all_results.append(result)
                     
-                    if service_match and company_name not in seen_companies:
-                        seen_companies.add(company_name)
-                        
-                        # Include normalized fields for integrations
-                        result = {
-                            "company": company_name,
-                            "services": services,
-                            "phone": obj.properties.get("office_phone", "") or obj.properties.get("mobile_phone", ""),
-                            "phone_e164": obj.properties.get("phone_e164", ""),
-                            "email": obj.properties.get("email", []),
-                            "email_lower": obj.properties.get("email_lower", []),
-                            "entity_uid": obj.properties.get("entity_uid", ""),
-                            "hired": obj.properties.get("hired", False)
-                        }
-                        all_results.append(result)
-                        
-            except Exception as e:
-                logger.error(f"[FILTER SEARCH - Company] Error searching for '{term}': {e}")
+        except Exception as e:
+            logger.error(f"[FILTER SEARCH - Company] Error searching for {search_terms}: {e}")
         
         # Sort by hired status (hired companies first)
         all_results.sort(key=lambda x: x.get("hired", False), reverse=True)
@@ -429,6 +689,10 @@ Service:"""
                 # No hardcoded service list needed - let semantic search handle it
                 # Generate vector for hybrid search since we use custom vectors
                 vector = self.generate_embedding(query_text)
+                cache_namespace = f"WorkLog|{full_project}|0.7"
+                cached = self._cached_results(vector, cache_namespace)
+                if cached is not None:
+                    return cached
                 if vector:
                     response = self.worklog.query.hybrid(
                         query=query_text,
@@ -481,6 +745,8 @@ Service:"""
             if results:
                 logger.info(f"[WORKLOG SEARCH] Companies found: {[r['company'] for r in results[:3]]}")
             
+            if query_text:
+                self._cache_results(vector, cache_namespace, results)
             return results
         except Exception as e:
             logger.error(f"[WORKLOG SEARCH] FAILED: {e}")
@@ -514,6 +780,83 @@ Service:"""
             logger.error(f"[EXACT SEARCH - Company] FAILED: {e}")
             return None
     
+    def _hybrid_search_company(self, query: str, vector: Optional[List[float]], alpha: float, limit: int) -> List[Dict]:
+        """Company half of search_hybrid"""
+        results = []
+        logger.info(f"[HYBRID SEARCH - Company] Limit: {limit}")
+        if vector:
+            response = self.company.query.hybrid(
+                query=query,
+                vector=vector,  # Provide the vector explicitly
+                alpha=alpha,  # Use dynamic alpha based on query type
+                limit=limit,
+                return_properties=["company", "services", "office_phone", "mobile_phone", "email"],
+                return_metadata=MetadataQuery(score=True)
+            )
+        else:
+            # Fallback to keyword search if embedding fails
+            logger.warning("[COMPANY SEARCH] Failed to generate embedding, using BM25 search")
+            response = self.company.query.bm25(
+                query=query,
+                limit=limit,
+                return_properties=["company", "services", "office_phone", "mobile_phone", "email"],
+                return_metadata=MetadataQuery(score=True)
+            )
+        
+        for obj in response.objects:
+            result = {
+                "company": obj.properties.get("company", ""),
+                "services": obj.properties.get("services", []),
+                "phone": obj.properties.get("office_phone", "") or obj.properties.get("mobile_phone", ""),
+                "email": obj.properties.get("email", []),
+                "score": obj.metadata.score,
+                "_source": "Company"
+            }
+            results.append(result)
+        
+        return results
+    
+    def _hybrid_search_worklog(self, query: str, vector: Optional[List[float]], alpha: float, limit: int) -> List[Dict]:
+        """WorkLog half of search_hybrid (performance notes and project data)"""
+        results = []
+        logger.info(f"[HYBRID SEARCH - WorkLog] Limit: {limit}")
+        if vector:
+            response = self.worklog.query.hybrid(
+                query=query,
+                vector=vector,  # Provide the vector explicitly
+                alpha=alpha,  # Use dynamic alpha based on query type
+                limit=limit,
+                return_properties=["company", "project", "scope", "tags", "cost", "status", "rehire", "performance_notes", "knowledge_gained"],
+                return_metadata=MetadataQuery(score=True)
+            )
+        else:
+            # Fallback to BM25 if embedding fails
+            logger.warning("[WORKLOG SEARCH] Failed to generate embedding, using BM25 search")
+            response = self.worklog.query.bm25(
+                query=query,
+                limit=limit,
+                return_properties=["company", "project", "scope", "tags", "cost", "status", "rehire", "performance_notes", "knowledge_gained"],
+                return_metadata=MetadataQuery(score=True)
+            )
+        
+        for obj in response.objects:
+            result = {
+                "company": obj.properties.get("company", ""),
+                "project": obj.properties.get("project", ""),
+                "scope": obj.properties.get("scope", []),
+                "cost": obj.properties.get("cost", ""),
+                "status": obj.properties.get("status", ""),
+                "rehire": obj.properties.get("rehire", ""),
+                "performance_notes": obj.properties.get("performance_notes", []),
+                "knowledge_gained": obj.properties.get("knowledge_gained", ""),
+                "score": obj.metadata.score,
+                "_source": "WorkLog"
+            }
+            
+            results.append(result)
+        
+        return results
+    
     def search_hybrid(self, query: str, limit: int = 10) -> List[Dict]:
         """Hybrid search across BOTH Company and WorkLog collections for general queries"""
         # If query looks like a service search, prioritize keyword matches
@@ -527,90 +870,29 @@ Service:"""
         logger.info(f"[HYBRID SEARCH] Query: '{query}' with alpha={alpha} ({'keyword-focused' if is_service_query else 'balanced'})")
         logger.info(f"[HYBRID SEARCH] Searching both Company and WorkLog collections")
         
-        all_results = []
+        # Embedded once for the result cache and both collections
+        query_vector = self.generate_embedding(query)
+        cache_namespace = f"Company+WorkLog|{round(alpha, 1)}|{limit}"
+        cached = self._cached_results(query_vector, cache_namespace)
+        if cached is not None:
+            return cached
         
-        # Search Company collection
-        try:
-            logger.info(f"[HYBRID SEARCH - Company] Limit: {limit}")
-            # Generate vector for hybrid search
-            vector = self.generate_embedding(query)
-            if vector:
-                response = self.company.query.hybrid(
-                    query=query,
-                    vector=vector,  # Provide the vector explicitly
-                    alpha=alpha,  # Use dynamic alpha based on query type
-                    limit=limit,
-                    return_properties=["company", "services", "office_phone", "mobile_phone", "email"],
-                    return_metadata=MetadataQuery(score=True)
-                )
-            else:
-                # Fallback to keyword search if embedding fails
-                logger.warning("[COMPANY SEARCH] Failed to generate embedding, using BM25 search")
-                response = self.company.query.bm25(
-                    query=query,
-                    limit=limit,
-                    return_properties=["company", "services", "office_phone", "mobile_phone", "email"],
-                    return_metadata=MetadataQuery(score=True)
-                )
-            
-            for obj in response.objects:
-                result = {
-                    "company": obj.properties.get("company", ""),
-                    "services": obj.properties.get("services", []),
-                    "phone": obj.properties.get("office_phone", "") or obj.properties.get("mobile_phone", ""),
-                    "email": obj.properties.get("email", []),
-                    "score": obj.metadata.score,
-                    "_source": "Company"
-                }
-                all_results.append(result)
-            
-            logger.info(f"[HYBRID SEARCH - Company] Found {len(all_results)} results")
-        except Exception as e:
-            logger.error(f"[HYBRID SEARCH - Company] Error: {e}")
-        
-        # Also search WorkLog collection for performance notes and project data
-        try:
-            logger.info(f"[HYBRID SEARCH - WorkLog] Limit: {limit}")
-            # Generate vector for hybrid search
-            vector = self.generate_embedding(query)
-            if vector:
-                response = self.worklog.query.hybrid(
-                    query=query,
-                    vector=vector,  # Provide the vector explicitly
-                    alpha=alpha,  # Use dynamic alpha based on query type
-                    limit=limit,
-                    return_properties=["company", "project", "scope", "tags", "cost", "status", "rehire", "performance_notes", "knowledge_gained"],
-                    return_metadata=MetadataQuery(score=True)
-                )
-            else:
-                # Fallback to BM25 if embedding fails
-                logger.warning("[WORKLOG SEARCH] Failed to generate embedding, using BM25 search")
-                response = self.worklog.query.bm25(
-                    query=query,
-                    limit=limit,
-                    return_properties=["company", "project", "scope", "tags", "cost", "status", "rehire", "performance_notes", "knowledge_gained"],
-                    return_metadata=MetadataQuery(score=True)
-                )
-            
-            for obj in response.objects:
-                result = {
-                    "company": obj.properties.get("company", ""),
-                    "project": obj.properties.get("project", ""),
-                    "scope": obj.properties.get("scope", []),
-                    "cost": obj.properties.get("cost", ""),
-                    "status": obj.properties.get("status", ""),
-                    "rehire": obj.properties.get("rehire", ""),
-                    "performance_notes": obj.properties.get("performance_notes", []),
-                    "knowledge_gained": obj.properties.get("knowledge_gained", ""),
-                    "score": obj.metadata.score,
-                    "_source": "WorkLog"
-                }
-                
-                all_results.append(result)
-            
-            logger.info(f"[HYBRID SEARCH - WorkLog] Found {len([r for r in all_results if r['_source'] == 'WorkLog'])} results")
-        except Exception as e:
-            logger.error(f"[HYBRID SEARCH - WorkLog] Error: {e}")
+        all_results = []
+        search_failed = False
+        
+        # Company and WorkLog queries are independent; run them concurrently
+        futures = {
+            "Company": _HYBRID_EXECUTOR.submit(self._hybrid_search_company, query, query_vector, alpha, limit),
+            "WorkLog": _HYBRID_EXECUTOR.submit(self._hybrid_search_worklog, query, query_vector, alpha, limit)
+        }
+        for source, future in futures.items():
+            try:
+                results = future.result()
+                all_results.extend(results)
+                logger.info(f"[HYBRID SEARCH - {source}] Found {len(results)} results")
+            except Exception as e:
+                logger.error(f"[HYBRID SEARCH - {source}] Error: {e}")
+                search_failed = True
         
         # Merge and deduplicate results, combining data from both sources
         merged_results = {}
@@ -657,6 +939,9 @@ Service:"""
             logger.info(f"[HYBRID SEARCH] Top 3 scores: {scores}")
             logger.info(f"[HYBRID SEARCH] Top 3 companies: {companies}")
         
+        # Partial results from a failed collection are not worth reusing
+        if not search_failed:
+            self._cache_results(query_vector, cache_namespace, results)
         return results
     
     # Stage 3: Result Validation & Formatting
@@ -4,6 +4,8 @@ Utility modules for NORTH AI system
 
 from .crypto_utils import SecureTokenManager, get_secure_token_manager, secure_getenv, validate_dropbox_config
 from .rate_limiter import RateLimiter, get_dropbox_rate_limiter, get_general_rate_limiter
+from .bloom_filter import BloomFilter
+from .semantic_cache import SemanticCache
 
 __all__ = [
     'SecureTokenManager',
@@ -12,5 +14,7 @@ __all__ = [
     'validate_dropbox_config',
     'RateLimiter',
     'get_dropbox_rate_limiter',
-    'get_general_rate_limiter'
+    'get_general_rate_limiter',
+    'BloomFilter',
+    'SemanticCache'
 ]
\ No newline at end of file
@@ -0,0 +1,106 @@
+"""
+Bloom filter for cheap "definitely not seen" membership checks
+"""
+
+import hashlib
+import math
+import struct
+from typing import Iterable, Tuple
+
+# Serialized header: number of bits, number of hash functions
+_HEADER = struct.Struct("<QI")
+
+_LOW_64 = (1 << 64) - 1
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings
+    False positives are possible (tuned by error_rate); false negatives are not
+    """
+    
+    def __init__(self, capacity: int = 100_000, error_rate: float = 0.01):
+        """
+        Initialize an empty filter (about 120 KB at the default capacity)
+        
+        Args:
+            capacity: Expected number of distinct items
+            error_rate: Target false-positive rate at capacity
+        """
+        self.num_bits = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+    
+    @classmethod
+    def from_items(cls, items: Iterable[str], capacity: int, error_rate: float = 0.01) -> "BloomFilter":
+        """Build a filter pre-populated with items"""
+        bloom = cls(capacity, error_rate)
+        for item in items:
+            bloom.add(item)
+        return bloom
+    
+    def _probe(self, item: str) -> Tuple[int, int]:
+        """
+        First probe position and stride for item
+        Double hashing over one 128-bit digest: probe i is (h1 + i * h2) % num_bits,
+        walked by adding the stride instead of multiplying per probe
+        """
+        h = int.from_bytes(hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest(), 'little')
+        num_bits = self.num_bits
+        return (h & _LOW_64) % num_bits, ((h >> 64) | 1) % num_bits
+    
+    def __contains__(self, item: str) -> bool:
+        pos, step = self._probe(item)
+        bits, num_bits = self.bits, self.num_bits
+        for _ in range(self.num_hashes):
+            if not bits[pos >> 3] & (1 << (pos & 7)):
+                return False
+            pos += step
+            if pos >= num_bits:
+                pos -= num_bits
+        return True
+    
+    def add(self, item: str) -> None:
+        pos, step = self._probe(item)
+        bits, num_bits = self.bits, self.num_bits
+        for _ in range(self.num_hashes):
+            bits[pos >> 3] |= 1 << (pos & 7)
+            pos += step
+            if pos >= num_bits:
+                pos -= num_bits
+    
+    def check_and_add(self, item: str) -> bool:
+        """
+        Add item, reporting whether it was (probably) present already
+        Hashes once and tests and sets the probe bits in the same pass
+        """
+        pos, step = self._probe(item)
+        bits, num_bits = self.bits, self.num_bits
+        present = True
+        for _ in range(self.num_hashes):
+            byte, mask = pos >> 3, 1 << (pos & 7)
+            if not bits[byte] & mask:
+                present = False
+                bits[byte] |= mask
+            pos += step
+            if pos >= num_bits:
+                pos -= num_bits
+        return present
+    
+    def to_bytes(self) -> bytes:
+        """Serialize the filter (header + bit array)"""
+        return _HEADER.pack(self.num_bits, self.num_hashes) + bytes(self.bits)
+    
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "BloomFilter":
+        """Restore a filter produced by to_bytes"""
+        num_bits, num_hashes = _HEADER.unpack_from(data, 0)
+        bits = bytearray(data[_HEADER.size:])
+        if len(bits) != (num_bits + 7) // 8:
+            raise ValueError("Corrupt bloom filter data")
+        
+        bloom = cls.__new__(cls)
+        bloom.num_bits = num_bits
+        bloom.num_hashes = num_hashes
+        bloom.bits = bits
+        return bloom
@@ -0,0 +1,216 @@
+"""
+Semantic cache for search results (Dropbox and Obsidian agents)
+Reuses search results for near-identical queries by comparing query embeddings
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, List, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+
+def _encode(value: Any) -> bytes:
+    """Serialize a cached value to compressed JSON, using orjson when available"""
+    if orjson is not None:
+        data = orjson.dumps(value, default=str)
+    else:
+        data = json.dumps(value, default=str).encode("utf-8")
+    return zlib.compress(data)
+
+
+def _decode(payload: bytes) -> Any:
+    """Inverse of _encode"""
+    data = zlib.decompress(payload)
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+class SemanticCache:
+    """
+    Cache of search results keyed by query embedding
+    A lookup hits when a cached query in the same namespace has cosine
+    similarity >= threshold and has not expired
+    
+    With a path, entries are also written to SQLite so they survive restarts
+    and are shared between processes using the same file
+    """
+    
+    def __init__(self, max_entries: int = 512, ttl_seconds: float = 600, threshold: float = 0.95,
+                 path: Optional[str] = None):
+        """
+        Initialize the cache, loading unexpired entries from disk if a path is given
+        
+        Args:
+            max_entries: Entries kept before the oldest is evicted
+            ttl_seconds: Lifetime of an entry
+            threshold: Minimum cosine similarity for a hit
+            path: Optional SQLite file backing the cache
+        """
+        if np is None:
+            raise ImportError("numpy is required for SemanticCache")
+        
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        
+        # Row i of _vectors (unit-normalized) belongs to _namespaces[i] / _values[i]
+        self._vectors: Optional[np.ndarray] = None
+        self._namespaces: List[str] = []
+        self._created: List[float] = []
+        self._values: List[Any] = []
+        
+        # Highest SQLite rowid already loaded into memory
+        self._conn: Optional[sqlite3.Connection] = None
+        self._last_rowid = 0
+        if path:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache "
+                "(namespace TEXT NOT NULL, embedding BLOB NOT NULL, results BLOB NOT NULL, ts REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS cache_ts ON cache (ts)")
+            self._conn.commit()
+            with self._lock:
+                self._load_new_rows()
+    
+    @staticmethod
+    def _normalize(vector: Sequence[float]) -> "np.ndarray":
+        arr = np.asarray(vector, dtype=np.float32)
+        norm = float(np.linalg.norm(arr))
+        return arr / norm if norm else arr
+    
+    def lookup(self, vector: Sequence[float], namespace: str = "") -> Optional[Any]:
+        """
+        Find the cached value for the most similar query
+        
+        Args:
+            vector: Query embedding
+            namespace: Cache partition (e.g. user or workspace)
+        
+        Returns:
+            Cached value, or None on a miss
+        """
+        query = self._normalize(vector)
+        with self._lock:
+            # Pick up entries written by other processes since the last lookup
+            if self._conn is not None:
+                self._load_new_rows()
+            self._expire()
+            if self._vectors is None or not self._values:
+                return None
+            
+            sims = self._vectors @ query
+            for i in np.argsort(sims)[::-1]:
+                if sims[i] < self.threshold:
+                    return None
+                if self._namespaces[i] == namespace:
+                    return self._values[i]
+            return None
+    
+    def store(self, vector: Sequence[float], value: Any, namespace: str = "") -> None:
+        """
+        Cache a value under a query embedding
+        
+        Args:
+            vector: Query embedding
+            value: Value to return on later hits (must be JSON-serializable when persisted)
+            namespace: Cache partition (e.g. user or workspace)
+        """
+        row = self._normalize(vector)
+        now = time.time()
+        with self._lock:
+            if self._conn is not None:
+                # Load other processes' rows first so none fall below _last_rowid unseen
+                self._load_new_rows()
+                self._persist(row, value, namespace, now)
+            self._expire()
+            self._append(row, value, namespace, now)
+    
+    def clear(self) -> None:
+        """Drop every entry (including persisted ones)"""
+        with self._lock:
+            self._vectors = None
+            self._namespaces, self._created, self._values = [], [], []
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM cache")
+                self._conn.commit()
+    
+    def _append(self, row: "np.ndarray", value: Any, namespace: str, created: float) -> None:
+        """Add one in-memory entry, evicting the oldest beyond max_entries"""
+        if len(self._values) >= self.max_entries:
+            self._drop(slice(0, len(self._values) - self.max_entries + 1))
+        
+        row = row[np.newaxis, :]
+        self._vectors = row if self._vectors is None else np.vstack([self._vectors, row])
+        self._namespaces.append(namespace)
+        self._created.append(created)
+        self._values.append(value)
+    
+    def _persist(self, row: "np.ndarray", value: Any, namespace: str, created: float) -> None:
+        """Write an entry to SQLite and prune expired/excess rows"""
+        try:
+            payload = _encode(value)
+            cursor = self._conn.execute(
+                "INSERT INTO cache (namespace, embedding, results, ts) VALUES (?, ?, ?, ?)",
+                (namespace, row.tobytes(), payload, created)
+            )
+            self._last_rowid = max(self._last_rowid, cursor.lastrowid)
+            self._conn.execute("DELETE FROM cache WHERE ts < ?", (created - self.ttl_seconds,))
+            self._conn.execute(
+                "DELETE FROM cache WHERE rowid IN ("
+                "SELECT rowid FROM cache ORDER BY rowid DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+            self._conn.commit()
+        except Exception as e:
+            logger.warning(f"Failed to persist semantic cache entry: {e}")
+    
+    def _load_new_rows(self) -> None:
+        """Load unexpired rows added to SQLite since the last load"""
+        try:
+            rows = self._conn.execute(
+                "SELECT rowid, namespace, embedding, results, ts FROM cache "
+                "WHERE rowid > ? AND ts >= ? ORDER BY rowid",
+                (self._last_rowid, time.time() - self.ttl_seconds)
+            ).fetchall()
+        except Exception as e:
+            logger.warning(f"Failed to read semantic cache: {e}")
+            return
+        
+        for rowid, namespace, embedding, results, created in rows:
+            self._last_rowid = rowid
+            vector = np.frombuffer(embedding, dtype=np.float32)
+            if self._vectors is not None and vector.shape[0] != self._vectors.shape[1]:
+                continue
+            self._append(vector, _decode(results), namespace, created)
+    
+    def _expire(self) -> None:
+        """Drop entries past their TTL (entries are kept in insertion order)"""
+        cutoff = time.time() - self.ttl_seconds
+        expired = 0
+        while expired < len(self._created) and self._created[expired] < cutoff:
+            expired += 1
+        if expired:
+            self._drop(slice(0, expired))
+    
+    def _drop(self, rows: slice) -> None:
+        """Remove a leading range of rows"""
+        del self._namespaces[rows], self._created[rows], self._values[rows]
+        self._vectors = self._vectors[rows.stop:] if self._values else None
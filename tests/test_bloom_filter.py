@@ -0,0 +1,50 @@
+import unittest
+
+from src.utils.bloom_filter import BloomFilter
+
+
+class TestBloomFilter(unittest.TestCase):
+    def test_added_items_are_members(self) -> None:
+        items = [f"id:{i}" for i in range(1000)]
+        bloom = BloomFilter.from_items(items, capacity=1000)
+
+        for item in items:
+            self.assertIn(item, bloom)
+
+    def test_false_positive_rate_near_target(self) -> None:
+        bloom = BloomFilter.from_items((f"id:{i}" for i in range(1000)), capacity=1000, error_rate=0.01)
+
+        false_positives = sum(f"other:{i}" in bloom for i in range(10000))
+        self.assertLess(false_positives, 300)
+
+    def test_check_and_add(self) -> None:
+        bloom = BloomFilter(capacity=100)
+
+        self.assertFalse(bloom.check_and_add("a"))
+        self.assertTrue(bloom.check_and_add("a"))
+        self.assertIn("a", bloom)
+        self.assertNotIn("b", bloom)
+
+    def test_bytes_round_trip(self) -> None:
+        bloom = BloomFilter.from_items(["a", "b", "c"], capacity=100)
+        restored = BloomFilter.from_bytes(bloom.to_bytes())
+
+        self.assertEqual(restored.num_bits, bloom.num_bits)
+        self.assertEqual(restored.num_hashes, bloom.num_hashes)
+        self.assertEqual(restored.bits, bloom.bits)
+        for item in ("a", "b", "c"):
+            self.assertIn(item, restored)
+
+        # The restored filter keeps accepting additions
+        restored.add("d")
+        self.assertIn("d", restored)
+
+    def test_truncated_bytes_rejected(self) -> None:
+        data = BloomFilter(capacity=100).to_bytes()
+
+        with self.assertRaises(ValueError):
+            BloomFilter.from_bytes(data[:-1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import json
+import tempfile
+import unittest
+from datetime import datetime
+from pathlib import Path
+from unittest import mock
+
+try:
+    from src.agents.dropbox_v2 import incremental_sync
+    from src.agents.dropbox_v2.incremental_sync import IncrementalSync, _dumps, _loads
+except ImportError as e:  # Dropbox/Weaviate dependencies not installed
+    raise unittest.SkipTest(f"incremental_sync unavailable: {e}")
+
+
+_JSON_SCALARS = (str, int, float, bool, type(None))
+
+
+def assert_json_native(test: unittest.TestCase, obj, path: str = "$") -> None:
+    """Fail unless obj holds only JSON-native values (timestamps as strings)"""
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            test.assertIsInstance(key, str, f"non-string key at {path}")
+            assert_json_native(test, value, f"{path}.{key}")
+    elif isinstance(obj, list):
+        for i, value in enumerate(obj):
+            assert_json_native(test, value, f"{path}[{i}]")
+    else:
+        test.assertIsInstance(obj, _JSON_SCALARS, f"non-JSON value at {path}")
+
+
+class TestSyncStateSerialization(unittest.TestCase):
+    """State and history records are stored without a default= fallback"""
+
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        root = Path(self.tmp.name)
+
+        # Only the state/history attributes; no Dropbox or Weaviate connections
+        self.sync = IncrementalSync.__new__(IncrementalSync)
+        self.sync.state_file = root / "state.json"
+        self.sync.history_file = root / "history.jsonl"
+        self.sync._state_writer = None
+        self.sync._status_cache = None
+
+    def _run_state_cycle(self) -> None:
+        legacy = {
+            'last_sync': datetime(2025, 1, 2, 3, 4, 5).isoformat(),
+            'total_indexed': 3,
+            'last_cursor': "AAB",
+            'sync_history': [
+                {'started_at': datetime.utcnow().isoformat(), 'files_indexed': 3, 'files_failed': 0}
+            ]
+        }
+        self.sync.state_file.write_text(json.dumps(legacy))
+
+        self.sync.sync_state = self.sync._load_sync_state()
+        self.sync._save_sync_state()
+        self.sync._prune_sync_history()
+
+        state = _loads(self.sync.state_file.read_bytes())
+        assert_json_native(self, state)
+        self.assertNotIn('sync_history', state)
+
+        lines = self.sync.history_file.read_bytes().splitlines()
+        self.assertEqual(len(lines), 1)
+        entry = _loads(lines[0])
+        assert_json_native(self, entry)
+        self.assertIn('started_at_epoch', entry)
+
+    def test_state_cycle_with_orjson(self) -> None:
+        if incremental_sync.orjson is None:
+            self.skipTest("orjson not installed")
+        self._run_state_cycle()
+
+    def test_state_cycle_with_json(self) -> None:
+        with mock.patch.object(incremental_sync, 'orjson', None):
+            self._run_state_cycle()
+
+    def test_dumps_round_trip(self) -> None:
+        record = {'started_at': "2025-01-02T03:04:05", 'started_at_epoch': 1735787045.0,
+                  'files_indexed': 2, 'errors': ["a", None]}
+        self.assertEqual(_loads(_dumps(record)), record)
+        self.assertEqual(_loads(_dumps(record, indent=True)), record)
+
+    def test_json_fallback_rejects_non_native_values(self) -> None:
+        with mock.patch.object(incremental_sync, 'orjson', None):
+            with self.assertRaises(TypeError):
+                _dumps({'started_at': datetime.utcnow()})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from src.utils import semantic_cache
+from src.utils.semantic_cache import SemanticCache
+
+if semantic_cache.np is None:
+    raise unittest.SkipTest("numpy not installed")
+
+np = semantic_cache.np
+
+
+def vec(*values: float) -> list:
+    return list(values)
+
+
+class TestSemanticCache(unittest.TestCase):
+    def test_hit_for_near_identical_vector(self) -> None:
+        cache = SemanticCache(threshold=0.95)
+        cache.store(vec(1.0, 0.0, 0.0), {"answer": 1})
+
+        self.assertEqual(cache.lookup(vec(1.0, 0.01, 0.0)), {"answer": 1})
+        self.assertIsNone(cache.lookup(vec(0.0, 1.0, 0.0)))
+
+    def test_namespaces_are_isolated(self) -> None:
+        cache = SemanticCache()
+        cache.store(vec(1.0, 0.0), "alice", namespace="a")
+        cache.store(vec(1.0, 0.0), "bob", namespace="b")
+
+        self.assertEqual(cache.lookup(vec(1.0, 0.0), namespace="a"), "alice")
+        self.assertEqual(cache.lookup(vec(1.0, 0.0), namespace="b"), "bob")
+        self.assertIsNone(cache.lookup(vec(1.0, 0.0), namespace="c"))
+
+    def test_entries_expire_after_ttl(self) -> None:
+        cache = SemanticCache(ttl_seconds=10)
+        with mock.patch.object(semantic_cache.time, "time", return_value=1000.0):
+            cache.store(vec(1.0, 0.0), "value")
+        with mock.patch.object(semantic_cache.time, "time", return_value=1005.0):
+            self.assertEqual(cache.lookup(vec(1.0, 0.0)), "value")
+        with mock.patch.object(semantic_cache.time, "time", return_value=1011.0):
+            self.assertIsNone(cache.lookup(vec(1.0, 0.0)))
+
+    def test_oldest_entry_evicted_beyond_max_entries(self) -> None:
+        cache = SemanticCache(max_entries=2)
+        cache.store(vec(1.0, 0.0, 0.0), "first")
+        cache.store(vec(0.0, 1.0, 0.0), "second")
+        cache.store(vec(0.0, 0.0, 1.0), "third")
+
+        self.assertIsNone(cache.lookup(vec(1.0, 0.0, 0.0)))
+        self.assertEqual(cache.lookup(vec(0.0, 1.0, 0.0)), "second")
+        self.assertEqual(cache.lookup(vec(0.0, 0.0, 1.0)), "third")
+
+
+class TestPersistentSemanticCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = str(Path(self.tmp.name) / "cache" / "semantic.sqlite3")
+
+    def test_entries_survive_restart(self) -> None:
+        SemanticCache(path=self.path).store(vec(1.0, 0.0), {"results": [1, 2]})
+
+        self.assertEqual(SemanticCache(path=self.path).lookup(vec(1.0, 0.0)), {"results": [1, 2]})
+
+    def test_rows_from_other_instances_load_by_rowid(self) -> None:
+        writer = SemanticCache(path=self.path)
+        reader = SemanticCache(path=self.path)
+        self.assertIsNone(reader.lookup(vec(1.0, 0.0)))
+
+        writer.store(vec(1.0, 0.0), "shared")
+        self.assertEqual(reader.lookup(vec(1.0, 0.0)), "shared")
+
+        # Already-loaded rows are not appended twice
+        reader.lookup(vec(1.0, 0.0))
+        self.assertEqual(len(reader._values), 1)
+
+    def test_rows_with_other_dimensions_are_skipped(self) -> None:
+        cache = SemanticCache(path=self.path)
+        cache.store(vec(1.0, 0.0, 0.0), "three-dim")
+
+        conn = sqlite3.connect(self.path)
+        conn.execute(
+            "INSERT INTO cache (namespace, embedding, results, ts) VALUES (?, ?, ?, ?)",
+            ("", np.asarray([1.0, 0.0], dtype=np.float32).tobytes(),
+             semantic_cache._encode("two-dim"), semantic_cache.time.time())
+        )
+        conn.commit()
+        conn.close()
+
+        self.assertEqual(cache.lookup(vec(1.0, 0.0, 0.0)), "three-dim")
+        self.assertEqual(len(cache._values), 1)
+
+    def test_clear_removes_persisted_entries(self) -> None:
+        cache = SemanticCache(path=self.path)
+        cache.store(vec(1.0, 0.0), "value")
+        cache.clear()
+
+        self.assertIsNone(cache.lookup(vec(1.0, 0.0)))
+        self.assertIsNone(SemanticCache(path=self.path).lookup(vec(1.0, 0.0)))
+
+
+if __name__ == "__main__":
+    unittest.main()
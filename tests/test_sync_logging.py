@@ -0,0 +1,61 @@
+import asyncio
+import logging
+import unittest
+
+try:
+    from src.agents.dropbox_v2 import incremental_sync
+    from src.agents.dropbox_v2.incremental_sync import _background_logging, _logs_in_background
+except ImportError as e:  # Dropbox/Weaviate dependencies not installed
+    raise unittest.SkipTest(f"incremental_sync unavailable: {e}")
+
+
+class _Collect(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append(record)
+
+
+class TestBackgroundLogging(unittest.TestCase):
+    """Only the package's records are queued; root handlers are never swapped"""
+
+    def setUp(self) -> None:
+        self.root = logging.getLogger()
+        self.handler = _Collect()
+        self.root.addHandler(self.handler)
+        self.addCleanup(self.root.removeHandler, self.handler)
+
+        self.package_logger = logging.getLogger(incremental_sync._PACKAGE_LOGGER)
+        self.package_logger.setLevel(logging.INFO)
+        self.addCleanup(self.package_logger.setLevel, logging.NOTSET)
+
+    def test_root_handlers_untouched(self) -> None:
+        before = self.root.handlers[:]
+        with _background_logging():
+            self.assertEqual(self.root.handlers, before)
+            # Unrelated loggers still reach the root handlers synchronously
+            logging.getLogger("unrelated").warning("elsewhere")
+            self.assertEqual([r.getMessage() for r in self.handler.records], ["elsewhere"])
+        self.assertEqual(self.root.handlers, before)
+        self.assertTrue(self.package_logger.propagate)
+
+    def test_package_records_forwarded_to_root_handlers(self) -> None:
+        with _background_logging():
+            logging.getLogger(f"{incremental_sync._PACKAGE_LOGGER}.child").info("from sync")
+        # Leaving the context flushes the queue
+        self.assertEqual([r.getMessage() for r in self.handler.records], ["from sync"])
+        self.assertEqual(self.handler.records[0].name, f"{incremental_sync._PACKAGE_LOGGER}.child")
+
+    def test_async_entry_points_wrapped(self) -> None:
+        @_logs_in_background
+        async def run():
+            return self.package_logger.propagate
+
+        self.assertFalse(asyncio.run(run()))
+        self.assertTrue(self.package_logger.propagate)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+try:
+    from src.agents.dropbox_v2 import weaviate_indexer
+    from src.agents.dropbox_v2.weaviate_indexer import WeaviateIndexer, _hash_content
+except ImportError as e:  # Weaviate client not installed
+    raise unittest.SkipTest(f"weaviate_indexer unavailable: {e}")
+
+
+def stored(document, content_hash):
+    """Document object as returned by fetch_objects"""
+    return SimpleNamespace(uuid=f"uuid-{document['id']}", properties={
+        'dropbox_id': document['id'],
+        'content_hash': content_hash,
+        'file_path': document['file_path'],
+        'name': document['name'],
+        'document_type': None
+    })
+
+
+class TestBatchIndexSkipsUnchanged(unittest.TestCase):
+    """Re-running a backfill doesn't re-embed documents already stored as-is"""
+
+    def setUp(self) -> None:
+        self.client = mock.MagicMock()
+        self.client.is_connected.return_value = True
+        self.collection = self.client.collections.get.return_value
+        self.collection.data.insert_many.return_value = SimpleNamespace(errors={})
+
+        for patcher in (
+            mock.patch.object(weaviate_indexer, '_cluster_key', return_value=f"test:{id(self)}"),
+            mock.patch.object(weaviate_indexer, '_shared_client', return_value=self.client),
+            mock.patch.object(WeaviateIndexer, '_ensure_schema'),
+            # Filters are only passed through to the mocked collection
+            mock.patch.object(weaviate_indexer, 'Filter'),
+            mock.patch.object(weaviate_indexer, 'DataObject', side_effect=lambda **kwargs: SimpleNamespace(**kwargs)),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.indexer = WeaviateIndexer()
+        chunks = mock.patch.object(self.indexer, '_batch_index_chunks')
+        self.chunks = chunks.start()
+        self.addCleanup(chunks.stop)
+        self.unchanged = {'id': "id:a", 'name': "a.pdf", 'file_path': "/a.pdf", 'content': "x" * 600}
+        self.changed = {'id': "id:b", 'name': "b.pdf", 'file_path': "/b.pdf", 'content': "y" * 600}
+
+    def test_unchanged_documents_are_not_reinserted(self) -> None:
+        self.collection.query.fetch_objects.return_value = SimpleNamespace(objects=[
+            stored(self.unchanged, _hash_content(self.unchanged['content'])),
+            stored(self.changed, "stale"),
+        ])
+
+        results = self.indexer.batch_index([self.unchanged, self.changed])
+
+        self.assertEqual(results, {"id:a": True, "id:b": True})
+        (objects,), _ = self.collection.data.insert_many.call_args
+        self.assertEqual([obj.uuid for obj in objects], ["uuid-id:b"])
+        self.assertEqual(self.chunks.call_args.args[0], [self.changed])
+
+    def test_legacy_hash_counts_as_unchanged(self) -> None:
+        self.collection.query.fetch_objects.return_value = SimpleNamespace(objects=[
+            stored(self.unchanged, _hash_content(self.unchanged['content'], legacy=True)),
+        ])
+
+        self.assertEqual(self.indexer.batch_index([self.unchanged]), {"id:a": True})
+        self.collection.data.insert_many.assert_not_called()
+        self.chunks.assert_not_called()
+
+    def test_force_reindex_rewrites_unchanged_documents(self) -> None:
+        self.collection.query.fetch_objects.return_value = SimpleNamespace(objects=[
+            stored(self.unchanged, _hash_content(self.unchanged['content'])),
+        ])
+
+        self.assertEqual(self.indexer.batch_index([self.unchanged], force_reindex=True), {"id:a": True})
+        self.collection.data.insert_many.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
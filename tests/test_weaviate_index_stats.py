@@ -0,0 +1,59 @@
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+try:
+    from src.agents.dropbox_v2 import weaviate_indexer
+    from src.agents.dropbox_v2.weaviate_indexer import WeaviateIndexer
+except ImportError as e:  # Weaviate client not installed
+    raise unittest.SkipTest(f"weaviate_indexer unavailable: {e}")
+
+
+class TestSharedIndexStats(unittest.TestCase):
+    """Index stats counters are shared by every indexer of a cluster"""
+
+    def setUp(self) -> None:
+        self.client = mock.MagicMock()
+        self.client.is_connected.return_value = True
+        self.over_all = self.client.collections.get.return_value.aggregate.over_all
+        self.over_all.side_effect = lambda **kwargs: (
+            SimpleNamespace(groups=[]) if 'group_by' in kwargs else SimpleNamespace(total_count=2)
+        )
+
+        # A fresh cluster key per test so counters don't leak between tests
+        for patcher in (
+            mock.patch.object(weaviate_indexer, '_cluster_key', return_value=f"test:{id(self)}"),
+            mock.patch.object(weaviate_indexer, '_shared_client', return_value=self.client),
+            mock.patch.object(WeaviateIndexer, '_ensure_schema'),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_instances_share_counts(self) -> None:
+        status_indexer = WeaviateIndexer()
+        self.assertEqual(status_indexer.get_index_stats()['total_documents'], 2)
+        self.assertEqual(self.over_all.call_count, 2)
+
+        # Writes through another indexer (e.g. the sync's) show up without re-aggregating
+        sync_indexer = WeaviateIndexer()
+        sync_indexer._count_inserted(["invoice"])
+
+        stats = WeaviateIndexer().get_index_stats()
+        self.assertTrue(stats['cached'])
+        self.assertEqual(stats['total_documents'], 3)
+        self.assertEqual(stats['document_types'], {"invoice": 1})
+        self.assertEqual(self.over_all.call_count, 2)
+
+    def test_invalidation_is_shared(self) -> None:
+        first = WeaviateIndexer()
+        first.refresh_stats()
+
+        second = WeaviateIndexer()
+        second._count_deleted(None, 1)
+
+        self.assertFalse(first.get_index_stats()['cached'])
+        self.assertEqual(self.over_all.call_count, 4)
+
+
+if __name__ == "__main__":
+    unittest.main()